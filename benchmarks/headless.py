@@ -0,0 +1,170 @@
+"""Headless stand-ins for the Tk widgets touched by the benchmarked code paths"""
+import matplotlib
+matplotlib.use("Agg")  # Must happen before pyplot is imported by the UI modules
+
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from config import THEMES, DEFAULT_ALERT_THRESHOLDS, METRIC_HISTORY_POINTS, SKETCH_WINDOWS
+from utils.data_sources import SyntheticDataSource
+from utils.self_metrics import SelfMetrics
+from utils.governor import ResourceGovernor
+from utils.collectors import DiskIOCollector, NetworkCollector
+from utils.connections import ConnectionIndex
+from utils.cgroups import CgroupCollector
+from utils.app_groups import ApplicationGroups
+from utils.classifier import ProcessClassifier
+from utils.query_engine import QueryEngine
+from utils.range_index import RangeIndex
+from utils.sketches import MetricSketches
+from utils.process_history import ProcessHistory
+from utils.alerts import AlertEngine, default_alert_rules
+from utils.alert_log import AlertLog
+
+class HeadlessRoot:
+    """Records after() calls instead of running a Tk event loop"""
+    
+    def __init__(self):
+        self.scheduled = 0
+    
+    def after(self, ms, func=None, *args):
+        self.scheduled += 1
+        return f"after#{self.scheduled}"
+    
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+    
+    def after_cancel(self, job_id):
+        pass
+
+
+class HeadlessVar:
+    """Minimal tk.StringVar/BooleanVar replacement"""
+    
+    def __init__(self, value=""):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+
+
+class HeadlessLabel:
+    """Keeps the options passed to config()"""
+    
+    def __init__(self):
+        self.options = {}
+    
+    def config(self, **options):
+        self.options.update(options)
+    
+    configure = config
+
+
+class HeadlessTree:
+    """Enough of ttk.Treeview for the process list code paths"""
+    
+    def __init__(self):
+        self.items = {}
+        self.counter = 0
+    
+    def get_children(self, item=""):
+        return tuple(self.items)
+    
+    def delete(self, *items):
+        for item in items:
+            self.items.pop(item, None)
+    
+    def insert(self, parent, index, iid=None, **options):
+        if iid is None:
+            self.counter += 1
+            iid = f"I{self.counter:05d}"
+        self.items[iid] = dict(options)
+        return iid
+    
+    def item(self, iid, option=None, **options):
+        if options:
+            self.items[iid].update(options)
+            return None
+        return self.items[iid] if option is None else self.items[iid].get(option)
+    
+    def move(self, iid, parent, index):
+        options = self.items.pop(iid)
+        order = list(self.items.items())
+        order.insert(index, (iid, options))
+        self.items = dict(order)
+    
+    def yview(self):
+        return (0.0, 1.0)
+    
+    def exists(self, iid):
+        return iid in self.items
+    
+    def selection(self):
+        return ()
+
+
+def fill_history(app, points, seed=0):
+    """Fill the app's metric history with `points` one-second samples"""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    app.timestamps = (now - np.arange(points, 0, -1)).tolist()
+    app.cpu_usage_history = np.clip(30 + np.cumsum(rng.normal(0, 1, points)) % 40, 0, 100).tolist()
+    app.mem_usage_history = np.clip(50 + rng.normal(0, 2, points), 0, 100).tolist()
+    app.disk_usage_history = np.clip(40 + rng.normal(0, 0.5, points), 0, 100).tolist()
+    app.disk_io_history = np.clip(10 + rng.gamma(2, 3, points), 0, 100).tolist()
+    app.net_rx_history = rng.gamma(2, 0.5, points).tolist()
+    app.net_tx_history = rng.gamma(2, 0.2, points).tolist()
+    app.rebuild_metric_index()
+
+
+def create_headless_app(history_points=3600, process_count=500, seed=0):
+    """Create a ProcessMonitorApp with headless widgets, an Agg canvas and a synthetic data source"""
+    from ui.app import ProcessMonitorApp, INDEXED_METRICS
+    from utils.ai_utils import StreamingAnomalyDetector
+    
+    # Skip __init__, which builds the real Tk UI
+    app = ProcessMonitorApp.__new__(ProcessMonitorApp)
+    # Fixed one-second ticks keep runs with the same seed identical
+    app.data_source = SyntheticDataSource(process_count=process_count, seed=seed, tick_seconds=1.0)
+    app.root = HeadlessRoot()
+    app.self_metrics = SelfMetrics()
+    app.governor = ResourceGovernor()
+    app.disk_io = DiskIOCollector(app.data_source)
+    app.network = NetworkCollector(app.data_source)
+    app.connections = ConnectionIndex(app.data_source)
+    app.cgroups = CgroupCollector(app.data_source)
+    app.app_groups = ApplicationGroups()
+    app.app_groups_snapshot = None
+    app.classifier = ProcessClassifier(app.data_source)
+    app.alert_thresholds = DEFAULT_ALERT_THRESHOLDS.copy()
+    app.alert_engine = AlertEngine(default_alert_rules(app.alert_thresholds))
+    app.current_theme = "sunrise"
+    app.theme = THEMES[app.current_theme]
+    app.refresh_rate = HeadlessVar("1")
+    app.time_range_var = HeadlessVar("1 hour")
+    app.filter_var = HeadlessVar("")
+    app.process_tree = HeadlessTree()
+    app.process_rows = {}
+    app.row_sparklines = {}
+    app.process_history = ProcessHistory()
+    app.query_engine = QueryEngine(app.data_source, app.classifier, app.process_history)
+    app.metric_index = RangeIndex(INDEXED_METRICS, METRIC_HISTORY_POINTS)
+    app.metric_sketches = MetricSketches(SKETCH_WINDOWS)
+    app.process_count = HeadlessLabel()
+    app.system_info_label = HeadlessLabel()
+    app.middle_section = None
+    app.alert_log = AlertLog()
+    app.alerts_text = None
+    app.alert_sinks = []
+    app.recent_anomalies = []
+    app.stream_detector = StreamingAnomalyDetector()
+    
+    app.build_performance_figure()
+    app.canvas = FigureCanvasAgg(app.fig)
+    fill_history(app, history_points)
+    return app
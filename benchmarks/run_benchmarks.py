@@ -0,0 +1,325 @@
+"""Benchmark the collection, rendering and AI hot paths headlessly.
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --processes 100,1000,10000 --history 1h,24h
+    python -m benchmarks.run_benchmarks --only update_process_list --compare benchmarks/results/old.json
+"""
+from benchmarks import headless  # Selects the Agg backend before anything imports pyplot
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from ui.gauges import build_gauge, update_gauge
+from utils.alerts import AlertEngine
+from utils.connections import ConnectionIndex
+from utils.app_groups import ApplicationGroups
+from utils.classifier import ProcessClassifier
+from utils.query_engine import QueryEngine
+from utils.range_index import RangeIndex
+from utils.process_history import ProcessHistory
+from utils.ai_utils import ResourcePredictor, AnomalyDetector, ProcessAnomalyDetector
+from utils.data_sources import SyntheticDataSource
+from utils.process_utils import FD_ATTR, snapshot_columns
+
+HISTORY_SCALES = {"1h": 3600, "24h": 86400}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(func, iterations, setup=None, alloc_iterations=3):
+    """Time func() and record its peak allocations; setup() runs untimed before each call"""
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    
+    # Allocations are measured separately because tracemalloc skews timings
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            if setup:
+                setup()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    
+    timings_ms = np.array(timings) * 1000
+    return {
+        "iterations": iterations,
+        "p50_ms": round(float(np.percentile(timings_ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(timings_ms, 99)), 3),
+        "mean_ms": round(float(timings_ms.mean()), 3),
+        "max_ms": round(float(timings_ms.max()), 3),
+        "alloc_peak_kb": round(float(np.median(peaks)) / 1024, 1)
+    }
+
+
+def bench_update_data(history, iterations):
+    app = headless.create_headless_app(history)
+    return measure(app.update_data, iterations, setup=lambda: headless.fill_history(app, history))
+
+
+def bench_update_performance_graphs(history, iterations):
+    app = headless.create_headless_app(history)
+    return measure(app.update_performance_graphs, iterations)
+
+
+def bench_update_process_list(processes, iterations):
+    app = headless.create_headless_app(60, process_count=processes)
+    return measure(app.update_process_list, iterations)
+
+
+def bench_process_snapshot(processes, iterations):
+    source = SyntheticDataSource(process_count=processes, tick_seconds=1.0)
+    return measure(source.process_snapshot, iterations)
+
+
+def bench_process_anomaly_detector(processes, iterations):
+    detector = ProcessAnomalyDetector()
+    source = SyntheticDataSource(process_count=processes, tick_seconds=1.0)
+    # Warm the baselines so every iteration scores, rather than allocates, rows
+    detector.update_from_snapshot(source.process_snapshot(), FD_ATTR)
+    # One fresh snapshot per call, including the allocation pass; the columns come from the
+    # walk the app shares with the process history (see snapshot_columns)
+    snapshots = [source.process_snapshot() for _ in range(iterations + 5)]
+    feed = iter([(snapshot, snapshot_columns(snapshot, FD_ATTR)) for snapshot in snapshots])
+    
+    def score():
+        snapshot, columns = next(feed)
+        detector.update_from_snapshot(snapshot, FD_ATTR, columns)
+    return measure(score, iterations)
+
+
+def bench_snapshot_columns(processes, iterations):
+    source = SyntheticDataSource(process_count=processes, tick_seconds=1.0)
+    snapshots = iter([source.process_snapshot() for _ in range(iterations + 5)])
+    return measure(lambda: snapshot_columns(next(snapshots), FD_ATTR), iterations)
+
+
+def bench_process_history(processes, iterations):
+    history = ProcessHistory()
+    source = SyntheticDataSource(process_count=processes, tick_seconds=2.0)
+    snapshots = [source.process_snapshot() for _ in range(iterations + 5)]
+    feed = iter(enumerate(snapshots))
+    
+    def record():
+        i, snapshot = next(feed)
+        history.record(snapshot, i * 2.0)
+    return measure(record, iterations)
+
+
+def bench_app_groups(processes, iterations):
+    groups = ApplicationGroups("tree")
+    source = SyntheticDataSource(process_count=processes, tick_seconds=2.0)
+    snapshots = iter([source.process_snapshot() for _ in range(iterations + 5)])
+    groups.update(next(snapshots))  # Steady state: only new and re-parented processes are placed
+    return measure(lambda: groups.update(next(snapshots)), iterations)
+
+
+def bench_query_engine(processes, iterations):
+    source = SyntheticDataSource(process_count=processes, tick_seconds=1.0)
+    history = ProcessHistory()
+    for i in range(60):
+        history.record(source.process_snapshot(), time.time() - 60 + i)
+    engine = QueryEngine(source, ProcessClassifier(source), history)
+    snapshot = source.process_snapshot()
+    questions = iter(["top 5 memory users owned by www-data", "how many databases are running",
+                      "which process had the highest cpu in the last 30 seconds"] * (iterations + 5))
+    engine.answer("how many processes owned by root", snapshot, {})  # Owners are read once per process
+    return measure(lambda: engine.answer(next(questions), snapshot, {}), iterations)
+
+
+def bench_connection_index(processes, iterations):
+    index = ConnectionIndex(SyntheticDataSource(process_count=processes, tick_seconds=5.0))
+    index.refresh()  # Steady state: owners of known sockets are already cached
+    return measure(index.refresh, iterations)
+
+
+def bench_update_gauge(iterations):
+    theme = headless.THEMES["sunrise"]
+    fig, ax = build_gauge(theme, "CPU")
+    canvas = headless.FigureCanvasAgg(fig)
+    values = iter(np.random.default_rng(0).uniform(0, 100, iterations + 10))
+    
+    def update():
+        update_gauge(ax, next(values), "CPU", theme)
+        canvas.draw()
+    return measure(update, iterations)
+
+
+def bench_get_predictions(history, iterations):
+    app = headless.create_headless_app(history)
+    predictor = ResourcePredictor()
+    return measure(lambda: predictor.get_predictions(app.cpu_usage_history, app.mem_usage_history,
+                                                     app.disk_usage_history), iterations, alloc_iterations=1)
+
+
+def bench_anomaly_train(history, iterations):
+    app = headless.create_headless_app(history)
+    detector = AnomalyDetector()
+    return measure(lambda: detector.train(app.cpu_usage_history, app.mem_usage_history,
+                                          app.disk_usage_history), iterations, alloc_iterations=1)
+
+
+def bench_range_index(history, iterations):
+    index = RangeIndex(["cpu"], history)
+    index.load(np.arange(history, dtype=float), {"cpu": np.random.default_rng(0).uniform(0, 100, history)})
+    ranges = np.sort(np.random.default_rng(1).uniform(0, history, (iterations + 5, 100, 2)), axis=2)
+    batches = iter(ranges)
+    clock = iter(range(history, history + iterations + 5))
+    
+    def query():
+        # One append plus 100 range queries at random positions and lengths
+        index.append(float(next(clock)), (50.0,))
+        for start, end in next(batches):
+            index.query("cpu", start, end)
+    return measure(query, iterations)
+
+
+def bench_alert_rules(processes, iterations):
+    # Hundreds of system rules plus a per-process rule over the whole table
+    engine = AlertEngine([f"cpu > {50 + i % 50} for {i % 30}s clear {40 + i % 50}" for i in range(300)] +
+                         [f"memory > {60 + i % 40} for 10s" for i in range(200)] +
+                         ["process * cpu > 50 for 10s"])
+    source = SyntheticDataSource(process_count=processes, tick_seconds=1.0)
+    snapshot = source.process_snapshot()
+    values = iter(np.random.default_rng(0).uniform(0, 100, (iterations + 5, 2)))
+    clock = iter(range(iterations + 5))
+    
+    def evaluate():
+        cpu, memory = next(values)
+        now = next(clock)
+        engine.evaluate({'cpu': cpu, 'memory': memory}, now)
+        engine.evaluate_processes(snapshot, now)
+    return measure(evaluate, iterations)
+
+
+# name -> (scale kind, function, default iterations)
+BENCHMARKS = {
+    "update_data": ("history", bench_update_data, 20),
+    "update_performance_graphs": ("history", bench_update_performance_graphs, 20),
+    "update_process_list": ("processes", bench_update_process_list, 20),
+    "process_snapshot": ("processes", bench_process_snapshot, 10),
+    "process_anomaly_detector": ("processes", bench_process_anomaly_detector, 50),
+    "snapshot_columns": ("processes", bench_snapshot_columns, 50),
+    "process_history": ("processes", bench_process_history, 50),
+    "connection_index": ("processes", bench_connection_index, 20),
+    "app_groups": ("processes", bench_app_groups, 50),
+    "query_engine": ("processes", bench_query_engine, 30),
+    "update_gauge": (None, bench_update_gauge, 50),
+    "get_predictions": ("history", bench_get_predictions, 3),
+    "anomaly_train": ("history", bench_anomaly_train, 5),
+    "alert_rules": ("processes", bench_alert_rules, 200),
+    "range_index": ("history", bench_range_index, 50),
+}
+
+
+def git_revision():
+    """Current commit, if this is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(names, process_scales, history_scales, iterations=None):
+    """Run the selected benchmarks at every requested scale"""
+    results = []
+    for name in names:
+        kind, func, default_iterations = BENCHMARKS[name]
+        n = iterations or default_iterations
+        if kind == "history":
+            cases = [({"history": label}, (HISTORY_SCALES[label], n)) for label in history_scales]
+        elif kind == "processes":
+            cases = [({"processes": count}, (count, n)) for count in process_scales]
+        else:
+            cases = [({}, (n,))]
+        
+        for scale, args in cases:
+            result = {"name": name, **scale, **func(*args)}
+            results.append(result)
+            print(format_result(result))
+    return results
+
+
+def format_result(result, previous=None):
+    """One line of the text report"""
+    scale = result.get("history") or result.get("processes") or "-"
+    line = (f"{result['name']:<28} {str(scale):>6}  p50 {result['p50_ms']:>9.3f} ms  "
+            f"p99 {result['p99_ms']:>9.3f} ms  alloc {result['alloc_peak_kb']:>9.1f} KB")
+    if previous:
+        change = (result['p50_ms'] / previous['p50_ms'] - 1) * 100 if previous['p50_ms'] else 0.0
+        line += f"  ({change:+.1f}% p50 vs previous)"
+    return line
+
+
+def result_key(result):
+    return (result["name"], result.get("history"), result.get("processes"))
+
+
+def compare(results, previous_path):
+    """Print the current results next to a previous run"""
+    with open(previous_path) as f:
+        previous = {result_key(r): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {previous_path}:")
+    for result in results:
+        print(format_result(result, previous.get(result_key(result))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the monitor's hot paths headlessly")
+    parser.add_argument("--processes", default="100,1000,10000", help="comma separated process table sizes")
+    parser.add_argument("--history", default="1h,24h", help=f"comma separated history lengths {list(HISTORY_SCALES)}")
+    parser.add_argument("--only", default="", help="comma separated benchmark names")
+    parser.add_argument("--iterations", type=int, default=None, help="override iterations per benchmark")
+    parser.add_argument("--output", default=None, help="JSON results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="previous JSON results file to compare against")
+    args = parser.parse_args(argv)
+    
+    names = [n for n in args.only.split(",") if n] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    process_scales = [int(n) for n in args.processes.split(",") if n]
+    history_scales = [h for h in args.history.split(",") if h]
+    
+    results = run(names, process_scales, history_scales, args.iterations)
+    
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("bench-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count()
+            },
+            "results": results
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import os
+
 # Enhanced theme configuration with multiple theme options
 THEMES = {
     "light": {
@@ -14,6 +16,7 @@ THEMES = {
         "cpu_color": "#5865f2",
         "mem_color": "#3ba55c",
         "disk_color": "#faa81a",
+        "net_color": "#eb459e",
         "name": "Light Mode",
         "icon": "☀️",
         "button_bg": "#e0e0e0"
@@ -32,6 +35,7 @@ THEMES = {
         "cpu_color": "#64ffda",
         "mem_color": "#00b894",
         "disk_color": "#fdcb6e",
+        "net_color": "#74b9ff",
         "name": "Blue Tech",
         "icon": "🌊"
     },
@@ -49,6 +53,7 @@ THEMES = {
         "cpu_color": "#00a65a",
         "mem_color": "#00c0ef",
         "disk_color": "#f39c12",
+        "net_color": "#dd4b39",
         "name": "Green Industrial",
         "icon": "🌿"
     },
@@ -66,6 +71,7 @@ THEMES = {
         "cpu_color": "#bb9af7",
         "mem_color": "#9ece6a",
         "disk_color": "#e0af68",
+        "net_color": "#7dcfff",
         "name": "Night Purple",
         "icon": "🌃"
     },
@@ -83,6 +89,7 @@ THEMES = {
         "cpu_color": "#ff7b73",
         "mem_color": "#91c788",
         "disk_color": "#ffac60",
+        "net_color": "#7fb8d6",
         "name": "Sunrise",
         "icon": "🌅"
     },
@@ -100,6 +107,7 @@ THEMES = {
         "cpu_color": "#ff2a6d",
         "mem_color": "#05ffa1",
         "disk_color": "#00f6ff",
+        "net_color": "#ffe66d",
         "name": "Cyberpunk",
         "icon": "🤖",
         "button_bg": "#2e1d6d"
@@ -118,6 +126,7 @@ THEMES = {
         "cpu_color": "#a27b5c",
         "mem_color": "#6b8e23",
         "disk_color": "#daa520",
+        "net_color": "#6495ed",
         "name": "Forest",
         "icon": "🌲",
         "button_bg": "#536162"
@@ -136,6 +145,7 @@ THEMES = {
         "cpu_color": "#be6e46",
         "mem_color": "#4a7c59",
         "disk_color": "#f9c74f",
+        "net_color": "#43aa8b",
         "name": "Desert",
         "icon": "🏜️",
         "button_bg": "#e6d4a7"
@@ -154,6 +164,7 @@ THEMES = {
         "cpu_color": "#88c0d0",
         "mem_color": "#a3be8c",
         "disk_color": "#ebcb8b",
+        "net_color": "#88c0d0",
         "name": "Nord",
         "icon": "❄️",
         "button_bg": "#4c566a"
@@ -172,6 +183,7 @@ THEMES = {
         "cpu_color": "#fe8019",
         "mem_color": "#b8bb26",
         "disk_color": "#fabd2f",
+        "net_color": "#83a598",
         "name": "Retro",
         "icon": "📺",
         "button_bg": "#504945"
@@ -190,6 +202,7 @@ THEMES = {
         "cpu_color": "#bd93f9",
         "mem_color": "#50fa7b",
         "disk_color": "#ffb86c",
+        "net_color": "#8be9fd",
         "name": "Dracula",
         "icon": "🧛",
         "button_bg": "#6272a4"
@@ -208,6 +221,7 @@ THEMES = {
         "cpu_color": "#f582ae",
         "mem_color": "#8bd3dd",
         "disk_color": "#f8b400",
+        "net_color": "#a0c4ff",
         "name": "Pastel",
         "icon": "🎨",
         "button_bg": "#e8e2d6"
@@ -317,4 +331,83 @@ DEFAULT_ALERT_THRESHOLDS = {
 }
 
 # Default refresh rate in seconds
-DEFAULT_REFRESH_RATE = 1 
+DEFAULT_REFRESH_RATE = 1
+
+# System metric samples kept for the graphs, the assistant and windowed alert rules (1 hour at 1-second refresh)
+METRIC_HISTORY_POINTS = 3600
+
+# Streaming percentile sketches: relative error of every estimate, and the windows kept as
+# label -> (seconds, slots); a window forgets its oldest slot at a time
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_WINDOWS = {"1m": (60, 6), "1h": (3600, 60), "24h": (86400, 24)}
+
+# Background model training (seconds before a fit is cancelled, poll interval in ms)
+MODEL_TRAINING_TIME_BUDGET = 30
+MODEL_TRAINING_POLL_INTERVAL = 250
+
+# Persisted model state (warm start across restarts)
+MODEL_STATE_PATH = os.path.join(os.path.expanduser("~"), ".process_monitor", "model_state.pkl")
+MODEL_STATE_SAVE_INTERVAL = 300     # Seconds between saves while running
+MODEL_STATE_MAX_AGE = 7 * 24 * 3600  # Ignore state older than a week
+MODEL_VALIDATION_SAMPLES = 10       # Live samples used to confirm restored models
+
+# How often the full process table is sampled for per-process analysis (ms)
+PROCESS_SAMPLE_INTERVAL = 2000
+
+# Processes whose I/O counters are read per process sample, beyond the rows on screen;
+# larger tables are covered in a rotating stride
+PROCESS_IO_SAMPLE_LIMIT = 256
+
+# How often the system-wide socket scan rebuilds the connection index (ms)
+CONNECTIONS_REFRESH_INTERVAL = 5000
+
+# Site-specific process classifier rules, checked before the built-in ones in utils/classifier.py.
+# Each rule has regexes for any of "name", "exe", "ppid", "cmdline", "cgroup" and "user" (all must match),
+# a "category" and optionally an "importance" ("Critical", "High", "Normal") and "relations".
+PROCESS_CLASSIFIER_RULES = [
+    # {"user": r"^deploy$", "cmdline": r"manage\.py", "category": "Django", "relations": "Database"},
+]
+
+# Import-time budget for the startup path in milliseconds (sklearn/statsmodels load after first paint)
+STARTUP_IMPORT_BUDGET_MS = 1500
+
+# Refresh interval for the visible Process Intelligence tab (ms)
+PI_TAB_REFRESH_INTERVAL = 5000
+
+# Self-instrumentation: histogram ring (slot length in seconds, number of slots) and Tk loop-lag probe (ms)
+SELF_METRICS_SLOT_SECONDS = 10
+SELF_METRICS_SLOTS = 60
+LOOP_LAG_PROBE_INTERVAL = 250
+SELF_METRICS_OVERLAY_REFRESH = 1000
+
+# Self-throttling: CPU budget in percent of one core and how often it is checked (ms)
+GOVERNOR_CPU_BUDGET = 2.0
+GOVERNOR_CHECK_INTERVAL = 5000
+
+# Alert rules: the thresholds above must hold for ALERT_DURATION seconds, clear ALERT_HYSTERESIS
+# points lower and re-fire no sooner than ALERT_COOLDOWN seconds. Extra rules use the text form,
+# e.g. "cpu > 95 for 30s clear 85 cooldown 5m critical" or "process * rss_mb > 4096 for 1m".
+# System metrics can also be averaged, or their min/max taken, over a window: "avg(cpu) over 5m > 80"
+ALERT_DURATION = 10
+ALERT_HYSTERESIS = 10
+ALERT_COOLDOWN = 60
+ALERT_RULES = [
+    "process * cpu > 90 for 30s clear 70 cooldown 5m",
+]
+
+# Alert log: lines kept, and the window (seconds) within which repeats of one alert fold into one line
+ALERT_LOG_SIZE = 500
+ALERT_COALESCE_WINDOW = 10
+
+# Alert sinks, each with its own batching queue. Types: "jsonl" (path, max_bytes, backups),
+# "syslog" (address: "/dev/log" or [host, port]) and "webhook" (url, timeout, headers).
+# Every sink also takes max_queue, batch_size and flush_interval.
+ALERT_SINKS = [
+    {"type": "jsonl", "path": os.path.join(os.path.expanduser("~"), ".process_monitor", "alerts.jsonl")},
+    # {"type": "syslog", "address": "/dev/log"},
+    # {"type": "webhook", "url": "http://localhost:8080/alerts"},
+]
+
+# Per-process history: samples kept per process (one per PROCESS_SAMPLE_INTERVAL) and the memory cap
+PROCESS_HISTORY_LENGTH = 300
+PROCESS_HISTORY_MAX_BYTES = 32 * 1024 * 1024
@@ -0,0 +1,41 @@
+import pytest
+
+from utils.app_groups import ApplicationGroups
+from utils.data_sources import SyntheticDataSource
+
+
+def grouping(groups):
+    """Comparable view of ApplicationGroups.groups, with totals rounded past float drift"""
+    return {gid: (group['label'], sorted(group['members']), [round(total, 3) for total in group['totals']],
+                  group['roots'])
+            for gid, group in groups.items()}
+
+
+@pytest.mark.parametrize("mode", ["exe", "tree"])
+@pytest.mark.parametrize("seed", [1, 3, 7])
+def test_incremental_matches_fresh_grouping(mode, seed):
+    # Heavy churn and forking so processes in the middle of trees exit often
+    source = SyntheticDataSource(400, seed=seed, churn_rate=20, fork_rate=10, tick_seconds=1.0)
+    incremental = ApplicationGroups(mode)
+    for tick in range(60):
+        snapshot = source.process_snapshot()
+        incremental.update(snapshot)
+        fresh = ApplicationGroups(mode)
+        fresh.update(snapshot)
+        assert grouping(incremental.groups) == grouping(fresh.groups), f"tick {tick}"
+
+
+def test_subtree_follows_exited_middle_process():
+    def proc(pid, ppid, exe="/usr/bin/worker"):
+        return {'pid': pid, 'ppid': ppid, 'name': "worker", 'exe': exe, 'create_time': float(pid),
+                'cpu_percent': 1.0, 'memory_info': None}
+
+    groups = ApplicationGroups("tree")
+    groups.update([proc(1, 0, "/sbin/init"), proc(10, 1), proc(11, 10), proc(12, 11), proc(13, 12)])
+    assert groups.members[(13, 13.0)][0] == (10, 10.0)
+
+    # 11 exits and 12 is re-parented to init: 12 and everything below it now form their own group
+    groups.update([proc(1, 0, "/sbin/init"), proc(10, 1), proc(12, 1), proc(13, 12)])
+    assert groups.members[(12, 12.0)][0] == (12, 12.0)
+    assert groups.members[(13, 13.0)][0] == (12, 12.0)
+    assert sorted(groups.groups[(10, 10.0)]['members']) == [(10, 10.0)]
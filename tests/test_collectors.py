@@ -0,0 +1,69 @@
+import numpy as np
+
+from utils.collectors import (DiskIOCollector, NetworkCollector, counter_deltas, looks_like_partition,
+                              parse_diskstats)
+from utils.data_sources import SyntheticDataSource
+
+
+def test_counter_deltas_increase():
+    assert counter_deltas(np.array([150.0]), np.array([100.0])).tolist() == [50.0]
+
+
+def test_counter_deltas_wrap_near_the_limit():
+    assert counter_deltas(np.array([10.0]), np.array([2.0 ** 32 - 6])).tolist() == [16.0]
+
+
+def test_counter_deltas_reset_is_not_a_wrap():
+    assert counter_deltas(np.array([10.0]), np.array([1000.0])).tolist() == [10.0]
+    # Past the 32-bit range a drop can only be a reset
+    assert counter_deltas(np.array([5e9]), np.array([6e9])).tolist() == [5e9]
+    assert counter_deltas(np.array([10.0]), np.array([2.0 ** 40]), wrap=2 ** 64).tolist() == [10.0]
+
+
+def test_partition_names():
+    disks = {"sda", "dm-1", "md1", "nvme0n1", "mmcblk0"}
+    assert looks_like_partition("sda1", disks)
+    assert looks_like_partition("nvme0n1p2", disks)
+    assert looks_like_partition("mmcblk0p1", disks)
+    assert not looks_like_partition("dm-10", disks)
+    assert not looks_like_partition("md12", disks)
+    assert not looks_like_partition("nvme0n10", disks)
+
+
+def test_parse_diskstats_prefers_the_data_source():
+    text = "\n".join(f"8 0 {name}" + " 0" * 11 for name in ("sda", "sda1", "loop0", "dm-1", "dm-10"))
+    names, counters = parse_diskstats(text)
+    assert names == ["sda", "dm-1", "dm-10"]
+    assert counters.shape == (3, 11)
+    names, _ = parse_diskstats(text, is_partition=lambda name: name == "dm-10")
+    assert names == ["sda", "sda1", "dm-1"]
+
+
+def test_disk_collector_skips_partitions_and_survives_resets():
+    source = SyntheticDataSource(50, seed=1, tick_seconds=1.0)
+    collector = DiskIOCollector(source)
+    assert collector.collect(now=0.0) is None
+    source.advance(1.0)
+    totals = collector.collect(now=1.0)
+    assert set(collector.devices) == {"nvme0n1", "sda"}
+    assert totals['read_iops'] >= 0 and 0 <= totals['util_percent'] <= 100
+
+    # Counters reset (driver reload): the rate is the new count, not a 32-bit wrap
+    source.block_counters[:] = 0
+    source.advance(1.0)
+    totals = collector.collect(now=2.0)
+    assert totals['read_bytes_per_sec'] < 2 ** 32
+
+
+def test_network_collector_rates():
+    source = SyntheticDataSource(50, seed=1, tick_seconds=1.0)
+    collector = NetworkCollector(source)
+    collector.collect(now=0.0)
+    before = source.interface_counters.copy()
+    source.advance(2.0)
+    totals = collector.collect(now=2.0)
+    eth0 = source.interfaces.index("eth0")
+    expected = (source.interface_counters[eth0, 0] - before[eth0, 0]) / 2.0
+    assert collector.interfaces["eth0"]['rx_bytes_per_sec'] == expected
+    assert "lo" not in collector.interfaces
+    assert totals['busiest_interface'] in collector.interfaces
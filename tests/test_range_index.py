@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from utils.range_index import RangeIndex
+
+
+def brute_force(times, values, start, end):
+    inside = (times >= start) & (times <= end) & ~np.isnan(values)
+    return values[inside]
+
+
+@pytest.fixture
+def filled():
+    """An index that has wrapped around its ring several times, with some missing readings"""
+    rng = np.random.default_rng(4)
+    index = RangeIndex(["cpu", "net"], capacity=100)
+    times, cpu, net = [], [], []
+    for i in range(350):
+        t = 1000.0 + i * 2.0
+        values = (rng.uniform(0, 100), np.nan if i % 7 == 0 else rng.exponential(5))
+        index.append(t, values)
+        times.append(t)
+        cpu.append(values[0])
+        net.append(values[1])
+    # Only the newest `capacity` samples are held
+    return index, np.array(times[-100:]), {"cpu": np.array(cpu[-100:]), "net": np.array(net[-100:])}
+
+
+def test_queries_match_brute_force(filled):
+    index, times, columns = filled
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        start, end = np.sort(rng.uniform(times[0] - 20, times[-1] + 20, 2))
+        for metric, values in columns.items():
+            expected = brute_force(times, values, start, end)
+            stats = index.query(metric, start, end)
+            assert stats.count == len(expected)
+            if len(expected):
+                assert stats.min == expected.min()
+                assert stats.max == expected.max()
+                assert stats.sum == pytest.approx(expected.sum())
+
+
+def test_extreme_finds_the_earliest_time(filled):
+    index, times, columns = filled
+    values = columns["cpu"]
+    at, value = index.extreme("cpu", times[10], times[60])
+    window = slice(10, 61)
+    assert value == values[window].max()
+    assert at == times[window][np.argmax(values[window])]
+    at, value = index.extreme("cpu", times[10], times[60], lowest=True)
+    assert value == values[window].min()
+
+
+def test_load_matches_appends(filled):
+    index, times, columns = filled
+    loaded = RangeIndex(["cpu", "net"], capacity=100)
+    loaded.load(times, columns)
+    for metric in columns:
+        expected, stats = index.query(metric), loaded.query(metric)
+        assert (stats.count, stats.min, stats.max) == (expected.count, expected.min, expected.max)
+        assert stats.sum == pytest.approx(expected.sum)
+    assert loaded.oldest_time == index.oldest_time == times[0]
+    assert loaded.latest_time == index.latest_time == times[-1]
+
+
+def test_empty_ranges():
+    index = RangeIndex(["cpu"], capacity=8)
+    assert index.query("cpu").count == 0
+    assert index.extreme("cpu") is None
+    index.append(10.0, [np.nan])
+    assert index.query("cpu", 0, 20).count == 0
+    assert index.extreme("cpu", 0, 20) is None
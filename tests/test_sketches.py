@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.sketches import DDSketch, MetricSketches, WindowedSketch
+
+
+@pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+def test_quantiles_within_relative_accuracy(q):
+    values = np.random.default_rng(2).lognormal(3, 1.5, 20000)
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    # The sketch answers with a value close to one whose rank is q * (n - 1)
+    exact = np.sort(values)[int(q * (len(values) - 1))]
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+def test_merge_and_unmerge():
+    a, b = DDSketch(), DDSketch()
+    for value in range(1, 101):
+        a.add(float(value))
+        b.add(float(value) * 10)
+    before = a.quantile(0.5)
+    a.merge(b)
+    assert a.count == 200
+    a.merge(b, -1)
+    assert a.count == 100 and a.quantile(0.5) == before
+
+
+def test_zeros_and_empty():
+    sketch = DDSketch()
+    assert math.isnan(sketch.quantile(0.5))
+    sketch.add(0.0)
+    sketch.add(float("nan"))
+    assert sketch.count == 1 and sketch.quantile(0.5) == 0.0
+
+
+def test_window_ages_out_old_samples():
+    window = WindowedSketch(60, 6)
+    for t in range(60):
+        window.add(100.0, now=float(t))
+    for t in range(60, 90):
+        window.add(1.0, now=float(t))
+    # At t=90 only the six 10s slots from t=40 on remain
+    assert window.quantiles([0.5], now=90.0)[0] == pytest.approx(1.0, rel=0.01)
+    assert window.total.count == 20 + 30
+    assert math.isnan(window.quantiles([0.5], now=1000.0)[0])
+    assert window.total.count == 0
+
+
+def test_summary_is_json_safe():
+    sketches = MetricSketches({"1m": (60, 6), "1h": (3600, 60)})
+    sketches.add("cpu", 50.0, now=0.0)
+    summary = sketches.summary(now=300.0)
+    assert summary["cpu"]["1m"] == {'count': 0, 'p50': None, 'p95': None, 'p99': None}
+    assert summary["cpu"]["1h"]["p50"] == pytest.approx(50.0, rel=0.01)
@@ -15,21 +15,71 @@ import math
 import random
 import traceback
 import getpass
+import queue
+import threading
 
-from config import THEMES, DEFAULT_ALERT_THRESHOLDS, CUSTOM_STYLES
+from config import (THEMES, DEFAULT_ALERT_THRESHOLDS, CUSTOM_STYLES, MODEL_TRAINING_TIME_BUDGET,
+                    MODEL_TRAINING_POLL_INTERVAL, MODEL_STATE_PATH, MODEL_STATE_SAVE_INTERVAL,
+                    MODEL_STATE_MAX_AGE, MODEL_VALIDATION_SAMPLES, PROCESS_SAMPLE_INTERVAL,
+                    PI_TAB_REFRESH_INTERVAL, SELF_METRICS_SLOT_SECONDS, SELF_METRICS_SLOTS,
+                    LOOP_LAG_PROBE_INTERVAL, SELF_METRICS_OVERLAY_REFRESH, GOVERNOR_CPU_BUDGET,
+                    GOVERNOR_CHECK_INTERVAL, ALERT_RULES, ALERT_DURATION, ALERT_HYSTERESIS, ALERT_COOLDOWN,
+                    ALERT_LOG_SIZE, ALERT_COALESCE_WINDOW, ALERT_SINKS, PROCESS_HISTORY_LENGTH,
+                    PROCESS_HISTORY_MAX_BYTES, CONNECTIONS_REFRESH_INTERVAL, PROCESS_IO_SAMPLE_LIMIT,
+                    PROCESS_CLASSIFIER_RULES, METRIC_HISTORY_POINTS, SKETCH_RELATIVE_ACCURACY,
+                    SKETCH_WINDOWS)
 from ui.sections import TopSection, MiddleSection
-from utils.process_utils import get_process_details, kill_process, change_process_priority
-from utils.ai_utils import ResourcePredictor, AnomalyDetector
+from utils.process_utils import (get_process_details, kill_process, change_process_priority, FD_ATTR, format_io_rates,
+                                 snapshot_columns)
+from utils.data_sources import PsutilDataSource
+from utils.self_metrics import SelfMetrics
+from utils.exporters import export_metrics_report
+from utils.governor import ResourceGovernor
+from utils.alerts import AlertEngine, default_alert_rules, format_alert_event, METRIC_UNITS
+from utils.alert_log import AlertLog
+from utils.alert_sinks import create_alert_sinks, alert_record
+from utils.process_history import ProcessHistory
+from utils.collectors import DiskIOCollector, NetworkCollector
+from utils.connections import ConnectionIndex
+from utils.cgroups import CgroupCollector
+from utils.app_groups import ApplicationGroups, GROUP_BY_CHOICES
+from utils.classifier import ProcessClassifier
+from utils.query_engine import QueryEngine
+from utils.range_index import RangeIndex
+from utils.sketches import MetricSketches
+from utils.ai_utils import (ResourcePredictor, AnomalyDetector, BackgroundTrainer, StreamingAnomalyDetector,
+                            ProcessAnomalyDetector, save_model_state, load_model_state, preload_ai_stack)
 from ui.footer import Footer
+from ui.sparklines import SparklineCache
 
 # Set default font to avoid EUDC.TTE error
 mpl.rcParams['font.family'] = 'DejaVu Sans'  # Use a single, reliable font
 mpl.rcParams['axes.unicode_minus'] = False    # Fix minus sign display
 
+# System metrics kept in the range index, in the order update_data appends them (named as in alert rules)
+INDEXED_METRICS = ('cpu', 'memory', 'disk', 'disk_util', 'net_rx_mbps', 'net_tx_mbps')
+# Raw readings whose p50/p95/p99 are tracked per window (the monitor's own loop lag is added as it is probed)
+SKETCHED_METRICS = ('cpu', 'memory', 'disk_await')
+
 class ProcessMonitorApp:
-    def __init__(self, root):
+    def __init__(self, root, data_source=None):
         """Initialize the Process Monitor App"""
         self.root = root
+        
+        # Where system and process data comes from (live psutil unless told otherwise)
+        self.data_source = data_source or PsutilDataSource()
+        
+        # Timings of the dashboard's own work (collection, drawing, fits, event-loop lag)
+        self.self_metrics = SelfMetrics(SELF_METRICS_SLOT_SECONDS, SELF_METRICS_SLOTS)
+        
+        # Backs off refresh work when the monitor itself goes over its CPU budget
+        self.governor = ResourceGovernor(GOVERNOR_CPU_BUDGET)
+        
+        # Block device IOPS, throughput, await and utilisation from /proc/diskstats
+        self.disk_io = DiskIOCollector(self.data_source)
+        
+        # Per-interface network rates from /proc/net/dev
+        self.network = NetworkCollector(self.data_source)
         self.root.title("Real Time Process Monitoring Dashboard")
         self.root.geometry("1280x720")
         
@@ -52,6 +102,20 @@ class ProcessMonitorApp:
         self.alert_history = []
         self.alert_thresholds = DEFAULT_ALERT_THRESHOLDS.copy()
         self.alert_active = False
+        self.alert_log = AlertLog(ALERT_LOG_SIZE, ALERT_COALESCE_WINDOW)
+        self.alerts_text = None  # Built with the Alerts tab
+        
+        # Alert delivery (files, syslog, webhooks) runs on each sink's own thread
+        self.alert_sinks = create_alert_sinks(ALERT_SINKS)
+        
+        # Threshold rules for the classic cpu/memory/disk limits plus any configured rules
+        self.alert_engine = AlertEngine(default_alert_rules(self.alert_thresholds, ALERT_DURATION,
+                                                            ALERT_HYSTERESIS, ALERT_COOLDOWN))
+        for rule in ALERT_RULES:
+            try:
+                self.alert_engine.add_rule(rule)
+            except ValueError as e:
+                print(f"Error loading alert rule: {e}")
         
         # Create refresh rate variable
         self.refresh_rate = tk.StringVar()
@@ -80,9 +144,14 @@ class ProcessMonitorApp:
         self.cpu_usage_history = []
         self.mem_usage_history = []
         self.disk_usage_history = []
+        self.disk_io_history = []  # Busiest device's I/O utilisation, NaN where no reading
+        self.net_rx_history = []   # Received MB/s across interfaces, NaN where no reading
+        self.net_tx_history = []   # Sent MB/s
         self.timestamps = []
-        self.process_history = {}
-        self.alerts = []  # Store alert history
+        # Range min/max/sum/count over the same samples for the assistant, axis scaling and windowed alerts
+        self.metric_index = RangeIndex(INDEXED_METRICS, METRIC_HISTORY_POINTS)
+        # Percentiles over 1 minute, 1 hour and 24 hours, which averages of the history would smooth away
+        self.metric_sketches = MetricSketches(SKETCH_WINDOWS, SKETCH_RELATIVE_ACCURACY)
         
         # Initialize AI components
         self.resource_predictor = ResourcePredictor()
@@ -90,6 +159,54 @@ class ProcessMonitorApp:
         self.recent_anomalies = []
         self.is_model_trained = False  # Flag to track if AI model is trained
         
+        # Model fits run in a worker process; progress is polled from the Tk loop
+        self.model_trainer = BackgroundTrainer(time_budget=MODEL_TRAINING_TIME_BUDGET)
+        self.training_progress = None  # (percent, message) while a fit is running
+        self.training_error = None
+        self.training_started = None
+        self.last_anomaly_result = None
+        self.root.after(MODEL_TRAINING_POLL_INTERVAL, self.poll_model_training)
+        
+        # Per-sample detector that scores every metric on every tick
+        self.stream_detector = StreamingAnomalyDetector()
+        
+        # Warm start from the previous session's models, confirmed against live data
+        self.restored_state_pending = False
+        self.last_model_save = time.monotonic()
+        
+        # sklearn/statsmodels are loaded in the background once the window is up
+        self.ai_ready = False
+        self.ai_load_queue = queue.Queue()
+        self.root.after_idle(self.start_ai_loader)
+        
+        # Per-process baselines, fed from a periodic snapshot of the process table
+        self.process_detector = ProcessAnomalyDetector()
+        self.latest_process_snapshot = []
+        self.process_history = ProcessHistory(PROCESS_HISTORY_LENGTH, PROCESS_HISTORY_MAX_BYTES)
+        # Multi-process applications rolled up from the same snapshots, when a view groups by app
+        self.app_groups = ApplicationGroups()
+        self.app_groups_snapshot = None
+        self.group_by_var = tk.StringVar(value="Process")
+        # Categories from rules compiled once, cached per process
+        self.classifier = ProcessClassifier(self.data_source, PROCESS_CLASSIFIER_RULES)
+        # Assistant questions answered from history and the snapshot rather than live system calls
+        self.query_engine = QueryEngine(self.data_source, self.classifier, self.process_history)
+        self.root.after(PROCESS_SAMPLE_INTERVAL, self.sample_processes)
+        
+        # Socket owners by pid, local port and remote address from one periodic scan
+        self.connections = ConnectionIndex(self.data_source)
+        self.root.after_idle(self.refresh_connections)
+        
+        # Per-cgroup usage from the cgroup v2 filesystem, collected while the Cgroups tab is shown
+        self.cgroups = CgroupCollector(self.data_source)
+        
+        # Event-loop lag probe and the F12 self-metrics overlay
+        self.lag_probe_due = time.perf_counter() + LOOP_LAG_PROBE_INTERVAL / 1000
+        self.root.after(LOOP_LAG_PROBE_INTERVAL, self.probe_loop_lag)
+        self.self_metrics_overlay = None
+        self.root.bind("<F12>", self.toggle_self_metrics_overlay)
+        self.root.after(GOVERNOR_CHECK_INTERVAL, self.run_governor)
+        
         # Fix font issues
         mpl.rcParams['font.family'] = 'DejaVu Sans'
         mpl.rcParams['axes.unicode_minus'] = False
@@ -187,29 +304,50 @@ class ProcessMonitorApp:
         list_container.pack(fill="both", expand=True, padx=5, pady=(0, 2))
         
         # Process treeview
-        columns = ("PID", "Name", "CPU%", "Memory", "Status")
+        columns = ("PID", "Name", "CPU%", "Memory", "Status", "Read", "Write", "Syscalls")
         self.process_tree = ttk.Treeview(list_container, 
                                        columns=columns, 
-                                       show="headings",
+                                       show="tree headings",  # The tree column holds the sparklines
                                        style="Custom.Treeview",
                                        height=8)  # Set explicit height to control vertical size
         
         # Configure columns
+        self.process_tree.heading("#0", text="Last 60s")
         self.process_tree.heading("PID", text="PID")
         self.process_tree.heading("Name", text="Process Name")
         self.process_tree.heading("CPU%", text="CPU %")
         self.process_tree.heading("Memory", text="Memory (MB)")
         self.process_tree.heading("Status", text="Status")
+        self.process_tree.heading("Read", text="Read/s")
+        self.process_tree.heading("Write", text="Write/s")
+        self.process_tree.heading("Syscalls", text="Syscalls/s")
         
+        self.process_tree.column("#0", width=72, minwidth=72, stretch=False)
         self.process_tree.column("PID", width=70, anchor="center")
         self.process_tree.column("Name", width=200)
         self.process_tree.column("CPU%", width=70, anchor="center")
         self.process_tree.column("Memory", width=100, anchor="center")
         self.process_tree.column("Status", width=100, anchor="center")
+        for column in ("Read", "Write", "Syscalls"):
+            self.process_tree.column(column, width=80, anchor="center")
+        
+        # The I/O rate columns are optional (toggled from the controls panel)
+        self.show_io_columns = tk.BooleanVar(value=False)
+        self.toggle_io_columns()
         
         # Add scrollbar
         scrollbar = ttk.Scrollbar(list_container, orient="vertical", command=self.process_tree.yview)
-        self.process_tree.configure(yscrollcommand=scrollbar.set)
+        
+        def on_process_list_scroll(first, last):
+            scrollbar.set(first, last)
+            self.schedule_sparkline_refresh()
+        self.process_tree.configure(yscrollcommand=on_process_list_scroll)
+        
+        # CPU/RSS sparklines for the visible rows, and the values each row currently shows
+        self.sparklines = SparklineCache()
+        self.sparkline_job = None
+        self.process_rows = {}
+        self.row_sparklines = {}  # Row -> version of the sparkline it shows
         
         self.process_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -241,6 +379,10 @@ class ProcessMonitorApp:
         self.cpu_usage_history = []
         self.mem_usage_history = []
         self.disk_usage_history = []
+        self.disk_io_history = []
+        self.net_rx_history = []
+        self.net_tx_history = []
+        self.metric_index.clear()
         
         # Explicitly connect the filter_var to the update_process_list method
         self.filter_var.trace_add("write", self.on_filter_change)
@@ -251,8 +393,8 @@ class ProcessMonitorApp:
         # Create a context menu for the process tree
         self.create_context_menu()
         
-        # Initial update of the process list to populate it
-        self.update_process_list()
+        # Populate the process list once the first frame is on screen
+        self.root.after_idle(self.update_process_list)
 
     def configure_styles(self):
         """Configure ttk styles for the application"""
@@ -518,12 +660,15 @@ class ProcessMonitorApp:
     def update_data(self):
         """Update system data and handle UI refreshes"""
         try:
+            collect_start = time.perf_counter()
+            
             # Get current CPU and memory usage with smoothing
-            cpu_samples = [psutil.cpu_percent() for _ in range(3)]
+            cpu_samples = [self.data_source.cpu_percent() for _ in range(3)]
             cpu_percent = sum(cpu_samples) / len(cpu_samples)
             
-            mem = psutil.virtual_memory()
+            mem = self.data_source.virtual_memory()
             mem_percent = mem.percent
+            raw_cpu_percent = cpu_percent
             
             # Add small random variations to make graphs more dynamic
             cpu_variation = random.uniform(-0.5, 0.5)
@@ -539,13 +684,13 @@ class ProcessMonitorApp:
                 if platform.system() == 'Windows':
                     # Try C: drive first
                     try:
-                        disk_percent = psutil.disk_usage('C:\\').percent
+                        disk_percent = self.data_source.disk_usage('C:\\').percent
                     except Exception:
                         # Try other common Windows drives
                         disk_found = False
                         for drive in ['D:', 'E:']:
                             try:
-                                disk_percent = psutil.disk_usage(drive + '\\').percent
+                                disk_percent = self.data_source.disk_usage(drive + '\\').percent
                                 disk_found = True
                                 break
                             except Exception:
@@ -555,13 +700,13 @@ class ProcessMonitorApp:
                         if not disk_found:
                             try:
                                 system_drive = os.environ.get('SystemDrive', 'C:') 
-                                disk_percent = psutil.disk_usage(system_drive + '\\').percent
+                                disk_percent = self.data_source.disk_usage(system_drive + '\\').percent
                             except Exception:
                                 # Last resort - use a more realistic placeholder value
                                 # Most systems have at least 20-30% disk usage
                                 disk_percent = random.uniform(25.0, 35.0)
                 else:  # Unix/Linux/MacOS
-                    disk_percent = psutil.disk_usage('/').percent
+                    disk_percent = self.data_source.disk_usage('/').percent
                     
                 # Apply small random variation for visual interest
                 disk_variation = random.uniform(-0.2, 0.2)
@@ -570,6 +715,20 @@ class ProcessMonitorApp:
                 print(f"Error getting disk usage: {e}")
                 # Use a small non-zero value to make it visible but indicate an issue
                 disk_percent = 0.1
+            
+            try:
+                disk_io = self.disk_io.collect()
+            except Exception as e:
+                print(f"Error reading disk I/O counters: {e}")
+                disk_io = None
+            
+            try:
+                network = self.network.collect()
+            except Exception as e:
+                print(f"Error reading network counters: {e}")
+                network = None
+            
+            self.self_metrics.record("collect", time.perf_counter() - collect_start)
                 
             # Add current time
             current_time = time.time()
@@ -580,6 +739,10 @@ class ProcessMonitorApp:
                 self.cpu_usage_history = []
                 self.mem_usage_history = []
                 self.disk_usage_history = []
+                self.disk_io_history = []
+                self.net_rx_history = []
+                self.net_tx_history = []
+                self.metric_index = RangeIndex(INDEXED_METRICS, METRIC_HISTORY_POINTS)
                 
                 # Add some initial varied values for disk usage to make the graph more interesting
                 # This will be overwritten with real data as it becomes available
@@ -591,6 +754,25 @@ class ProcessMonitorApp:
                     initial_disk = max(0, min(100, base_disk + variation + wave))
                     self.disk_usage_history.append(initial_disk)
             
+            # Score the raw readings before display smoothing hides short spikes
+            latest_metrics = {
+                'cpu': raw_cpu_percent,
+                'memory': mem.percent,
+                'disk': disk_percent
+            }
+            if disk_io:
+                latest_metrics['disk_util'] = disk_io['util_percent']
+                latest_metrics['disk_await'] = disk_io['await_ms']
+                latest_metrics['disk_iops'] = disk_io['read_iops'] + disk_io['write_iops']
+            if network:
+                latest_metrics['net_rx_mbps'] = network['rx_bytes_per_sec'] / (1024 * 1024)
+                latest_metrics['net_tx_mbps'] = network['tx_bytes_per_sec'] / (1024 * 1024)
+                latest_metrics['net_errors'] = network['rx_errors_per_sec'] + network['tx_errors_per_sec']
+                latest_metrics['net_drops'] = network['rx_drops_per_sec'] + network['tx_drops_per_sec']
+            self.score_streaming_sample(latest_metrics)
+            self.metric_sketches.add_all({metric: latest_metrics[metric] for metric in SKETCHED_METRICS
+                                          if metric in latest_metrics}, current_time)
+            
             # Apply exponential moving average for smoother transitions
             alpha = 0.3  # Smoothing factor
             if self.cpu_usage_history:
@@ -608,14 +790,28 @@ class ProcessMonitorApp:
             self.cpu_usage_history.append(float(cpu_percent))
             self.mem_usage_history.append(float(mem_percent))
             self.disk_usage_history.append(float(disk_percent))
+            self.disk_io_history.append(disk_io['util_percent'] if disk_io else math.nan)
+            self.net_rx_history.append(latest_metrics.get('net_rx_mbps', math.nan))
+            self.net_tx_history.append(latest_metrics.get('net_tx_mbps', math.nan))
+            self.metric_index.append(current_time, (cpu_percent, mem_percent, disk_percent, self.disk_io_history[-1],
+                                                    self.net_rx_history[-1], self.net_tx_history[-1]))
+            # After the index append, so windowed rules ("avg(cpu) over 5m") include this sample
+            self.check_alerts(latest_metrics)
+            
+            # Confirm restored models once a few live samples are in
+            if getattr(self, 'restored_state_pending', False) and len(self.cpu_usage_history) >= MODEL_VALIDATION_SAMPLES:
+                self.validate_restored_models()
             
             # Keep only the last hour of data
-            max_points = 3600  # 1 hour of data at 1-second intervals
+            max_points = METRIC_HISTORY_POINTS
             if len(self.timestamps) > max_points:
                 self.timestamps = self.timestamps[-max_points:]
                 self.cpu_usage_history = self.cpu_usage_history[-max_points:]
                 self.mem_usage_history = self.mem_usage_history[-max_points:]
                 self.disk_usage_history = self.disk_usage_history[-max_points:]
+                self.disk_io_history = self.disk_io_history[-max_points:]
+                self.net_rx_history = self.net_rx_history[-max_points:]
+                self.net_tx_history = self.net_tx_history[-max_points:]
             
             # Update the UI
             self.update_performance_graphs()
@@ -623,124 +819,16 @@ class ProcessMonitorApp:
             # Schedule next update with slightly random interval for more natural look
             base_refresh_rate = int(self.refresh_rate.get()) * 1000 if hasattr(self, 'refresh_rate') else 1000
             jitter = random.uniform(-100, 100)  # Add ±100ms random jitter
-            refresh_rate = max(100, base_refresh_rate + jitter)  # Ensure minimum 100ms
+            refresh_rate = max(100, self.governor.refresh_interval(base_refresh_rate) + jitter)  # Ensure minimum 100ms
             
             self.root.after(int(refresh_rate), self.update_data)
             
+            # Hand training off to the background worker when the detector asks for it
+            self.schedule_model_training()
+            
             # Update AI timeline
             if hasattr(self, 'start_time'):
-                collection_time = (time.time() - self.start_time.timestamp()) / 60
-                
-                # Check if model is already trained - if so, maintain that state
-                if hasattr(self, 'is_model_trained') and self.is_model_trained:
-                    # Model is already trained, maintain the trained state
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    training_status = f"[COMPLETE] Model trained successfully at {timestamp}"
-                    prediction_status = "[ACTIVE] Real-time predictions enabled"
-                    system_status = "[STATUS] System monitoring active - no anomalies detected"
-                # Otherwise, generate status based on collection time
-                elif collection_time < 0.5:
-                    training_status = "[INIT] Waiting for sufficient data samples..."
-                    prediction_status = "[STANDBY] Model training required before predictions"
-                    system_status = "[LOG] Collecting initial system metrics..."
-                    
-                    # Disable prediction buttons in the UI
-                    self.is_model_trained = False
-                    
-                    # Disable AI buttons in the UI if top_section exists
-                    if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
-                        self.top_section.enable_ai_buttons(False)
-                # Only process these states if model is not already trained
-                elif not self.is_model_trained and collection_time < 1.0:
-                    training_status = "[25%] Preprocessing training data..."
-                    prediction_status = "[WAIT] Initializing prediction engine"
-                    system_status = "[LOG] Building system baseline profile"
-                    
-                    # Disable prediction buttons in the UI
-                    self.is_model_trained = False
-                    
-                    # Disable AI buttons in the UI if top_section exists
-                    if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
-                        self.top_section.enable_ai_buttons(False)
-                elif not self.is_model_trained and collection_time < 1.5:
-                    training_status = "[50%] Training model on collected samples..."
-                    prediction_status = "[WAIT] Training in progress - ETA: {:.1f}s".format(2.0 - collection_time)
-                    system_status = "[LOG] Analyzing resource usage patterns"
-                    
-                    # Disable prediction buttons in the UI
-                    self.is_model_trained = False
-                    
-                    # Disable AI buttons in the UI if top_section exists
-                    if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
-                        self.top_section.enable_ai_buttons(False)
-                elif not self.is_model_trained and collection_time < 2.0:
-                    training_status = "[75%] Optimizing model parameters..."
-                    prediction_status = "[INIT] Preparing prediction pipeline"
-                    system_status = "[LOG] Finalizing system behavior analysis"
-                    
-                    # Disable prediction buttons in the UI
-                    self.is_model_trained = False
-                    
-                    # Disable AI buttons in the UI if top_section exists
-                    if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
-                        self.top_section.enable_ai_buttons(False)
-                # If we've reached this point and the model is not yet trained, mark it as trained
-                elif not self.is_model_trained and collection_time >= 2.0:
-                    # Format timestamp for logs
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    training_status = f"[COMPLETE] Model trained successfully at {timestamp}"
-                    prediction_status = "[ACTIVE] Real-time predictions enabled"
-                    
-                    # Enable prediction buttons in the UI
-                    self.is_model_trained = True
-                    
-                    # Enable AI buttons in the UI if top_section exists
-                    if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
-                        self.top_section.enable_ai_buttons(True)
-                    
-                    # Get system status based on your anomaly detection
-                    if hasattr(self, 'anomaly_detector') and self.anomaly_detector.is_trained:
-                        latest_data = {
-                            'cpu': self.cpu_usage_history[-1] if self.cpu_usage_history else 0,
-                            'memory': self.mem_usage_history[-1] if self.mem_usage_history else 0,
-                            'disk': self.disk_usage_history[-1] if self.disk_usage_history else 0
-                        }
-                        anomaly_result = self.anomaly_detector.check_anomaly(latest_data)
-                        if not anomaly_result['is_anomaly']:
-                            system_status = f"[STATUS] System behavior within normal parameters"
-                        else:
-                            # Add more details about the anomaly
-                            anomaly_type = "CPU" if latest_data['cpu'] > 80 else "Memory" if latest_data['memory'] > 80 else "Disk"
-                            system_status = f"[ALERT] {anomaly_type} usage anomaly detected at {timestamp}!"
-                    else:
-                        system_status = "[STATUS] System monitoring active - no anomalies detected"
-                
-                # Try to update the AI timeline in the UI
-                try:
-                    # Only update if we're not showing AI results or if we don't have that attribute yet
-                    if not hasattr(self, 'showing_ai_results') or not self.showing_ai_results:
-                        if hasattr(self, 'top_section') and hasattr(self.top_section, 'update_ai_timeline'):
-                            self.top_section.update_ai_timeline(
-                                collection_time=collection_time,
-                                training_status=training_status,
-                                prediction_status=prediction_status,
-                                system_status=system_status
-                            )
-                    else:
-                        # Only update the training status labels, not the status message
-                        if hasattr(self, 'top_section'):
-                            if hasattr(self.top_section, 'training_status'):
-                                self.top_section.training_status.config(text=training_status)
-                            if hasattr(self.top_section, 'prediction_status'):
-                                self.top_section.prediction_status.config(text=prediction_status)
-                except Exception as e:
-                    print(f"Error updating AI timeline: {e}")
-                    # Fallback to basic status update
-                    try:
-                        if hasattr(self, 'collection_status'):
-                            self.collection_status.configure(text=f"{collection_time:.1f} mins")
-                    except:
-                        pass  # Silently fail if even basic update fails
+                self.refresh_ai_timeline()
             else:
                 self.start_time = datetime.now()
         
@@ -749,48 +837,470 @@ class ProcessMonitorApp:
             # Ensure we keep updating even if there's an error
             self.root.after(1000, self.update_data)
 
-    def check_alerts(self, cpu_percent, mem_percent, disk_percent=None):
-        """Check if usage exceeds alert thresholds and log alerts"""
-        current_time = datetime.now().strftime("%H:%M:%S")
-        alert_triggered = False
-        
-        if cpu_percent > self.alert_thresholds["cpu"]:
-            alert_msg = f"[{current_time}] WARNING: CPU usage at {cpu_percent:.1f}% exceeded threshold ({self.alert_thresholds['cpu']}%)"
-            self.log_alert(alert_msg)
-            alert_triggered = True
-        
-        if mem_percent > self.alert_thresholds["memory"]:
-            alert_msg = f"[{current_time}] WARNING: Memory usage at {mem_percent:.1f}% exceeded threshold ({self.alert_thresholds['memory']}%)"
-            self.log_alert(alert_msg)
-            alert_triggered = True
-        
-        if disk_percent and disk_percent > self.alert_thresholds["disk"]:
-            alert_msg = f"[{current_time}] WARNING: Disk usage at {disk_percent:.1f}% exceeded threshold ({self.alert_thresholds['disk']}%)"
-            self.log_alert(alert_msg)
-            alert_triggered = True
-        
-        # Show a popup for the first alert only to avoid spamming
-        if alert_triggered and not hasattr(self, 'alert_shown'):
-            messagebox.showwarning("System Alert", "Resource usage threshold exceeded.\nCheck the alerts panel for details.")
-            self.alert_shown = True
-            # Reset the alert flag after 60 seconds
-            self.root.after(60000, self.reset_alert_flag)
+    def schedule_model_training(self):
+        """Submit an anomaly model fit to the background trainer when one is due"""
+        if not hasattr(self, 'model_trainer') or not self.ai_ready or self.model_trainer.is_busy("anomaly_detector"):
+            return
+        
+        try:
+            if not self.anomaly_detector.should_train(len(self.cpu_usage_history)):
+                return
+            self.training_error = None
+            self.training_started = time.perf_counter()
+            self.anomaly_detector.train_async(
+                self.model_trainer,
+                list(self.cpu_usage_history),
+                list(self.mem_usage_history),
+                list(self.disk_usage_history),
+                on_progress=self.on_training_progress,
+                on_complete=self.on_training_complete
+            )
+        except Exception as e:
+            print(f"Error scheduling model training: {e}")
+    
+    def start_ai_loader(self):
+        """Import the AI stack and read saved models on a background thread"""
+        def load():
+            try:
+                import_time = preload_ai_stack()
+                state = load_model_state(MODEL_STATE_PATH, max_age=MODEL_STATE_MAX_AGE)
+                self.ai_load_queue.put((import_time, state, None))
+            except Exception as e:
+                self.ai_load_queue.put((None, None, e))
+        
+        threading.Thread(target=load, name="ai-loader", daemon=True).start()
+        self.refresh_ai_timeline()
+        self.root.after(100, self.poll_ai_loader)
+    
+    def poll_ai_loader(self):
+        """Pick up the background AI load on the Tk thread"""
+        try:
+            import_time, state, error = self.ai_load_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_ai_loader)
+            return
+        
+        if error is not None:
+            print(f"Error loading AI engine: {error}")
+            self.training_error = f"unavailable: {error}"
+        else:
+            print(f"AI engine loaded in background in {import_time:.2f}s")
+            self.ai_ready = True
+            self.restore_model_state(state)
+        self.refresh_ai_timeline()
+    
+    def restore_model_state(self, state):
+        """Apply fitted models saved by a previous session"""
+        if not state:
+            return
+        
+        try:
+            if state.get('predictor'):
+                self.resource_predictor.set_state(state['predictor'])
+            if state.get('stream_detector'):
+                self.stream_detector.set_state(state['stream_detector'])
+            if state.get('anomaly_detector'):
+                self.anomaly_detector.set_state(state['anomaly_detector'])
+                self.is_model_trained = True
+                if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
+                    self.top_section.enable_ai_buttons(True)
+            self.restored_state_pending = True
+            saved_at = datetime.fromtimestamp(state['saved_at']).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"Restored model state saved at {saved_at}")
+        except Exception as e:
+            print(f"Error restoring model state: {e}")
+            self.resource_predictor.reset()
+            self.anomaly_detector.reset()
+            self.stream_detector.reset()
+            self.is_model_trained = False
+    
+    def validate_restored_models(self):
+        """Drop restored models that don't fit the data this machine is producing now"""
+        self.restored_state_pending = False
+        n = MODEL_VALIDATION_SAMPLES
+        cpu = self.cpu_usage_history[-n:]
+        mem = self.mem_usage_history[-n:]
+        disk = self.disk_usage_history[-n:]
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        
+        if self.anomaly_detector.is_trained and not self.anomaly_detector.validate(cpu, mem, disk):
+            self.anomaly_detector.reset()
+            self.is_model_trained = False
+            if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
+                self.top_section.enable_ai_buttons(False)
+            self.log_alert(f"[{timestamp}] INFO: Saved anomaly model no longer matches this system, retraining")
+        
+        if self.resource_predictor.fitted_params and not self.resource_predictor.validate(cpu, mem, disk):
+            self.resource_predictor.reset()
+            self.log_alert(f"[{timestamp}] INFO: Saved forecast parameters no longer match this system, refitting")
+        
+        samples = [{'cpu': c, 'memory': m, 'disk': d} for c, m, d in zip(cpu, mem, disk)]
+        if not self.stream_detector.validate(samples):
+            self.stream_detector.reset()
+            self.log_alert(f"[{timestamp}] INFO: Saved baselines no longer match this system, relearning")
+        self.refresh_ai_timeline()
+    
+    def save_model_state(self, force=False):
+        """Persist fitted models, at most once per save interval unless forced"""
+        if not force and time.monotonic() - self.last_model_save < MODEL_STATE_SAVE_INTERVAL:
+            return
+        # Don't overwrite the saved state with models that haven't been confirmed yet
+        if self.restored_state_pending or not self.ai_ready:
+            return
+        self.last_model_save = time.monotonic()
+        save_model_state(MODEL_STATE_PATH, self.resource_predictor, self.anomaly_detector,
+                         self.stream_detector if self.stream_detector.is_ready() else None)
+    
+    def sample_processes(self):
+        """Snapshot the process table and score every process against its own baseline"""
+        try:
+            with self.self_metrics.measure("process_walk"):
+                self.latest_process_snapshot = self.data_source.process_snapshot()
+                # I/O counters for the rows on screen plus a rotating share of the rest
+                io_pids = self.process_history.io_sample((info['pid'] for info in self.latest_process_snapshot),
+                                                         PROCESS_IO_SAMPLE_LIMIT,
+                                                         always=[int(iid) for iid in getattr(self, 'process_rows', {})])
+                io = self.data_source.process_io(io_pids)
+            # One pass over the snapshot feeds both the history and the anomaly detector
+            columns = snapshot_columns(self.latest_process_snapshot, FD_ATTR)
+            self.process_history.record(self.latest_process_snapshot, time.time(), io, columns)
+            if self.classifier.cache:
+                self.classifier.prune(self.latest_process_snapshot)
+            self.update_process_list()
+            anomalies = self.process_detector.update_from_snapshot(self.latest_process_snapshot, FD_ATTR, columns)
+            
+            timestamp = datetime.now().strftime("%H:%M:%S")
+            for anomaly in anomalies:
+                details = ", ".join(f"{feature} z={anomaly['scores'][feature]:+.1f}" for feature in anomaly['features'])
+                self.log_alert(f"[{timestamp}] ANOMALY: {anomaly['name']} (PID {anomaly['pid']}) "
+                               f"deviates from its usual behaviour ({details})")
+            
+            for event in self.alert_engine.evaluate_processes(self.latest_process_snapshot):
+                self.log_alert(format_alert_event(event, timestamp), self.alert_event_key(event),
+                               self.alert_event_details(event))
+        except Exception as e:
+            print(f"Error sampling processes: {e}")
+        self.root.after(self.governor.collector_interval(PROCESS_SAMPLE_INTERVAL), self.sample_processes)
+    
+    def update_app_groups(self):
+        """Application rollup for the current group-by choice, or None when listing processes individually"""
+        choice = self.group_by_var.get() if hasattr(self, 'group_by_var') else "Process"
+        mode = GROUP_BY_CHOICES.get(choice)
+        if mode is None:
+            return None
+        if mode != self.app_groups.mode:
+            self.app_groups.set_mode(mode)
+            self.app_groups_snapshot = None
+        # Fold in each process sample once, however many views ask
+        if self.app_groups_snapshot is not self.latest_process_snapshot:
+            with self.self_metrics.measure("app_grouping"):
+                self.app_groups.update(self.latest_process_snapshot, self.process_history.latest_io)
+            self.app_groups_snapshot = self.latest_process_snapshot
+        return self.app_groups
+    
+    def rebuild_metric_index(self):
+        """Re-index the whole metric history, after it was replaced rather than appended to"""
+        self.metric_index.load(self.timestamps, dict(zip(INDEXED_METRICS, (
+            self.cpu_usage_history, self.mem_usage_history, self.disk_usage_history,
+            self.disk_io_history, self.net_rx_history, self.net_tx_history))))
+    
+    def refresh_connections(self):
+        """Rebuild the connection index from a fresh socket scan"""
+        try:
+            with self.self_metrics.measure("connection_scan"):
+                self.connections.refresh()
+        except Exception as e:
+            print(f"Error scanning connections: {e}")
+        self.root.after(self.governor.collector_interval(CONNECTIONS_REFRESH_INTERVAL), self.refresh_connections)
+    
+    def probe_loop_lag(self):
+        """Record how late the Tk event loop ran a callback that was due at a known time"""
+        now = time.perf_counter()
+        lag = max(0.0, now - self.lag_probe_due)
+        self.self_metrics.record("loop_lag", lag)
+        self.metric_sketches.add("loop_lag_ms", lag * 1000, time.time())
+        self.lag_probe_due = now + LOOP_LAG_PROBE_INTERVAL / 1000
+        self.root.after(LOOP_LAG_PROBE_INTERVAL, self.probe_loop_lag)
+    
+    def run_governor(self):
+        """Check the monitor's own CPU use and throttle or restore refresh work"""
+        try:
+            if self.governor.check():
+                status = self.governor.status()
+                print(f"Self-throttling level {status['level']}/{status['max_level']} "
+                      f"(using {status['usage_percent']:.1f}% of a core, budget {status['budget_percent']:.1f}%)")
+        except Exception as e:
+            print(f"Error checking CPU budget: {e}")
+        self.root.after(GOVERNOR_CHECK_INTERVAL, self.run_governor)
+    
+    def toggle_self_metrics_overlay(self, event=None):
+        """Show or hide the self-metrics table over the performance graphs"""
+        if self.self_metrics_overlay is not None:
+            self.self_metrics_overlay.destroy()
+            self.self_metrics_overlay = None
+            return
+        if not hasattr(self, 'performance_graph_frame'):
+            return
+        self.self_metrics_overlay = tk.Label(self.performance_graph_frame,
+                                             justify="left",
+                                             font=("Consolas", 9),
+                                             bg=self.theme["card_bg"],
+                                             fg=self.theme["text"],
+                                             relief="solid",
+                                             borderwidth=1,
+                                             padx=6, pady=4)
+        self.self_metrics_overlay.place(relx=1.0, rely=0.0, anchor="ne", x=-5, y=5)
+        self.refresh_self_metrics_overlay()
+    
+    def refresh_self_metrics_overlay(self):
+        """Redraw the overlay while it is visible"""
+        if self.self_metrics_overlay is None:
+            return
+        try:
+            status = self.governor.status()
+            self.self_metrics_overlay.config(
+                text=f"{self.self_metrics.format_table()}\n\n{self.metric_sketches.format_table(now=time.time())}\n"
+                     f"own CPU {status['usage_percent']:.1f}% / budget {status['budget_percent']:.1f}%, "
+                     f"throttle level {status['level']}/{status['max_level']}")
+        except Exception as e:
+            print(f"Error refreshing self-metrics overlay: {e}")
+        self.root.after(SELF_METRICS_OVERLAY_REFRESH, self.refresh_self_metrics_overlay)
+    
+    def get_metrics_report(self):
+        """Everything the metrics exporter writes"""
+        return {
+            'self_metrics': self.self_metrics.summary(),
+            'governor': self.governor.status(),
+            'alert_sinks': [sink.stats() for sink in self.alert_sinks],
+            'process_history': self.process_history.stats(),
+            'disk_io': {'totals': self.disk_io.totals, 'devices': self.disk_io.devices},
+            'network': {'totals': self.network.totals, 'interfaces': self.network.interfaces},
+            'connections': self.connections.stats(),
+            'cgroups': self.cgroups.stats(),
+            'app_groups': self.app_groups.stats(),
+            'classifier': self.classifier.stats(),
+            'query_engine': self.query_engine.stats(),
+            'percentiles': self.metric_sketches.summary(now=time.time()),
+            'sparkline_redraws': self.sparklines.redraws if hasattr(self, 'sparklines') else 0
+        }
+    
+    def export_metrics(self):
+        """Export the dashboard's own timings to JSON or CSV"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Export Metrics"
+        )
+        
+        if not file_path:
+            return  # User cancelled
+        
+        try:
+            export_metrics_report(file_path, self.get_metrics_report())
+            messagebox.showinfo("Success", f"Metrics exported to {file_path}")
+        except Exception as e:
+            print(f"Export error: {e}")
+            messagebox.showerror("Error", f"Failed to export metrics: {str(e)}")
+    
+    def score_streaming_sample(self, sample):
+        """Run one sample through the streaming detector and log new anomalies"""
+        if not hasattr(self, 'stream_detector'):
+            return
+        
+        try:
+            result = self.stream_detector.update(sample)
+            if not self.stream_detector.is_ready():
+                return
+            self.last_anomaly_result = result
+            
+            for metric in result['drift']:
+                self.log_alert(f"[{result['detection_time']}] INFO: {metric} baseline shifted to a new level")
+            for metric in result['new_anomalies']:
+                unit = METRIC_UNITS.get(metric, "")
+                self.log_alert(f"[{result['detection_time']}] ANOMALY: {metric} at {sample[metric]:.1f}{unit} "
+                               f"(robust z-score {result['scores'][metric]:+.1f})")
+            if result['new_anomalies']:
+                self.recent_anomalies.append(result)
+                self.recent_anomalies = self.recent_anomalies[-20:]
+        except Exception as e:
+            print(f"Error scoring streaming sample: {e}")
+    
+    def poll_model_training(self):
+        """Check on the background trainer without blocking the UI"""
+        try:
+            self.model_trainer.poll()
+        except Exception as e:
+            print(f"Error polling model training: {e}")
+        self.root.after(MODEL_TRAINING_POLL_INTERVAL, self.poll_model_training)
+    
+    def on_training_progress(self, percent, message):
+        """Post a real training stage to the AI timeline"""
+        self.training_progress = (percent, message)
+        self.refresh_ai_timeline()
+    
+    def on_training_complete(self, success, error):
+        """Handle the end of a background fit"""
+        self.training_progress = None
+        if success:
+            if self.training_started is not None:
+                self.self_metrics.record("model_fit", time.perf_counter() - self.training_started)
+            if not self.stream_detector.is_ready():
+                self.last_anomaly_result = self.anomaly_detector.detect_anomalies(
+                    self.cpu_usage_history, self.mem_usage_history, self.disk_usage_history)
+            self.save_model_state()
+            if not self.is_model_trained:
+                self.is_model_trained = True
+                # Enable AI buttons in the UI if top_section exists
+                if hasattr(self, 'top_section') and hasattr(self.top_section, 'enable_ai_buttons'):
+                    self.top_section.enable_ai_buttons(True)
+        else:
+            self.training_error = error
+            print(f"Model training did not complete: {error}")
+        self.refresh_ai_timeline()
+    
+    def get_ai_timeline_status(self):
+        """Describe the AI pipeline from the actual training state"""
+        detector = self.anomaly_detector
+        job = self.model_trainer.get_job("anomaly_detector")
+        
+        if not self.ai_ready:
+            if self.training_error:
+                training_status = f"[ERROR] AI engine {self.training_error}"
+            else:
+                training_status = "[PENDING] Loading AI engine in background..."
+            prediction_status = "[PENDING] Predictions available once the AI engine is loaded"
+            system_status = "[LOG] Collecting initial system metrics..."
+        elif self.is_model_trained:
+            training_status = f"[COMPLETE] Model trained successfully at {detector.last_training_time}"
+            if self.training_progress and job:
+                percent, message = self.training_progress
+                training_status += f" - retraining [{percent}%]"
+            prediction_status = "[ACTIVE] Real-time predictions enabled"
+            
+            result = self.last_anomaly_result
+            if result is None:
+                system_status = "[STATUS] System monitoring active - no anomalies detected"
+            elif not result['is_anomaly']:
+                system_status = "[STATUS] System behavior within normal parameters"
+            else:
+                # Add more details about the anomaly
+                if result.get('anomalous_metrics'):
+                    anomaly_type = ", ".join(m.capitalize() if m != "cpu" else "CPU" for m in result['anomalous_metrics'])
+                else:
+                    anomaly_type = "CPU" if result['cpu'] > 80 else "Memory" if result['memory'] > 80 else "Disk"
+                system_status = f"[ALERT] {anomaly_type} usage anomaly detected at {result['detection_time']}!"
+        elif self.training_progress:
+            percent, message = self.training_progress
+            training_status = f"[{percent}%] {message}"
+            if job:
+                prediction_status = "[WAIT] Training in progress - {:.0f}s of {:.0f}s budget".format(
+                    job.elapsed(), job.time_budget)
+            else:
+                prediction_status = "[WAIT] Initializing prediction engine"
+            system_status = "[LOG] Analyzing resource usage patterns"
+        else:
+            samples = len(self.cpu_usage_history)
+            needed = detector.min_samples_for_training
+            if self.training_error:
+                training_status = f"[RETRY] Training {self.training_error}"
+            else:
+                training_status = f"[INIT] Waiting for sufficient data samples... ({min(samples, needed)}/{needed})"
+            prediction_status = "[STANDBY] Model training required before predictions"
+            system_status = "[LOG] Collecting initial system metrics..."
+        
+        return training_status, prediction_status, system_status
+    
+    def refresh_ai_timeline(self):
+        """Push the current AI pipeline state to the top section"""
+        if not hasattr(self, 'start_time') or not hasattr(self, 'model_trainer'):
+            return
+        
+        collection_time = (time.time() - self.start_time.timestamp()) / 60
+        try:
+            training_status, prediction_status, system_status = self.get_ai_timeline_status()
+            
+            # Only update if we're not showing AI results or if we don't have that attribute yet
+            if not hasattr(self, 'showing_ai_results') or not self.showing_ai_results:
+                if hasattr(self, 'top_section') and hasattr(self.top_section, 'update_ai_timeline'):
+                    self.top_section.update_ai_timeline(
+                        collection_time=collection_time,
+                        training_status=training_status,
+                        prediction_status=prediction_status,
+                        system_status=system_status
+                    )
+            else:
+                # Only update the training status labels, not the status message
+                if hasattr(self, 'top_section'):
+                    if hasattr(self.top_section, 'training_status'):
+                        self.top_section.training_status.config(text=training_status)
+                    if hasattr(self.top_section, 'prediction_status'):
+                        self.top_section.prediction_status.config(text=prediction_status)
+        except Exception as e:
+            print(f"Error updating AI timeline: {e}")
 
-    def reset_alert_flag(self):
-        """Reset the alert flag to allow new popup alerts"""
-        if hasattr(self, 'alert_shown'):
-            delattr(self, 'alert_shown')
+    def check_alerts(self, metrics):
+        """Evaluate the alert rules against this tick's metrics and log what fired or cleared"""
+        try:
+            events = self.alert_engine.evaluate(metrics, history=self.metric_index)
+            if events:
+                current_time = datetime.now().strftime("%H:%M:%S")
+                for event in events:
+                    self.log_alert(format_alert_event(event, current_time), self.alert_event_key(event),
+                                   self.alert_event_details(event))
+        except Exception as e:
+            print(f"Error evaluating alert rules: {e}")
+    
+    def apply_alert_thresholds(self):
+        """Move the threshold rules to the current alert thresholds"""
+        for metric, value in self.alert_thresholds.items():
+            self.alert_engine.set_threshold(metric, value)
 
-    def log_alert(self, message):
-        """Add an alert to the alerts panel"""
-        self.alerts.append(message)
+    def alert_event_key(self, event):
+        """Coalescing key for a rule event: repeats of one rule on one process name fold together"""
+        process = event['process']['name'] if event['process'] else None
+        return (event['rule'].name, event['state'], process)
+    
+    def alert_event_details(self, event):
+        """Structured fields of a rule event for the alert sinks"""
+        rule = event['rule']
+        return {
+            'rule': rule.name,
+            'state': event['state'],
+            'metric': rule.metric,
+            'value': round(event['value'], 2),
+            'threshold': rule.threshold,
+            'process': event['process']
+        }
+    
+    def log_alert(self, message, key=None, details=None):
+        """Add an alert to the bounded alert log, the Alerts tab and the alert sinks"""
+        entry, is_new, trimmed = self.alert_log.add(message, key)
         
-        # Keep only the last 100 alerts
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
+        # Sinks get every alert, including repeats folded into one line on screen
+        if self.alert_sinks:
+            record = alert_record(message, **(details or {}))
+            for sink in self.alert_sinks:
+                sink.submit(record)
         
-        # Update the alerts text widget
-        self.middle_section.update_alerts_text(self.alerts)
+        if self.alerts_text is None:
+            return
+        try:
+            self.alerts_text.config(state="normal")
+            if is_new:
+                # Drop lines that fell out of the log, then append just the new one
+                if trimmed:
+                    self.alerts_text.delete("1.0", f"{trimmed + 1}.0")
+                separator = "\n" if len(self.alert_log) > 1 else ""
+                self.alerts_text.insert("end-1c", separator + entry.text())
+                self.alerts_text.see("end")
+            else:
+                # A repeat: rewrite its line in place with the updated count
+                line = self.alert_log.line_number(entry)
+                self.alerts_text.delete(f"{line}.0", f"{line}.end")
+                self.alerts_text.insert(f"{line}.0", entry.text())
+            self.alerts_text.config(state="disabled")
+        except Exception as e:
+            print(f"Error updating alerts view: {e}")
 
     def kill_process(self):
         """Kill the selected process"""
@@ -916,6 +1426,7 @@ class ProcessMonitorApp:
                 "memory": mem_threshold,
                 "disk": disk_threshold
             }
+            self.apply_alert_thresholds()
             
             # Log the change
             self.log_alert(f"Alert thresholds updated: CPU {cpu_threshold}%, Memory {mem_threshold}%, Disk {disk_threshold}%")
@@ -1079,6 +1590,33 @@ class ProcessMonitorApp:
                 except:
                     ttk.Label(io_frame, text="I/O statistics not available for this process", style="Info.TLabel").pack(padx=10, pady=10)
                 
+                # Recent CPU and RSS from the per-process history
+                create_time = process.create_time()
+                times, cpu_history = self.process_history.series(pid, "cpu", create_time)
+                _, rss_history = self.process_history.series(pid, "rss", create_time)
+                if len(times) > 1:
+                    history_frame = ttk.LabelFrame(perf_frame, text="Recent History", style="Card.TFrame")
+                    history_frame.pack(fill="both", expand=True, pady=10)
+                    
+                    fig = plt.Figure(figsize=(5, 1.8), dpi=100)
+                    fig.patch.set_facecolor(self.theme["card_bg"])
+                    cpu_ax = fig.add_subplot(111)
+                    rss_ax = cpu_ax.twinx()
+                    relative_times = times - times[-1]
+                    cpu_ax.plot(relative_times, cpu_history, color=self.theme["cpu_color"], linewidth=1.2)
+                    rss_ax.plot(relative_times, rss_history / (1024**2), color=self.theme["mem_color"], linewidth=1.2)
+                    cpu_ax.set_facecolor(self.theme["chart_bg"])
+                    cpu_ax.set_ylabel("CPU %", color=self.theme["cpu_color"], fontsize=8)
+                    rss_ax.set_ylabel("RSS MB", color=self.theme["mem_color"], fontsize=8)
+                    cpu_ax.set_xlabel("Seconds ago", color=self.theme["text"], fontsize=8)
+                    for ax in (cpu_ax, rss_ax):
+                        ax.tick_params(colors=self.theme["text"], labelsize=7)
+                    fig.tight_layout()
+                    
+                    history_canvas = FigureCanvasTkAgg(fig, history_frame)
+                    history_canvas.draw()
+                    history_canvas.get_tk_widget().pack(fill="both", expand=True)
+                
                 # Files Tab Content
                 files_frame = ttk.Frame(files_tab, style="Card.TFrame")
                 files_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -1220,6 +1758,11 @@ class ProcessMonitorApp:
     
     def on_closing(self):
         """Handle window closing"""
+        if hasattr(self, 'model_trainer'):
+            self.model_trainer.shutdown()
+            self.save_model_state(force=True)
+        for sink in self.alert_sinks:
+            sink.close()
         self.root.destroy() 
 
     def update_ai_components(self):
@@ -1227,14 +1770,16 @@ class ProcessMonitorApp:
         try:
             # Get predictions if we have enough data
             predictions = None
-            if hasattr(self, 'resource_predictor') and len(self.cpu_usage_history) >= 10:
+            if hasattr(self, 'resource_predictor') and self.ai_ready and len(self.cpu_usage_history) >= 10:
                 try:
-                    with np.errstate(all='ignore'):  # Suppress numpy warnings
-                        predictions = self.resource_predictor.get_predictions(
-                            self.cpu_usage_history,
-                            self.mem_usage_history,
-                            self.disk_usage_history
-                        )
+                    # ARIMA fits take up to seconds, so they run in the background trainer; show the last result
+                    self.resource_predictor.predict_async(
+                        self.model_trainer,
+                        self.cpu_usage_history,
+                        self.mem_usage_history,
+                        self.disk_usage_history
+                    )
+                    predictions = self.resource_predictor.latest_predictions
                 except Exception as e:
                     print(f"Non-critical: Error generating predictions: {e}")
                     # Fallback to simple prediction
@@ -1248,12 +1793,8 @@ class ProcessMonitorApp:
             anomaly_result = None
             if hasattr(self, 'anomaly_detector'):
                 try:
-                    if self.anomaly_detector.should_train(len(self.cpu_usage_history)):
-                        self.anomaly_detector.train(
-                            self.cpu_usage_history,
-                            self.mem_usage_history,
-                            self.disk_usage_history
-                        )
+                    # Fits happen in the background trainer, never on the Tk thread
+                    self.schedule_model_training()
                     
                     # Detect anomalies in current data
                     if self.anomaly_detector.is_trained and len(self.cpu_usage_history) >= 10:
@@ -1361,6 +1902,12 @@ class ProcessMonitorApp:
             
             if not filtered_indices:
                 return  # No data to display
+            
+            # Draw fewer points while the governor is throttling (always keeping the newest)
+            max_points = self.governor.max_graph_points()
+            if max_points and len(filtered_indices) > max_points:
+                stride = math.ceil(len(filtered_indices) / max_points)
+                filtered_indices = filtered_indices[::-stride][::-1]
                 
             relative_times = [timestamps[i] for i in filtered_indices]
             filtered_cpu = [self.cpu_usage_history[i] for i in filtered_indices]
@@ -1372,6 +1919,26 @@ class ProcessMonitorApp:
             self.mem_line.set_data(relative_times, filtered_mem)
             self.disk_line.set_data(relative_times, filtered_disk)
             
+            # I/O utilisation shares the disk axis; its history only lines up once it covers every timestamp
+            disk_io_history = getattr(self, 'disk_io_history', [])
+            if hasattr(self, 'disk_io_line') and len(disk_io_history) == len(self.timestamps):
+                self.disk_io_line.set_data(relative_times, [disk_io_history[i] for i in filtered_indices])
+            if getattr(self, 'disk_io', None) is not None and self.disk_io.totals:
+                self.disk_ax.set_title(self.disk_axis_title(), fontsize=9, color=text_color)
+            
+            # Network rates have no fixed scale, so the axis follows the visible peak
+            if hasattr(self, 'net_ax') and len(getattr(self, 'net_rx_history', [])) == len(self.timestamps):
+                filtered_rx = [self.net_rx_history[i] for i in filtered_indices]
+                filtered_tx = [self.net_tx_history[i] for i in filtered_indices]
+                self.net_rx_line.set_data(relative_times, filtered_rx)
+                self.net_tx_line.set_data(relative_times, filtered_tx)
+                # Exact over the visible window, even when throttling thins the plotted points
+                window_start = current_time - time_range
+                peak = np.nanmax([self.metric_index.query('net_rx_mbps', window_start).max,
+                                  self.metric_index.query('net_tx_mbps', window_start).max, 0.0])
+                self.net_ax.set_ylim(0, max(peak * 1.2, 0.1))
+                self.net_ax.set_title(self.network_axis_title(), fontsize=9, color=text_color)
+            
             # Remove old area fills
             for collection in self.cpu_ax.collections + self.mem_ax.collections + self.disk_ax.collections:
                 try:
@@ -1393,12 +1960,15 @@ class ProcessMonitorApp:
             self.cpu_ax.set_xlim(min_time, 0)
             self.mem_ax.set_xlim(min_time, 0)
             self.disk_ax.set_xlim(min_time, 0)
+            if hasattr(self, 'net_ax'):
+                self.net_ax.set_xlim(min_time, 0)
             
             # Add bottom label for clarity with theme text color
-            self.disk_ax.set_xlabel("Seconds ago", color=text_color, fontsize=8)
+            self.bottom_axis().set_xlabel("Seconds ago", color=text_color, fontsize=8)
             
             # Redraw the canvas
-            self.canvas.draw()
+            with self.self_metrics.measure("canvas_draw"):
+                self.canvas.draw()
         except Exception as e:
             print(f"Error updating performance graphs: {e}")
             # Create sample data to show something rather than blank graphs
@@ -1438,6 +2008,8 @@ class ProcessMonitorApp:
                 self.cpu_ax.set_xlim(-60, 0)
                 self.mem_ax.set_xlim(-60, 0)
                 self.disk_ax.set_xlim(-60, 0)
+                if hasattr(self, 'net_ax'):
+                    self.net_ax.set_xlim(-60, 0)
                 
                 self.canvas.draw()
             except Exception as inner_e:
@@ -1681,10 +2253,26 @@ class ProcessMonitorApp:
                                width=15)
         export_btn.pack(side="left", padx=10)
         
+        # Per-process I/O rate columns
+        io_check = ttk.Checkbutton(button_frame, 
+                                  text="I/O", 
+                                  variable=self.show_io_columns,
+                                  command=self.toggle_io_columns,
+                                  style="TCheckbutton")
+        io_check.pack(side="left", padx=2)
+        
+        # Export of the dashboard's own timings
+        metrics_btn = ttk.Button(button_frame, 
+                                text="⏱ METRICS", 
+                                command=self.export_metrics,
+                                style="Accent.TButton",
+                                width=10)
+        metrics_btn.pack(side="left", padx=2)
+        
         # System info (right side)
         self.system_info_label = ttk.Label(
             controls_row, 
-            text="Processes: -- | Memory: -- MB | CPU Avg: --%", 
+            text="Processes: -- | Memory: -- MB | CPU p50/p95/p99 (1m): --%", 
             style="TLabel"
         )
         self.system_info_label.pack(side="right", padx=5)
@@ -1694,46 +2282,49 @@ class ProcessMonitorApp:
         try:
             # Get filter text
             filter_text = self.filter_var.get().lower()
-            print(f"Filtering with: '{filter_text}'")  # Debug print
-            
-            # Clear existing items
-            for item in self.process_tree.get_children():
-                self.process_tree.delete(item)
             
             # Get process list
             processes = []
             total_processes = 0
             visible_processes = 0
             
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'status']):
+            # Reuse the periodic sample when there is one, so the table is only walked once per interval
+            snapshot = getattr(self, 'latest_process_snapshot', None)
+            if not snapshot:
+                with self.self_metrics.measure("process_walk"):
+                    snapshot = self.data_source.process_snapshot(['pid', 'name', 'cpu_percent', 'memory_info', 'status'])
+            
+            history = getattr(self, 'process_history', None)
+            for proc_info in snapshot:
                 try:
                     total_processes += 1
-                    proc_info = proc.info
-                    proc_name = proc_info['name'].lower()
+                    proc_name = (proc_info['name'] or "").lower()
                     
                     # Apply filter if text is provided
                     if not filter_text or filter_text in proc_name:
+                        io = history.latest_io(proc_info['pid']) if history is not None else None
                         processes.append((
                             proc_info['pid'],
                             proc_info['name'],
                             f"{proc_info['cpu_percent']:.1f}",
                             f"{proc_info['memory_info'].rss / (1024 * 1024):.1f}",  # Convert to MB
-                            proc_info['status']
+                            proc_info['status'],
+                            *(format_io_rates(io) if io is not None else ("-", "-", "-"))
                         ))
                         visible_processes += 1
                     
                     # Limit to 100 processes for better performance
                     if visible_processes >= 100 and not filter_text:
                         break
-                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    pass
+                except (TypeError, AttributeError):
+                    pass  # Fields we weren't allowed to read (e.g. zombies)
             
             # Sort processes by CPU usage
             processes.sort(key=lambda x: float(x[2]), reverse=True)
             
-            # Insert into treeview
-            for proc in processes:
-                self.process_tree.insert('', 'end', values=proc)
+            with self.self_metrics.measure("treeview"):
+                self.sync_process_rows(processes)
+                self.update_sparklines()
             
             # Update process count
             count_text = f"{visible_processes} of {total_processes} processes"
@@ -1743,34 +2334,105 @@ class ProcessMonitorApp:
             self.process_count.config(text=count_text)
             
             # Update the system info label
-            self.update_system_info_label()
+            self.update_system_info_label(snapshot)
         except Exception as e:
             print(f"Error updating process list: {e}")
+    
+    def toggle_io_columns(self):
+        """Show or hide the per-process I/O rate columns"""
+        columns = ["PID", "Name", "CPU%", "Memory", "Status"]
+        if self.show_io_columns.get():
+            columns += ["Read", "Write", "Syscalls"]
+        self.process_tree.configure(displaycolumns=columns)
+    
+    def sync_process_rows(self, processes):
+        """Bring the treeview in line with the new rows, touching only rows that changed"""
+        tree = self.process_tree
+        wanted = [str(proc[0]) for proc in processes]
+        wanted_set = set(wanted)
+        
+        stale = [iid for iid in tree.get_children() if iid not in wanted_set]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                self.process_rows.pop(iid, None)
+                self.row_sparklines.pop(iid, None)
+        
+        for index, (iid, proc) in enumerate(zip(wanted, processes)):
+            if iid not in self.process_rows:
+                tree.insert('', index, iid=iid, values=proc)
+            elif self.process_rows[iid] != proc:
+                tree.item(iid, values=proc)
+            self.process_rows[iid] = proc
+        
+        # Move only the rows that are out of place
+        current = list(tree.get_children())
+        for index, iid in enumerate(wanted):
+            if current[index] != iid:
+                tree.move(iid, '', index)
+                current.remove(iid)
+                current.insert(index, iid)
+    
+    def schedule_sparkline_refresh(self):
+        """Redraw sparklines for rows scrolled into view, once the scrolling settles"""
+        if self.sparkline_job is None:
+            self.sparkline_job = self.root.after_idle(self.update_sparklines)
+    
+    def update_sparklines(self):
+        """Attach sparklines to the visible rows, redrawing only those with new samples"""
+        self.sparkline_job = None
+        if not hasattr(self, 'sparklines'):
+            return
+        try:
+            children = self.process_tree.get_children()
+            if not children:
+                return
+            top, bottom = self.process_tree.yview()
+            first = int(top * len(children))
+            last = min(len(children), math.ceil(bottom * len(children)) + 1)
+            now = time.time()
+            for iid in children[first:last]:
+                pid = int(iid)
+                key = self.process_history.latest_key.get(pid)
+                if key is None:
+                    continue
+                version = (self.process_history.version(pid), self.current_theme)
+                if self.row_sparklines.get(iid) == version:
+                    continue
+                _, cpu = self.process_history.series(pid, "cpu", seconds=60, now=now)
+                _, rss = self.process_history.series(pid, "rss", seconds=60, now=now)
+                if len(cpu) > 1:
+                    self.process_tree.item(iid, image=self.sparklines.get(key, version, cpu, rss, self.theme))
+                    self.row_sparklines[iid] = version
+        except Exception as e:
+            print(f"Error updating sparklines: {e}")
 
-    def update_system_info_label(self):
+    def update_system_info_label(self, processes=None):
         """Update the system information label at the bottom of the process list"""
         try:
             # Get all processes
-            processes = list(psutil.process_iter(['pid', 'name', 'status', 'memory_info']))
+            if processes is None:
+                processes = self.data_source.process_snapshot(['pid', 'name', 'status', 'memory_info'])
             
             # Count processes
             total_processes = len(processes)
             
             # Calculate total memory usage
-            total_memory = sum(p.info['memory_info'].rss for p in processes if p.info['memory_info'])
+            total_memory = sum(p['memory_info'].rss for p in processes if p['memory_info'])
             total_memory_mb = total_memory / (1024 * 1024)
             
-            # Calculate average CPU usage
-            avg_cpu = sum(self.cpu_usage_history[-10:]) / min(10, len(self.cpu_usage_history)) if self.cpu_usage_history else 0
+            # CPU percentiles over the last minute, so short spikes show up in p95/p99
+            cpu = self.metric_sketches.quantiles('cpu', "1m", now=time.time())
+            cpu_text = "/".join("--" if math.isnan(value) else f"{value:.0f}" for value in cpu)
             
             # Update the system info label
             self.system_info_label.config(
-                text=f"Processes: {total_processes} | Memory: {total_memory_mb:.1f} MB | CPU Avg: {avg_cpu:.1f}%"
+                text=f"Processes: {total_processes} | Memory: {total_memory_mb:.1f} MB | CPU p50/p95/p99 (1m): {cpu_text}%"
             )
         except Exception as e:
             # Graceful error handling
             print(f"Error updating system info label: {e}")
-            self.system_info_label.config(text="Processes: -- | Memory: -- MB | CPU Avg: --%")
+            self.system_info_label.config(text="Processes: -- | Memory: -- MB | CPU p50/p95/p99 (1m): --%")
 
     def on_process_select(self, event):
         """Handle process selection"""
@@ -1857,7 +2519,63 @@ class ProcessMonitorApp:
         # Create a frame for the graphs
         graph_frame = ttk.Frame(parent, style="Card.TFrame")
         graph_frame.pack(fill="both", expand=True, padx=5, pady=2)
+        self.performance_graph_frame = graph_frame  # Hosts the self-metrics overlay
+        
+        self.build_performance_figure()
+        chart_bg_color = self.theme["chart_bg"]  # Background color for charts
+        
+        # Create canvas with matching background
+        self.canvas = FigureCanvasTkAgg(self.fig, graph_frame)
+        self.canvas.draw()
+        canvas_widget = self.canvas.get_tk_widget()
+        canvas_widget.configure(bg=chart_bg_color, highlightbackground=chart_bg_color, highlightcolor=chart_bg_color)
+        canvas_widget.pack(fill="both", expand=True)
+        
+        # Create a frame for the legend/controls
+        controls_frame = ttk.Frame(parent, style="Card.TFrame")
+        controls_frame.pack(fill="x", padx=5, pady=(2, 5))
+        
+        # Add checkboxes to show/hide plots with centered alignment
+        self.show_cpu_var = tk.BooleanVar(value=True)
+        self.show_mem_var = tk.BooleanVar(value=True)
+        self.show_disk_var = tk.BooleanVar(value=True)
+        self.show_net_var = tk.BooleanVar(value=True)
+        
+        # Create a frame to center the checkboxes
+        checkbox_frame = ttk.Frame(controls_frame, style="Card.TFrame")
+        checkbox_frame.pack(anchor="center", pady=2)
+        
+        # Add the checkboxes
+        cpu_check = ttk.Checkbutton(checkbox_frame, 
+                                   text="CPU", 
+                                   variable=self.show_cpu_var,
+                                   command=self.update_performance_graph_colors,
+                                   style="TCheckbutton")
+        cpu_check.pack(side="left", padx=10)
         
+        mem_check = ttk.Checkbutton(checkbox_frame, 
+                                   text="Memory", 
+                                   variable=self.show_mem_var,
+                                   command=self.update_performance_graph_colors,
+                                   style="TCheckbutton")
+        mem_check.pack(side="left", padx=10)
+        
+        disk_check = ttk.Checkbutton(checkbox_frame, 
+                                    text="Disk", 
+                                    variable=self.show_disk_var,
+                                    command=self.update_performance_graph_colors,
+                                    style="TCheckbutton")
+        disk_check.pack(side="left", padx=10)
+        
+        net_check = ttk.Checkbutton(checkbox_frame, 
+                                   text="Network", 
+                                   variable=self.show_net_var,
+                                   command=self.update_performance_graph_colors,
+                                   style="TCheckbutton")
+        net_check.pack(side="left", padx=10)
+
+    def build_performance_figure(self):
+        """Build the performance figure, axes and lines without attaching a Tk canvas"""
         # Create a figure with slightly smaller height to fit more on screen
         self.fig = plt.Figure(figsize=(7, 3.8), dpi=100)
         
@@ -1873,15 +2591,17 @@ class ProcessMonitorApp:
         self.fig.subplots_adjust(bottom=0.15, top=0.9, hspace=0.4)
         
         # Create plots
-        self.cpu_ax = self.fig.add_subplot(311)
-        self.mem_ax = self.fig.add_subplot(312)
-        self.disk_ax = self.fig.add_subplot(313)
+        self.cpu_ax = self.fig.add_subplot(411)
+        self.mem_ax = self.fig.add_subplot(412)
+        self.disk_ax = self.fig.add_subplot(413)
+        self.net_ax = self.fig.add_subplot(414)
         
         # Configure plots with improved styling
         for ax, title, color in [
             (self.cpu_ax, "CPU Usage (%)", self.theme["cpu_color"]),
             (self.mem_ax, "Memory Usage (%)", self.theme["mem_color"]),
-            (self.disk_ax, "Disk Usage (%)", self.theme["disk_color"])
+            (self.disk_ax, self.disk_axis_title(), self.theme["disk_color"]),
+            (self.net_ax, self.network_axis_title(), self.theme["net_color"])
         ]:
             ax.set_facecolor(chart_bg_color)  # Use theme background color
             ax.set_title(title, fontsize=9, color=text_color)  # Use theme text color
@@ -1896,14 +2616,15 @@ class ProcessMonitorApp:
                 spine.set_linewidth(0.5)
             
             # Remove x-labels except for the bottom plot
-            if ax != self.disk_ax:
+            if ax != self.net_ax:
                 ax.set_xticklabels([])
             else:
                 # Set x-axis label color for the bottom plot
                 ax.set_xlabel("Seconds ago", color=text_color, fontsize=8)
                 
             # Set y-axis label color
-            ax.set_ylabel("Usage %", color=text_color, fontsize=8)
+            ax.set_ylabel(self.axis_unit_label(ax), color=text_color, fontsize=8)
+        self.net_ax.set_ylim(0, 0.1)
         
         # Set less vertical distance between subplots
         self.fig.tight_layout(pad=0.5)  # Reduce padding between subplots
@@ -1923,48 +2644,41 @@ class ProcessMonitorApp:
         
         self.disk_line = self.disk_ax.plot(x, disk_init, color=self.theme["disk_color"], linewidth=1.5)[0]
         self.disk_fill = self.disk_ax.fill_between(x, 0, disk_init, color=self.theme["disk_color"], alpha=0.2)
+        self.disk_io_line = self.disk_ax.plot([], [], color=self.theme["disk_color"], linewidth=1.0, linestyle='--')[0]
         
-        # Create canvas with matching background
-        self.canvas = FigureCanvasTkAgg(self.fig, graph_frame)
-        self.canvas.draw()
-        canvas_widget = self.canvas.get_tk_widget()
-        canvas_widget.configure(bg=chart_bg_color, highlightbackground=chart_bg_color, highlightcolor=chart_bg_color)
-        canvas_widget.pack(fill="both", expand=True)
-        
-        # Create a frame for the legend/controls
-        controls_frame = ttk.Frame(parent, style="Card.TFrame")
-        controls_frame.pack(fill="x", padx=5, pady=(2, 5))
-        
-        # Add checkboxes to show/hide plots with centered alignment
-        self.show_cpu_var = tk.BooleanVar(value=True)
-        self.show_mem_var = tk.BooleanVar(value=True)
-        self.show_disk_var = tk.BooleanVar(value=True)
-        
-        # Create a frame to center the checkboxes
-        checkbox_frame = ttk.Frame(controls_frame, style="Card.TFrame")
-        checkbox_frame.pack(anchor="center", pady=2)
-        
-        # Add the checkboxes
-        cpu_check = ttk.Checkbutton(checkbox_frame, 
-                                   text="CPU", 
-                                   variable=self.show_cpu_var,
-                                   command=self.update_performance_graph_colors,
-                                   style="TCheckbutton")
-        cpu_check.pack(side="left", padx=10)
-        
-        mem_check = ttk.Checkbutton(checkbox_frame, 
-                                   text="Memory", 
-                                   variable=self.show_mem_var,
-                                   command=self.update_performance_graph_colors,
-                                   style="TCheckbutton")
-        mem_check.pack(side="left", padx=10)
-        
-        disk_check = ttk.Checkbutton(checkbox_frame, 
-                                    text="Disk", 
-                                    variable=self.show_disk_var,
-                                    command=self.update_performance_graph_colors,
-                                    style="TCheckbutton")
-        disk_check.pack(side="left", padx=10)
+        # Received traffic solid, sent traffic dashed
+        self.net_rx_line = self.net_ax.plot([], [], color=self.theme["net_color"], linewidth=1.5)[0]
+        self.net_tx_line = self.net_ax.plot([], [], color=self.theme["net_color"], linewidth=1.0, linestyle='--')[0]
+    
+    def bottom_axis(self):
+        """The lowest performance axis, which carries the time labels"""
+        return self.net_ax if hasattr(self, 'net_ax') else self.disk_ax
+    
+    def axis_unit_label(self, ax):
+        return "MB/s" if ax is getattr(self, 'net_ax', None) else "Usage %"
+    
+    def network_axis_title(self):
+        """Network axis title, with the latest rates once the collector has them"""
+        totals = self.network.totals if getattr(self, 'network', None) is not None else None
+        if not totals:
+            return "Network Rx / Tx (MB/s)"
+        errors = totals['rx_errors_per_sec'] + totals['tx_errors_per_sec']
+        drops = totals['rx_drops_per_sec'] + totals['tx_drops_per_sec']
+        return (f"Network Rx / Tx (MB/s)  Rx {totals['rx_bytes_per_sec'] / (1024 * 1024):.2f} "
+                f"Tx {totals['tx_bytes_per_sec'] / (1024 * 1024):.2f}, "
+                f"{totals['rx_packets_per_sec'] + totals['tx_packets_per_sec']:.0f} pkt/s, "
+                f"{errors:.0f} err/s, {drops:.0f} drop/s")
+    
+    def disk_axis_title(self):
+        """Disk axis title, with the latest I/O rates once the collector has them"""
+        totals = self.disk_io.totals if getattr(self, 'disk_io', None) is not None else None
+        if not totals:
+            return "Disk Usage / I/O Util (%)"
+        read_mb = totals['read_bytes_per_sec'] / (1024 * 1024)
+        write_mb = totals['write_bytes_per_sec'] / (1024 * 1024)
+        iops = totals['read_iops'] + totals['write_iops']
+        return (f"Disk Usage / I/O Util (%)  R {read_mb:.1f} W {write_mb:.1f} MB/s, "
+                f"{iops:.0f} IOPS, await {totals['await_ms']:.1f} ms")
 
     def _initialize_empty_plots(self):
         """Initialize empty performance plots with proper styling"""
@@ -1978,15 +2692,17 @@ class ProcessMonitorApp:
         self.fig.patch.set_facecolor(chart_bg_color)
         
         # Create subplots
-        self.cpu_ax = self.fig.add_subplot(311)
-        self.mem_ax = self.fig.add_subplot(312)
-        self.disk_ax = self.fig.add_subplot(313)
+        self.cpu_ax = self.fig.add_subplot(411)
+        self.mem_ax = self.fig.add_subplot(412)
+        self.disk_ax = self.fig.add_subplot(413)
+        self.net_ax = self.fig.add_subplot(414)
         
         # Configure plots with improved styling
         for ax, title in [
             (self.cpu_ax, "CPU Usage (%)"),
             (self.mem_ax, "Memory Usage (%)"),
-            (self.disk_ax, "Disk Usage (%)")
+            (self.disk_ax, self.disk_axis_title()),
+            (self.net_ax, self.network_axis_title())
         ]:
             ax.set_facecolor(chart_bg_color)
             ax.set_title(title, fontsize=9, color=text_color)
@@ -2001,14 +2717,15 @@ class ProcessMonitorApp:
                 spine.set_linewidth(0.5)
             
             # Remove x-labels except for the bottom plot
-            if ax != self.disk_ax:
+            if ax != self.net_ax:
                 ax.set_xticklabels([])
             else:
                 # Set x-axis label color for the bottom plot
                 ax.set_xlabel("Seconds ago", color=text_color, fontsize=8)
                 
             # Set y-axis label color
-            ax.set_ylabel("Usage %", color=text_color, fontsize=8)
+            ax.set_ylabel(self.axis_unit_label(ax), color=text_color, fontsize=8)
+        self.net_ax.set_ylim(0, 0.1)
         
         # Set less vertical distance between subplots
         self.fig.tight_layout(pad=0.5)
@@ -2021,6 +2738,9 @@ class ProcessMonitorApp:
         self.cpu_line, = self.cpu_ax.plot(x, y, color=self.theme["cpu_color"], linewidth=1.5)
         self.mem_line, = self.mem_ax.plot(x, y, color=self.theme["mem_color"], linewidth=1.5)  
         self.disk_line, = self.disk_ax.plot(x, y, color=self.theme["disk_color"], linewidth=1.5)
+        self.disk_io_line, = self.disk_ax.plot(x, y, color=self.theme["disk_color"], linewidth=1.0, linestyle='--')
+        self.net_rx_line, = self.net_ax.plot(x, y, color=self.theme["net_color"], linewidth=1.5)
+        self.net_tx_line, = self.net_ax.plot(x, y, color=self.theme["net_color"], linewidth=1.0, linestyle='--')
         
         # Draw the canvas
         self.canvas.draw()
@@ -2039,6 +2759,7 @@ class ProcessMonitorApp:
         cpu_color = self.theme["cpu_color"]  # CPU line color
         mem_color = self.theme["mem_color"]  # Memory line color
         disk_color = self.theme["disk_color"]  # Disk line color
+        net_color = self.theme["net_color"]  # Network line color
         
         # Update figure background color
         self.fig.patch.set_facecolor(chart_bg_color)
@@ -2047,7 +2768,8 @@ class ProcessMonitorApp:
         for ax, title, line, color in [
             (self.cpu_ax, "CPU Usage (%)", self.cpu_line, cpu_color),
             (self.mem_ax, "Memory Usage (%)", self.mem_line, mem_color),
-            (self.disk_ax, "Disk Usage (%)", self.disk_line, disk_color)
+            (self.disk_ax, self.disk_axis_title(), self.disk_line, disk_color),
+            (self.net_ax, self.network_axis_title(), self.net_rx_line, net_color)
         ]:
             # Update background color
             ax.set_facecolor(chart_bg_color)
@@ -2069,14 +2791,20 @@ class ProcessMonitorApp:
             line.set_color(color)
             
             # Update axis labels color
-            if ax == self.disk_ax:
+            if ax == self.net_ax:
                 ax.set_xlabel("Seconds ago", color=text_color, fontsize=8)
-            ax.set_ylabel("Usage %", color=text_color, fontsize=8)
+            ax.set_ylabel(self.axis_unit_label(ax), color=text_color, fontsize=8)
         
         # Update visibility based on checkboxes
         self.cpu_line.set_visible(self.show_cpu_var.get())
         self.mem_line.set_visible(self.show_mem_var.get())
         self.disk_line.set_visible(self.show_disk_var.get())
+        if hasattr(self, 'disk_io_line'):
+            self.disk_io_line.set_color(disk_color)
+            self.disk_io_line.set_visible(self.show_disk_var.get())
+        self.net_tx_line.set_color(net_color)
+        self.net_rx_line.set_visible(self.show_net_var.get())
+        self.net_tx_line.set_visible(self.show_net_var.get())
         
         # Update area fills visibility
         if hasattr(self, 'cpu_fill'):
@@ -2278,6 +3006,7 @@ class ProcessMonitorApp:
                         self.alert_thresholds["cpu"] = cpu_val
                         self.alert_thresholds["memory"] = mem_val
                         self.alert_thresholds["disk"] = disk_val
+                        self.apply_alert_thresholds()
                         
                         # Try to update the thresholds in various places throughout the app
                         if hasattr(self, 'update_alert_thresholds'):
@@ -2392,6 +3121,20 @@ class ProcessMonitorApp:
                                    style="Tab.TButton")
         optimization_btn.pack(side="left", padx=1, expand=True, fill="x")
         
+        # Alerts tab
+        alerts_btn = ttk.Button(tab_frame, 
+                             text="Alerts", 
+                             command=lambda: self.show_pi_tab("alerts"),
+                             style="Tab.TButton")
+        alerts_btn.pack(side="left", padx=1, expand=True, fill="x")
+        
+        # Cgroups tab
+        cgroups_btn = ttk.Button(tab_frame, 
+                              text="Cgroups", 
+                              command=lambda: self.show_pi_tab("cgroups"),
+                              style="Tab.TButton")
+        cgroups_btn.pack(side="left", padx=1, expand=True, fill="x")
+        
         # Create container for tab content with a fixed height to ensure buttons are visible
         self.pi_content_frame = ttk.Frame(parent, style="Card.TFrame", height=440)
         self.pi_content_frame.pack(fill="both", expand=True, padx=5, pady=(5, 5))
@@ -2401,18 +3144,28 @@ class ProcessMonitorApp:
         self.resource_usage_frame = ttk.Frame(self.pi_content_frame, style="Card.TFrame")
         self.process_relations_frame = ttk.Frame(self.pi_content_frame, style="Card.TFrame")
         self.optimization_frame = ttk.Frame(self.pi_content_frame, style="Card.TFrame")
-        
-        # Initially show resource usage tab
-        self.show_pi_tab("resource_usage")
-        
-        # Populate resource usage tab content
-        self.create_resource_usage_tab()
-        
-        # Create Process Relationships tab content (will be populated on demand)
-        self.create_process_relations_tab()
-        
-        # Create Optimization tab content
-        self.create_optimization_tab()
+        self.alerts_frame = ttk.Frame(self.pi_content_frame, style="Card.TFrame")
+        self.cgroups_frame = ttk.Frame(self.pi_content_frame, style="Card.TFrame")
+        
+        # Tab content is built the first time a tab is shown
+        self.pi_tab_builders = {
+            "resource_usage": self.create_resource_usage_tab,
+            "process_relations": self.create_process_relations_tab,
+            "optimization": self.create_optimization_tab,
+            "alerts": self.create_alerts_tab,
+            "cgroups": self.create_cgroups_tab
+        }
+        self.pi_tabs_built = set()
+        
+        # Periodic data refresh, attached only while its tab is visible
+        self.pi_tab_refreshers = {
+            "resource_usage": self.refresh_resource_usage_tab,
+            "cgroups": self.refresh_cgroups_tab
+        }
+        self.pi_refresh_job = None
+        
+        # Initially show resource usage tab, after the first frame is drawn
+        self.root.after_idle(lambda: self.show_pi_tab("resource_usage"))
 
     def create_system_logs_panel(self, parent):
         """Add system logs/info to use free space around System Monitor heading"""
@@ -2536,8 +3289,8 @@ class ProcessMonitorApp:
                 self.refresh_time.config(text=datetime.now().strftime("%H:%M:%S"))
             
             # Update alert count if needed
-            if hasattr(self, 'alert_count') and hasattr(self, 'recent_anomalies'):
-                self.alert_count.config(text=f"{len(self.recent_anomalies)} active")
+            if hasattr(self, 'alert_count'):
+                self.alert_count.config(text=f"{len(self.alert_engine.active_alerts())} active")
             
             # Schedule next update
             self.main_frame.after(10000, self.update_system_logs)
@@ -2549,8 +3302,19 @@ class ProcessMonitorApp:
     def show_pi_tab(self, tab_name):
         """Show the selected Process Intelligence tab"""
         # Hide all frames first
-        for frame in [self.resource_usage_frame, self.process_relations_frame, self.optimization_frame]:
+        for frame in [self.resource_usage_frame, self.process_relations_frame, self.optimization_frame, self.alerts_frame,
+                      self.cgroups_frame]:
             frame.pack_forget()
+        
+        # Stop refreshing the tab we're leaving
+        if self.pi_refresh_job is not None:
+            self.root.after_cancel(self.pi_refresh_job)
+            self.pi_refresh_job = None
+        
+        # Build the tab on first show
+        if tab_name not in self.pi_tabs_built and tab_name in self.pi_tab_builders:
+            self.pi_tabs_built.add(tab_name)
+            self.pi_tab_builders[tab_name]()
             
         # Show the selected frame
         if tab_name == "resource_usage":
@@ -2559,10 +3323,27 @@ class ProcessMonitorApp:
             self.process_relations_frame.pack(fill="both", expand=True)
         elif tab_name == "optimization":
             self.optimization_frame.pack(fill="both", expand=True)
+        elif tab_name == "alerts":
+            self.alerts_frame.pack(fill="both", expand=True)
+        elif tab_name == "cgroups":
+            self.cgroups_frame.pack(fill="both", expand=True)
             
         # Update active tab
         self.active_pi_tab.set(tab_name)
         
+        # Attach the tab's data refresh while it's visible
+        if tab_name in self.pi_tab_refreshers:
+            self.run_pi_refresh(tab_name)
+    
+    def run_pi_refresh(self, tab_name):
+        """Refresh the visible tab's data and schedule the next refresh"""
+        try:
+            self.pi_tab_refreshers[tab_name]()
+        except Exception as e:
+            print(f"Error refreshing {tab_name} tab: {e}")
+        self.pi_refresh_job = self.root.after(self.governor.collector_interval(PI_TAB_REFRESH_INTERVAL),
+                                              lambda: self.run_pi_refresh(tab_name))
+        
     def create_resource_usage_tab(self):
         """Create the Resource Usage tab content"""
             # Time label with more details
@@ -2572,13 +3353,20 @@ class ProcessMonitorApp:
         time_icon = ttk.Label(time_frame, text="⏱️", style="TLabel")
         time_icon.pack(side="left", padx=(0, 5))
         
-        time_label = ttk.Label(
+        self.ru_time_label = ttk.Label(
             time_frame,
-            text="Resource Usage Analysis - 01:25:38",
+            text="Resource Usage Analysis",
             style="InfoTitle.TLabel",
             font=("Segoe UI", 9, "bold")
         )
-        time_label.pack(side="left")
+        self.ru_time_label.pack(side="left")
+        
+        # Roll multi-process applications (browsers, database and web workers) into one line each
+        group_by = ttk.Combobox(time_frame, textvariable=self.group_by_var, values=list(GROUP_BY_CHOICES),
+                                state="readonly", width=12)
+        group_by.pack(side="right")
+        group_by.bind("<<ComboboxSelected>>", lambda e: self.refresh_resource_usage_tab())
+        ttk.Label(time_frame, text="Group by:", style="Info.TLabel").pack(side="right", padx=(0, 3))
             
             # Add a separator for better organization
         ttk.Separator(self.resource_usage_frame, orient="horizontal").pack(fill="x", pady=3)
@@ -2598,16 +3386,14 @@ class ProcessMonitorApp:
         )
         summary_title.pack(side="left")
         
-        # Summary info
-        total_processes = len(list(psutil.process_iter()))
-        mem = psutil.virtual_memory()
-        summary_info = ttk.Label(
+        # Summary info (filled in by refresh_resource_usage_tab)
+        self.ru_summary_info = ttk.Label(
         self.resource_usage_frame,
-                text=f"• Total processes: {total_processes}\n• Memory in use: {mem.percent}%\n• Average CPU load: {psutil.cpu_percent(interval=0.1)}%",
+                text="• Collecting system summary...",
                 style="Info.TLabel",
                 font=("Segoe UI", 9)
             )
-        summary_info.pack(anchor="w", padx=(20, 0))
+        self.ru_summary_info.pack(anchor="w", padx=(20, 0))
             
             # Add a separator for better organization
         ttk.Separator(self.resource_usage_frame, orient="horizontal").pack(fill="x", pady=3)
@@ -2628,13 +3414,13 @@ class ProcessMonitorApp:
         cpu_title.pack(side="left")
         
         # CPU process info
-        cpu_info = ttk.Label(
+        self.ru_cpu_info = ttk.Label(
         self.resource_usage_frame,
                 text="• No significant CPU usage detected",
                 style="Info.TLabel",
                 font=("Segoe UI", 9)
             )
-        cpu_info.pack(anchor="w", padx=(20, 0))
+        self.ru_cpu_info.pack(anchor="w", padx=(20, 0))
             
             # Memory Intensive Processes section
         mem_frame = ttk.Frame(self.resource_usage_frame, style="Card.TFrame")
@@ -2652,13 +3438,13 @@ class ProcessMonitorApp:
         mem_title.pack(side="left")
         
         # Memory process info with multiple entries - keep this compact
-        mem_info = ttk.Label(
+        self.ru_mem_info = ttk.Label(
             self.resource_usage_frame,
-            text="• svchost.exe (PID: 5724): 274.6 MB\n• Cursor.exe (PID: 30184): 618.6 MB\n• MsMpEng.exe (PID: 17112): 393.1 MB",
+            text="• Collecting process data...",
                 style="Info.TLabel",
                 font=("Segoe UI", 9)
             )
-        mem_info.pack(anchor="w", padx=(20, 0))
+        self.ru_mem_info.pack(anchor="w", padx=(20, 0))
         
         # Resource Trends section
         trend_frame = ttk.Frame(self.resource_usage_frame, style="Card.TFrame")
@@ -2676,13 +3462,13 @@ class ProcessMonitorApp:
         trend_title.pack(side="left")
         
         # Trend info
-        trend_info = ttk.Label(
+        self.ru_trend_info = ttk.Label(
         self.resource_usage_frame,
-                text="• CPU usage: Stable\n• Memory usage: Increasing slightly\n• Disk activity: Low",
+                text="• Collecting trend data...",
                 style="Info.TLabel",
                 font=("Segoe UI", 9)
             )
-        trend_info.pack(anchor="w", padx=(20, 0))
+        self.ru_trend_info.pack(anchor="w", padx=(20, 0))
             
         # Bottom controls
         controls_frame = ttk.Frame(self.resource_usage_frame, style="Card.TFrame")
@@ -2692,18 +3478,79 @@ class ProcessMonitorApp:
             controls_frame,
             text="Refresh Analysis",
             style="Accent.TButton",
-            command=self.refresh_dashboard
+            command=self.refresh_resource_usage_tab
         )
         refresh_btn.pack(side="left")
         
         # Add timestamp for last refresh
-        last_refresh = ttk.Label(
+        self.ru_last_refresh = ttk.Label(
             controls_frame,
-            text=f"Last updated: {datetime.now().strftime('%H:%M:%S')}",
+            text="Last updated: --:--:--",
             style="Info.TLabel", 
             font=("Segoe UI", 8)
         )
-        last_refresh.pack(side="left", padx=(10, 0))
+        self.ru_last_refresh.pack(side="left", padx=(10, 0))
+    
+    def refresh_resource_usage_tab(self):
+        """Fill the Resource Usage tab from the latest collected data (no blocking sampling)"""
+        if "resource_usage" not in self.pi_tabs_built:
+            return
+        
+        snapshot = getattr(self, 'latest_process_snapshot', [])
+        cpu_history = getattr(self, 'cpu_usage_history', [])
+        mem_history = getattr(self, 'mem_usage_history', [])
+        disk_history = getattr(self, 'disk_usage_history', [])
+        
+        avg_cpu = sum(cpu_history[-10:]) / len(cpu_history[-10:]) if cpu_history else 0.0
+        mem_percent = mem_history[-1] if mem_history else 0.0
+        self.ru_summary_info.config(
+            text=f"• Total processes: {len(snapshot)}\n• Memory in use: {mem_percent:.1f}%\n• Average CPU load: {avg_cpu:.1f}%")
+        
+        # Top consumers from the latest process snapshot, per application when grouping
+        groups = self.update_app_groups()
+        if groups is not None:
+            by_cpu = [(f"{app['label']} ({app['processes']} processes)", app['cpu'])
+                      for app in groups.top(3, "cpu") if app['cpu'] >= 1.0]
+            by_mem = [(f"{app['label']} ({app['processes']} processes)", app['rss']) for app in groups.top(3, "rss")]
+        else:
+            by_cpu = [(f"{p.get('name') or 'unknown'} (PID: {p['pid']})", p['cpu_percent'])
+                      for p in sorted((p for p in snapshot if (p.get('cpu_percent') or 0) >= 1.0),
+                                      key=lambda p: p.get('cpu_percent') or 0, reverse=True)[:3]]
+            by_mem = [(f"{p.get('name') or 'unknown'} (PID: {p['pid']})", p['memory_info'].rss)
+                      for p in sorted((p for p in snapshot if p.get('memory_info')),
+                                      key=lambda p: p['memory_info'].rss, reverse=True)[:3]]
+        if by_cpu:
+            self.ru_cpu_info.config(text="\n".join(f"• {label}: {cpu:.1f}%" for label, cpu in by_cpu))
+        else:
+            self.ru_cpu_info.config(text="• No significant CPU usage detected")
+        if by_mem:
+            self.ru_mem_info.config(text="\n".join(f"• {label}: {rss / (1024 * 1024):.1f} MB" for label, rss in by_mem))
+        
+        def describe_trend(history):
+            # Compare the last minute with the minute before it
+            if len(history) < 20:
+                return "Collecting data"
+            recent = history[-60:]
+            previous = history[-120:-60] or history[:len(history) // 2]
+            change = sum(recent) / len(recent) - sum(previous) / len(previous)
+            if change > 5:
+                return "Increasing"
+            if change > 1:
+                return "Increasing slightly"
+            if change < -5:
+                return "Decreasing"
+            if change < -1:
+                return "Decreasing slightly"
+            return "Stable"
+        
+        self.ru_trend_info.config(
+            text=f"• CPU usage: {describe_trend(cpu_history)}\n"
+                 f"• Memory usage: {describe_trend(mem_history)}\n"
+                 f"• Disk usage: {describe_trend(disk_history)}")
+        
+        now = datetime.now().strftime('%H:%M:%S')
+        self.ru_time_label.config(text=f"Resource Usage Analysis - {now}")
+        self.ru_last_refresh.config(text=f"Last updated: {now}")
             
     def create_process_relations_tab(self):
         """Create the Process Relations tab content with a simplified view"""
@@ -2735,21 +3582,19 @@ class ProcessMonitorApp:
         
         # Get process list
         try:
-            process_list = [p.name() for p in psutil.process_iter(['name'])]
-            # Remove duplicates and sort
-            process_list = sorted(list(set(process_list)))
+            process_list = self.get_process_names()
         except Exception as e:
             process_list = ["Error loading processes"]
             print(f"Error loading process list: {e}")
         
-        # Create dropdown
-        self.selected_process = tk.StringVar()
+        # Create dropdown (separate from self.selected_process, the process list selection)
+        self.relations_process = tk.StringVar()
         if process_list:
-            self.selected_process.set(process_list[0])
+            self.relations_process.set(process_list[0])
             
         process_dropdown = ttk.Combobox(
             self.process_relations_select_frame,
-            textvariable=self.selected_process,
+            textvariable=self.relations_process,
             values=process_list,
             state="readonly",
             width=30
@@ -2799,13 +3644,21 @@ class ProcessMonitorApp:
         )
         placeholder.place(relx=0.5, rely=0.5, anchor="center")
         
+    def get_process_names(self):
+        """Sorted unique process names, from the latest snapshot when there is one"""
+        snapshot = getattr(self, 'latest_process_snapshot', None)
+        if snapshot:
+            names = [p.get('name') for p in snapshot]
+        else:
+            names = [p.info['name'] for p in psutil.process_iter(['name'])]
+        # Remove duplicates and sort
+        return sorted(set(name for name in names if name))
+    
     def refresh_process_dropdown(self):
         """Refresh the process dropdown with current running processes"""
         try:
             # Get updated process list
-            process_list = [p.name() for p in psutil.process_iter(['name'])]
-            # Remove duplicates and sort
-            process_list = sorted(list(set(process_list)))
+            process_list = self.get_process_names()
             
             # Find all comboboxes in the process_relations_select_frame
             for child in self.process_relations_select_frame.winfo_children():
@@ -2813,9 +3666,9 @@ class ProcessMonitorApp:
                     # Update values
                     child['values'] = process_list
                     # Keep current selection if it exists in the new list
-                    current = self.selected_process.get()
+                    current = self.relations_process.get()
                     if current not in process_list and process_list:
-                        self.selected_process.set(process_list[0])
+                        self.relations_process.set(process_list[0])
                     break
             
             # Show confirmation
@@ -2823,6 +3676,115 @@ class ProcessMonitorApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh process list: {str(e)}")
         
+    def create_alerts_tab(self):
+        """Create the Alerts tab: the alert log, newest at the bottom"""
+        title_label = ttk.Label(
+            self.alerts_frame,
+            text="Alert Log",
+            style="InfoTitle.TLabel",
+            font=("Segoe UI", 10, "bold")
+        )
+        title_label.pack(anchor="w", pady=(0, 5))
+        
+        text_frame = ttk.Frame(self.alerts_frame, style="Card.TFrame")
+        text_frame.pack(fill="both", expand=True)
+        
+        scrollbar = ttk.Scrollbar(text_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        
+        self.alerts_text = tk.Text(
+            text_frame,
+            wrap="word",
+            font=("Consolas", 9),
+            bg=self.theme["card_bg"],
+            fg=self.theme["text"],
+            relief="flat",
+            yscrollcommand=scrollbar.set
+        )
+        self.alerts_text.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.alerts_text.yview)
+        
+        # Everything logged before the tab existed goes in once; later alerts are appended
+        self.alerts_text.insert("end", "\n".join(self.alert_log.lines()))
+        self.alerts_text.see("end")
+        self.alerts_text.config(state="disabled")
+    
+    def create_cgroups_tab(self):
+        """Create the Cgroups tab: process counts and usage aggregated up the cgroup v2 tree"""
+        title_label = ttk.Label(
+            self.cgroups_frame,
+            text="Control Groups",
+            style="InfoTitle.TLabel",
+            font=("Segoe UI", 10, "bold")
+        )
+        title_label.pack(anchor="w", pady=(0, 5))
+        
+        self.cgroups_status = ttk.Label(self.cgroups_frame, text="Collecting...", style="Info.TLabel", wraplength=350)
+        self.cgroups_status.pack(anchor="w", pady=(0, 5))
+        
+        tree_frame = ttk.Frame(self.cgroups_frame, style="Card.TFrame")
+        tree_frame.pack(fill="both", expand=True)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
+        
+        columns = ("procs", "cpu", "memory", "read", "write", "pressure")
+        self.cgroups_tree = ttk.Treeview(tree_frame, columns=columns, style="Custom.Treeview",
+                                         yscrollcommand=scrollbar.set)
+        self.cgroups_tree.heading("#0", text="Cgroup")
+        self.cgroups_tree.column("#0", width=170, stretch=True)
+        for column, text, width in (("procs", "Procs", 45), ("cpu", "CPU %", 55), ("memory", "Memory", 70),
+                                    ("read", "Read/s", 65), ("write", "Write/s", 65), ("pressure", "PSI", 45)):
+            self.cgroups_tree.heading(column, text=text)
+            self.cgroups_tree.column(column, width=width, anchor="e", stretch=False)
+        self.cgroups_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.config(command=self.cgroups_tree.yview)
+    
+    def refresh_cgroups_tab(self):
+        """Re-read the cgroups of the latest process snapshot and update the tree in place"""
+        if "cgroups" not in self.pi_tabs_built:
+            return
+        
+        with self.self_metrics.measure("cgroup_scan"):
+            groups = self.cgroups.collect(getattr(self, 'latest_process_snapshot', []))
+        if not groups:
+            self.cgroups_status.config(text="Cgroup v2 is not available (cgroup v1 host, or no readable processes)")
+        else:
+            self.cgroups_status.config(
+                text=f"{len(groups)} cgroups, {groups['/']['processes'] if '/' in groups else 0} processes "
+                     f"- updated {datetime.now().strftime('%H:%M:%S')}")
+        
+        def size(value):
+            return "-" if value is None else f"{value / (1024 * 1024):.1f} MB"
+        
+        tree = self.cgroups_tree
+        # Parents before children, so every row's parent already exists when it is inserted
+        for path in sorted(groups, key=lambda p: (p.count("/"), p) if p != "/" else (0, "")):
+            group = groups[path]
+            read, write, _ = format_io_rates(tuple(float('nan') if rate is None else rate for rate in
+                                                   (group['read_bytes_per_sec'], group['write_bytes_per_sec'], 0.0)))
+            values = (group['processes'],
+                      "-" if group['cpu_percent'] is None else f"{group['cpu_percent']:.1f}",
+                      size(group['memory']), read, write,
+                      "-" if group['memory_pressure'] is None else f"{group['memory_pressure']:.1f}")
+            if tree.exists(path):
+                if tree.item(path, "values") != tuple(str(v) for v in values):
+                    tree.item(path, values=values)
+            else:
+                parent = group['parent'] if group['parent'] in groups else ""
+                tree.insert(parent, "end", iid=path, text=group['label'], values=values, open=path.count("/") < 2)
+        
+        # Cgroups that emptied out (children go with their parent)
+        for path in [p for p in self.tree_items(tree) if p not in groups]:
+            if tree.exists(path):
+                tree.delete(path)
+    
+    def tree_items(self, tree, parent=""):
+        """Every item id of a Treeview, depth first"""
+        for item in tree.get_children(parent):
+            yield item
+            yield from self.tree_items(tree, item)
+    
     def create_optimization_tab(self):
         """Create the Optimization tab content"""
         # Header
@@ -2900,7 +3862,7 @@ class ProcessMonitorApp:
         """Visualize the selected process"""
         try:
             # Get the selected process
-            selected_process = self.selected_process.get()
+            selected_process = self.relations_process.get()
             
             if not selected_process:
                 messagebox.showwarning("Warning", "Please select a process to visualize")
@@ -2969,12 +3931,8 @@ class ProcessMonitorApp:
                         except (psutil.NoSuchProcess, psutil.AccessDenied):
                             pass
                         
-                        # Get connections
-                        connections = []
-                        try:
-                            connections = process.connections()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
+                        # Connections come from the periodic system-wide socket scan
+                        connections = self.connections.for_pid(pid)
                         
                         # Get open files
                         open_files = []
@@ -2999,12 +3957,7 @@ class ProcessMonitorApp:
                         
                         # Add up to 2 network connections
                         for i, conn in enumerate(connections[:2]):
-                            try:
-                                addr = conn.laddr
-                                related_processes.append(("Network", f"{addr.ip}:{addr.port}"))
-                            except (AttributeError, IndexError):
-                                # Handle case where laddr might not exist
-                                related_processes.append(("Network", "Unknown connection"))
+                            related_processes.append(("Network", f"{conn.local_ip}:{conn.local_port}"))
                         
                         # Add up to 2 file connections
                         for i, file in enumerate(open_files[:2]):
@@ -9,6 +9,15 @@ import shutil  # Added import for shutil
 
 def create_gauge(parent, theme, label, size=120):
     """Create a more modern and visually appealing gauge chart"""
+    fig, ax = build_gauge(theme, label, size)
+    
+    canvas = FigureCanvasTkAgg(fig, parent)
+    canvas.get_tk_widget().pack(side="left", padx=5)
+    
+    return fig, ax
+
+def build_gauge(theme, label, size=120):
+    """Build the gauge figure without attaching it to a Tk canvas"""
     fig = plt.Figure(figsize=(size/100, size/100), dpi=100)
     fig.patch.set_facecolor(theme["card_bg"])
     fig.subplots_adjust(0, 0, 1, 1)
@@ -104,9 +113,6 @@ def create_gauge(parent, theme, label, size=120):
     ax.set_ylim(0, 1)
     ax.axis('off')
     
-    canvas = FigureCanvasTkAgg(fig, parent)
-    canvas.get_tk_widget().pack(side="left", padx=5)
-    
     return fig, ax
 
 def update_gauge(ax, percent, label, theme):
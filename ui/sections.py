@@ -8,11 +8,15 @@ import numpy as np
 import platform
 import time
 import random
+import re
 from tkinter import messagebox
 
 from ui.gauges import create_gauge, update_gauge
 from ui.graphs import create_performance_graphs, update_performance_graphs
 from config import THEMES
+from utils.app_groups import GROUP_BY_CHOICES, app_label
+from utils.classifier import usage_priority
+from utils.process_utils import format_io_rates
 
 class TopSection:
     def __init__(self, parent, app):
@@ -853,7 +857,7 @@ class TopSection:
         """Execute a quick command from the toolbar buttons"""
         try:
             if command == "cpu":
-                cpu_percent = psutil.cpu_percent(interval=0.1)
+                cpu_percent = self.current_cpu()
                 cpu_count = psutil.cpu_count()
                 physical_cores = psutil.cpu_count(logical=False)
                 message = "CPU usage: " + str(round(cpu_percent, 1)) + "% across " + \
@@ -894,14 +898,30 @@ class TopSection:
                 except Exception as e:
                     self.update_chat_display("Error retrieving disk information: " + str(e), "error")
             elif command == "network":
-                net_io = psutil.net_io_counters()
-                sent_mb = net_io.bytes_sent / (1024**2)
-                recv_mb = net_io.bytes_recv / (1024**2)
-                message = "Network: " + str(round(recv_mb, 2)) + "MB received, " + \
-                          str(round(sent_mb, 2)) + "MB sent since startup."
+                network = getattr(self.app, 'network', None)
+                if network is not None and network.interfaces:
+                    # Current per-interface rates from the network collector
+                    lines = []
+                    for name, rates in sorted(network.interfaces.items(),
+                                              key=lambda item: -(item[1]['rx_bytes_per_sec'] + item[1]['tx_bytes_per_sec'])):
+                        line = (f"• {name}: {rates['rx_bytes_per_sec'] / 1024:.1f} KB/s in, "
+                                f"{rates['tx_bytes_per_sec'] / 1024:.1f} KB/s out, "
+                                f"{rates['rx_packets_per_sec'] + rates['tx_packets_per_sec']:.0f} packets/s")
+                        problems = rates['rx_errors_per_sec'] + rates['tx_errors_per_sec'], \
+                            rates['rx_drops_per_sec'] + rates['tx_drops_per_sec']
+                        if any(problems):
+                            line += f", {problems[0]:.1f} errors/s, {problems[1]:.1f} drops/s"
+                        lines.append(line)
+                    message = "Network throughput per interface:\n" + "\n".join(lines)
+                else:
+                    net_io = psutil.net_io_counters()
+                    sent_mb = net_io.bytes_sent / (1024**2)
+                    recv_mb = net_io.bytes_recv / (1024**2)
+                    message = "Network: " + str(round(recv_mb, 2)) + "MB received, " + \
+                              str(round(sent_mb, 2)) + "MB sent since startup."
                 self.update_chat_display("Network Information: " + message, "assistant")
             elif command == "processes":
-                process_count = len(list(psutil.process_iter()))
+                process_count = self.current_process_count()
                 message = "Currently running " + str(process_count) + " processes."
                 self.update_chat_display("Process Information: " + message, "assistant")
             elif command == "help":
@@ -909,6 +929,46 @@ class TopSection:
         except Exception as e:
             self.update_chat_display("Error retrieving " + command + " information: " + str(e), "error")
 
+    def current_cpu(self):
+        """Latest CPU reading from the app's history; a non-blocking psutil read before the first sample"""
+        history = getattr(self.app, 'cpu_usage_history', None)
+        return history[-1] if history else psutil.cpu_percent()
+    
+    def current_process_count(self):
+        """Processes in the latest sample, falling back to a walk of the process table before the first one"""
+        snapshot = getattr(self.app, 'latest_process_snapshot', None)
+        return len(snapshot) if snapshot else len(psutil.pids())
+    
+    def answer_query(self, query):
+        """Reply from the query engine, or None for questions it doesn't plan (left to the keyword handlers)"""
+        engine = getattr(self.app, 'query_engine', None)
+        if engine is None:
+            return None
+        with self.app.self_metrics.measure("assistant_query"):
+            return engine.answer(query, getattr(self.app, 'latest_process_snapshot', []), self.app.metric_index)
+    
+    def process_label(self, pid):
+        """'name (PID n)' for a pid from the latest process sample (so it follows the data source), else just the pid"""
+        snapshot = getattr(self.app, 'latest_process_snapshot', None) or []
+        if getattr(self, 'process_names_snapshot', None) is not snapshot:
+            self.process_names = {info['pid']: info.get('name') for info in snapshot}
+            self.process_names_snapshot = snapshot
+        name = self.process_names.get(pid)
+        return f"{name} (PID {pid})" if name else f"PID {pid}"
+    
+    def describe_port(self, port):
+        """Who holds a local port, from the connection index"""
+        sockets = self.app.connections.on_port(port)
+        if not sockets:
+            return f"Nothing is using local port {port}."
+        lines = []
+        for conn in sockets[:10]:
+            owner = self.process_label(conn.pid) if conn.pid is not None else "unknown process"
+            peer = f" ↔ {conn.remote_ip}:{conn.remote_port}" if conn.remote_port else ""
+            lines.append(f"• {owner}: {conn.proto} {conn.local_ip}:{conn.local_port}{peer} {conn.state}")
+        more = f"\n…and {len(sockets) - 10} more" if len(sockets) > 10 else ""
+        return f"Port {port} is used by {len(sockets)} socket(s):\n" + "\n".join(lines) + more
+    
     def show_assistant_help(self):
         """Show help information for the virtual assistant"""
         help_text = (
@@ -927,7 +987,10 @@ class TopSection:
             "• 'What's my current CPU usage?'\n"
             "• 'Show me disk space information'\n"
             "• 'How is my system performing overall?'\n"
-            "• 'What applications are running?'\n\n"
+            "• 'What applications are running?'\n"
+            "• 'Top 5 memory users owned by www-data'\n"
+            "• 'Peak CPU in the last 15 minutes'\n"
+            "• 'How many databases are running?'\n\n"
             "You can also use the quick command buttons above for instant information."
         )
         self.update_chat_display(help_text, "assistant")
@@ -956,91 +1019,94 @@ class TopSection:
             
             # Generate response immediately
             try:
-                # Simple responses for common queries to improve responsiveness
-                if "memory" in query.lower() or "ram" in query.lower():
-                    mem = psutil.virtual_memory()
-                    used_gb = mem.used / (1024**3)
-                    total_gb = mem.total / (1024**3)
-                    avail_gb = mem.available / (1024**3)
-                    response = "Memory: " + str(round(used_gb, 2)) + "GB used of " + \
-                              str(round(total_gb, 2)) + "GB total (" + str(mem.percent) + "%). You have " + \
-                              str(round(avail_gb, 2)) + "GB available."
-                elif "cpu" in query.lower():
-                    cpu_percent = psutil.cpu_percent(interval=0.1)
-                    cpu_count = psutil.cpu_count()
-                    physical_cores = psutil.cpu_count(logical=False)
-                    response = "CPU usage: " + str(round(cpu_percent, 1)) + "% across " + \
-                              str(physical_cores) + " physical cores (" + str(cpu_count) + " logical cores)."
-                elif "disk" in query.lower() or "storage" in query.lower() or "drive" in query.lower() or "space" in query.lower():
-                    try:
-                        # Handle disk path safely
-                        if platform.system() == 'Windows':
-                            disk_path = 'C:\\'
-                            disk_label = "C:\\"
-                        else:
-                            disk_path = '/'
-                            disk_label = "/"
+                # Questions the query engine can plan ("top 5 memory users owned by www-data") come first
+                response = self.answer_query(query)
+                if response is None:
+                    # Simple responses for common queries to improve responsiveness
+                    if "memory" in query.lower() or "ram" in query.lower():
+                        mem = psutil.virtual_memory()
+                        used_gb = mem.used / (1024**3)
+                        total_gb = mem.total / (1024**3)
+                        avail_gb = mem.available / (1024**3)
+                        response = "Memory: " + str(round(used_gb, 2)) + "GB used of " + \
+                                  str(round(total_gb, 2)) + "GB total (" + str(mem.percent) + "%). You have " + \
+                                  str(round(avail_gb, 2)) + "GB available."
+                    elif "cpu" in query.lower():
+                        cpu_percent = self.current_cpu()
+                        cpu_count = psutil.cpu_count()
+                        physical_cores = psutil.cpu_count(logical=False)
+                        response = "CPU usage: " + str(round(cpu_percent, 1)) + "% across " + \
+                                  str(physical_cores) + " physical cores (" + str(cpu_count) + " logical cores)."
+                    elif "disk" in query.lower() or "storage" in query.lower() or "drive" in query.lower() or "space" in query.lower():
+                        try:
+                            # Handle disk path safely
+                            if platform.system() == 'Windows':
+                                disk_path = 'C:\\'
+                                disk_label = "C:\\"
+                            else:
+                                disk_path = '/'
+                                disk_label = "/"
                             
-                        disk_usage = psutil.disk_usage(disk_path)
-                        free_gb = disk_usage.free / (1024**3)
-                        total_gb = disk_usage.total / (1024**3)
-                        used_gb = disk_usage.used / (1024**3)
+                            disk_usage = psutil.disk_usage(disk_path)
+                            free_gb = disk_usage.free / (1024**3)
+                            total_gb = disk_usage.total / (1024**3)
+                            used_gb = disk_usage.used / (1024**3)
                         
-                        # Use explicit string concatenation instead of f-strings to avoid formatting issues
-                        response = "Disk (" + disk_label + "): " + \
-                                  str(round(used_gb, 2)) + "GB used of " + \
-                                  str(round(total_gb, 2)) + "GB (" + \
-                                  str(disk_usage.percent) + "% used). " + \
-                                  str(round(free_gb, 2)) + "GB free."
-                    except Exception as e:
-                        response = "Error retrieving disk information: " + str(e)
-                elif "network" in query.lower() or "internet" in query.lower() or "wifi" in query.lower() or "connection" in query.lower():
-                    net_io = psutil.net_io_counters()
-                    sent_mb = net_io.bytes_sent / (1024**2)
-                    recv_mb = net_io.bytes_recv / (1024**2)
-                    response = "Network: " + str(round(recv_mb, 2)) + "MB received, " + \
-                              str(round(sent_mb, 2)) + "MB sent since startup."
-                elif "processes" in query.lower() or "apps" in query.lower() or "programs" in query.lower() or "tasks" in query.lower():
-                    process_count = len(list(psutil.process_iter()))
-                    response = "Currently running " + str(process_count) + " processes."
-                elif "performance" in query.lower() or "system status" in query.lower() or "overall" in query.lower():
-                    try:
-                        # Get current system performance metrics
-                        cpu_percent = psutil.cpu_percent(interval=0.1)
-                        mem = psutil.virtual_memory()
-                        mem_percent = mem.percent
+                            # Use explicit string concatenation instead of f-strings to avoid formatting issues
+                            response = "Disk (" + disk_label + "): " + \
+                                      str(round(used_gb, 2)) + "GB used of " + \
+                                      str(round(total_gb, 2)) + "GB (" + \
+                                      str(disk_usage.percent) + "% used). " + \
+                                      str(round(free_gb, 2)) + "GB free."
+                        except Exception as e:
+                            response = "Error retrieving disk information: " + str(e)
+                    elif "network" in query.lower() or "internet" in query.lower() or "wifi" in query.lower() or "connection" in query.lower():
+                        net_io = psutil.net_io_counters()
+                        sent_mb = net_io.bytes_sent / (1024**2)
+                        recv_mb = net_io.bytes_recv / (1024**2)
+                        response = "Network: " + str(round(recv_mb, 2)) + "MB received, " + \
+                                  str(round(sent_mb, 2)) + "MB sent since startup."
+                    elif "processes" in query.lower() or "apps" in query.lower() or "programs" in query.lower() or "tasks" in query.lower():
+                        process_count = self.current_process_count()
+                        response = "Currently running " + str(process_count) + " processes."
+                    elif "performance" in query.lower() or "system status" in query.lower() or "overall" in query.lower():
+                        try:
+                            # Get current system performance metrics
+                            cpu_percent = self.current_cpu()
+                            mem = psutil.virtual_memory()
+                            mem_percent = mem.percent
                         
-                        # Handle disk usage safely
-                        if platform.system() == 'Windows':
-                            disk_path = 'C:\\'
-                        else:
-                            disk_path = '/'
+                            # Handle disk usage safely
+                            if platform.system() == 'Windows':
+                                disk_path = 'C:\\'
+                            else:
+                                disk_path = '/'
                             
-                        disk_usage = psutil.disk_usage(disk_path)
-                        disk_percent = disk_usage.percent
+                            disk_usage = psutil.disk_usage(disk_path)
+                            disk_percent = disk_usage.percent
                         
-                        # Overall system status
-                        if cpu_percent > 80 or mem_percent > 80 or disk_percent > 90:
-                            status = "System is under heavy load"
-                        elif cpu_percent > 60 or mem_percent > 60 or disk_percent > 70:
-                            status = "System is under moderate load"
-                        else:
-                            status = "System is running normally"
+                            # Overall system status
+                            if cpu_percent > 80 or mem_percent > 80 or disk_percent > 90:
+                                status = "System is under heavy load"
+                            elif cpu_percent > 60 or mem_percent > 60 or disk_percent > 70:
+                                status = "System is under moderate load"
+                            else:
+                                status = "System is running normally"
                         
-                        # Use explicit string concatenation instead of f-strings to avoid formatting issues
-                        response = "System Performance: " + status + "\n" + \
-                                  "CPU: " + str(round(cpu_percent, 1)) + "%\n" + \
-                                  "Memory: " + str(round(mem_percent, 1)) + "%\n" + \
-                                  "Disk: " + str(round(disk_percent, 1)) + "%"
-                    except Exception as e:
-                        response = "Error analyzing system performance: " + str(e)
-                elif "help" in query.lower():
-                    response = "I can help with CPU, memory, disk, network, processes, and system performance. Ask me specific questions about your system resources."
-                else:
-                    # Use the more comprehensive response generator
-                    response = self.generate_assistant_response(query)
-                    if not response:  # If an empty string is returned (for help/examples)
-                        return  # Exit early as the display has already been updated
+                            # Use explicit string concatenation instead of f-strings to avoid formatting issues
+                            response = "System Performance: " + status + "\n" + \
+                                      "CPU: " + str(round(cpu_percent, 1)) + "%\n" + \
+                                      "Memory: " + str(round(mem_percent, 1)) + "%\n" + \
+                                      "Disk: " + str(round(disk_percent, 1)) + "%"
+                        except Exception as e:
+                            response = "Error analyzing system performance: " + str(e)
+                    elif "help" in query.lower():
+                        response = "I can help with CPU, memory, disk, network, processes, and system performance. Ask me specific questions about your system resources."
+                    else:
+                        # Use the more comprehensive response generator
+                        response = self.generate_assistant_response(query)
+                        if not response:  # If an empty string is returned (for help/examples)
+                            return  # Exit early as the display has already been updated
             except Exception as e:
                 response = "Error processing your request: " + str(e)
                 
@@ -1074,6 +1140,16 @@ class TopSection:
                 self.show_assistant_examples()
                 return ""
             
+            # "who owns port 5432" / "what is listening on port 80", answered from the connection index
+            port_match = re.search(r"\bport\s+(\d+)", query)
+            if port_match and hasattr(self.app, 'connections'):
+                return self.describe_port(int(port_match.group(1)))
+            
+            # Aggregations, filters and time ranges over history and the latest process sample
+            response = self.answer_query(query)
+            if response is not None:
+                return response
+            
             # Network-related queries - ENHANCED SECTION
             if contains_keywords(query, network_keywords):
                 try:
@@ -1085,18 +1161,24 @@ class TopSection:
                     # Get active connections if requested
                     if "connection" in query:
                         try:
-                            # Count connections by status
+                            # Count connections by status from the last socket scan
                             connection_stats = {"ESTABLISHED": 0, "LISTEN": 0, "TIME_WAIT": 0, "CLOSE_WAIT": 0, "Other": 0}
                             
-                            for conn in psutil.net_connections():
-                                if conn.status in connection_stats:
-                                    connection_stats[conn.status] += 1
+                            for status, count in self.app.connections.state_counts().items():
+                                if status in connection_stats:
+                                    connection_stats[status] += count
                                 else:
-                                    connection_stats["Other"] += 1
+                                    connection_stats["Other"] += count
                             
                             total_connections = sum(connection_stats.values())
                             connection_details = "\n".join([f"• {status}: {count}" for status, count in connection_stats.items() if count > 0])
                             
+                            # The processes holding the most sockets
+                            busiest = sorted(self.app.connections.counts_by_pid().items(), key=lambda item: -item[1])[:5]
+                            if busiest:
+                                connection_details += "\n\nMost connections:\n" + "\n".join(
+                                    f"• {self.process_label(pid)}: {count}" for pid, count in busiest)
+                            
                             return f"Current network connections: {total_connections} total\n\n{connection_details}\n\nNetwork I/O: {recv_mb:.2f}MB received, {sent_mb:.2f}MB sent since startup"
                         except:
                             return f"Found active network connections, but detailed status information requires elevated permissions.\n\nNetwork I/O: {recv_mb:.2f}MB received, {sent_mb:.2f}MB sent since startup"
@@ -1215,16 +1297,11 @@ class TopSection:
                             target_process = parts[1].strip()
                     
                     if target_process:
-                        # Find matching processes
+                        # Find matching processes in the latest sample
                         matches = []
-                        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info', 'create_time', 'num_threads']):
-                            try:
-                                if target_process.lower() in proc.info['name'].lower():
-                                    proc_info = proc.info
-                                    proc_info['memory_mb'] = proc_info['memory_info'].rss / (1024 * 1024)
-                                    matches.append(proc_info)
-                            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                pass
+                        for info in self.app.latest_process_snapshot:
+                            if target_process.lower() in (info.get('name') or "").lower() and info.get('memory_info'):
+                                matches.append(dict(info, memory_mb=info['memory_info'].rss / (1024 * 1024)))
                         
                         if not matches:
                             return f"No processes found matching '{target_process}'."
@@ -1236,7 +1313,7 @@ class TopSection:
                         proc = matches[0]
                         pid = proc['pid']
                         name = proc['name']
-                        cpu = proc['cpu_percent']
+                        cpu = proc['cpu_percent'] or 0.0
                         memory_mb = proc['memory_mb']
                         
                         # Get creation time
@@ -1840,8 +1917,8 @@ class TopSection:
         """Update the AI timeline information with latest statuses"""
         try:
             # Update collection time if the label exists
-            if hasattr(self, 'collection_status'):
-                self.collection_status.config(text=f"{collection_time:.1f} mins")
+            if hasattr(self, 'collection_time'):
+                self.collection_time.config(text=f"{collection_time:.1f} mins")
             
             # Update training status if the label exists
             if hasattr(self, 'training_status'):
@@ -2045,7 +2122,7 @@ class MiddleSection:
         # System info in a single line
         self.system_info_label = ttk.Label(
             info_frame, 
-            text="Processes: 0 | Memory: 0 MB | CPU Avg: 0%", 
+            text="Processes: 0 | Memory: 0 MB | CPU p50/p95/p99 (1m): --%", 
             style="TLabel"
         )
         self.system_info_label.pack(side="left", padx=5)
@@ -2262,6 +2339,16 @@ class MiddleSection:
         process_list_frame = ttk.Frame(notebook, style="Card.TFrame")
         notebook.add(process_list_frame, text="Process Analysis")
         
+        # Group-by choice, shared with the Resource Usage tab
+        if hasattr(self.app, 'group_by_var'):
+            group_frame = ttk.Frame(process_list_frame, style="Card.TFrame")
+            group_frame.pack(fill="x", padx=5, pady=(5, 0))
+            ttk.Label(group_frame, text="Group by:", style="Info.TLabel").pack(side="left", padx=(0, 3))
+            group_by = ttk.Combobox(group_frame, textvariable=self.app.group_by_var, values=list(GROUP_BY_CHOICES),
+                                    state="readonly", width=12)
+            group_by.pack(side="left")
+            group_by.bind("<<ComboboxSelected>>", lambda e: self.update_process_intelligence())
+        
         # Create intelligent process list with center-aligned columns
         columns = ("Process", "Category", "Priority", "Relations")
         self.pi_tree = ttk.Treeview(process_list_frame, 
@@ -2369,12 +2456,8 @@ class MiddleSection:
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
                 
-                # Get connections
-                connections = []
-                try:
-                    connections = process.connections()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+                # Connections come from the periodic system-wide socket scan
+                connections = self.app.connections.for_pid(pid)
                 
                 # Get open files
                 open_files = []
@@ -2399,12 +2482,7 @@ class MiddleSection:
                 
                 # Add up to 2 network connections
                 for i, conn in enumerate(connections[:2]):
-                    try:
-                        addr = conn.laddr
-                        related_processes.append(("Network", f"{addr.ip}:{addr.port}"))
-                    except (AttributeError, IndexError):
-                        # Handle case where laddr might not exist
-                        related_processes.append(("Network", "Unknown connection"))
+                    related_processes.append(("Network", f"{conn.local_ip}:{conn.local_port}"))
                 
                 # Add up to 2 file connections
                 for i, file in enumerate(open_files[:2]):
@@ -2526,209 +2604,44 @@ class MiddleSection:
             error_label.pack(anchor="center", pady=20)
 
     def update_process_intelligence(self):
-        """Update the process intelligence data with improved categories and relations"""
+        """Update the process intelligence list with each process's (or application's) category and relations"""
         try:
             # Clear existing items
             for item in self.pi_tree.get_children():
                 self.pi_tree.delete(item)
             
-            # Get the running processes
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_info']):
-                try:
+            # (classifier input, cache key, name, CPU %, memory MB, relations override) per row
+            rows = []
+            groups = self.app.update_app_groups() if hasattr(self.app, 'update_app_groups') else None
+            if groups is None:
+                for info in getattr(self.app, 'latest_process_snapshot', []):
+                    memory = info.get('memory_info')
+                    cpu = info.get('cpu_percent') or 0.0
+                    memory_mb = memory.rss / (1024*1024) if memory else 0.0
                     # Skip very low resource processes to focus on important ones
-                    if proc.info['cpu_percent'] < 0.1 and proc.info['memory_info'].rss < 10*1024*1024:
+                    if cpu < 0.1 and memory_mb < 10:
                         continue
-                        
-                    processes.append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'cpu': proc.info['cpu_percent'],
-                        'memory': proc.info['memory_info'].rss / (1024*1024)
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            
-            # Sort by resource usage (CPU + Memory impact)
-            processes.sort(key=lambda x: (x['cpu'] + x['memory']/100), reverse=True)
-            
-            # Take top 30 processes for analysis
-            processes = processes[:30]
-            
-            # Process categories mapping
-            categories = {
-                # System processes
-                "svchost.exe": "System Service",
-                "System": "System Core",
-                "Registry": "System Core",
-                "smss.exe": "System Session",
-                "csrss.exe": "System Session",
-                "wininit.exe": "System Init",
-                "services.exe": "Service Control",
-                "lsass.exe": "Security",
-                "winlogon.exe": "System Session",
-                "explorer.exe": "User Interface",
-                "dwm.exe": "Desktop Manager",
-                
-                # User applications
-                "chrome.exe": "Web Browser",
-                "firefox.exe": "Web Browser",
-                "msedge.exe": "Web Browser",
-                "safari.exe": "Web Browser",
-                "opera.exe": "Web Browser",
-                
-                "outlook.exe": "Email Client",
-                "thunderbird.exe": "Email Client",
-                
-                "word.exe": "Office Suite",
-                "excel.exe": "Office Suite",
-                "powerpnt.exe": "Office Suite",
-                "onenote.exe": "Office Suite",
-                "winword.exe": "Office Suite",
-                
-                "code.exe": "Development",
-                "devenv.exe": "Development",
-                "studio64.exe": "Development",
-                "idea64.exe": "Development",
-                "pycharm64.exe": "Development",
-                "atom.exe": "Development",
-                "sublime_text.exe": "Development",
-                "eclipse.exe": "Development",
-                
-                "photoshop.exe": "Creative",
-                "illustrator.exe": "Creative",
-                "premiere.exe": "Creative",
-                "afterfx.exe": "Creative",
-                "gimp.exe": "Creative",
-                
-                "spotify.exe": "Media",
-                "vlc.exe": "Media",
-                "itunes.exe": "Media",
-                "musicbee.exe": "Media",
-                "wmplayer.exe": "Media",
-                
-                "steam.exe": "Gaming",
-                "EpicGamesLauncher.exe": "Gaming",
-                "Battle.net.exe": "Gaming",
-                "GalaxyClient.exe": "Gaming",
-                
-                "python.exe": "Runtime",
-                "java.exe": "Runtime",
-                "javaw.exe": "Runtime",
-                "node.exe": "Runtime",
-                "ruby.exe": "Runtime",
-                "perl.exe": "Runtime",
-                "php.exe": "Runtime",
-                
-                "mysqld.exe": "Database",
-                "postgres.exe": "Database",
-                "sqlservr.exe": "Database",
-                "mongod.exe": "Database",
-                
-                "httpd.exe": "Web Server",
-                "nginx.exe": "Web Server",
-                "apache.exe": "Web Server",
-                
-                "MsMpEng.exe": "Security",
-                "avguard.exe": "Security",
-                "avp.exe": "Security",
-                "avgui.exe": "Security",
-                
-                "OneDrive.exe": "Cloud Sync",
-                "Dropbox.exe": "Cloud Sync",
-                "GoogleDriveFS.exe": "Cloud Sync",
-                
-                "slack.exe": "Communication",
-                "teams.exe": "Communication",
-                "discord.exe": "Communication",
-                "zoom.exe": "Communication",
-                "skype.exe": "Communication",
-                
-                "conhost.exe": "Console Host",
-                "cmd.exe": "Command Line",
-                "powershell.exe": "Command Line",
-                "bash.exe": "Command Line",
-            }
-            
-            # Process priority assignment based on category and resource usage
-            def assign_priority(proc):
-                name = proc['name']
-                cpu = proc['cpu']
-                memory = proc['memory']
-                
-                # Default priority
-                priority = "Normal"
-                
-                # System critical processes
-                if name in ["System", "Registry", "smss.exe", "csrss.exe", "wininit.exe", "lsass.exe"]:
-                    priority = "Critical"
-                
-                # System services
-                elif name in ["services.exe", "svchost.exe", "winlogon.exe"]:
-                    priority = "High"
-                
-                # High resource usage
-                elif cpu > 20 or memory > 500:
-                    priority = "High Usage"
-                
-                # Low resource usage
-                elif cpu < 1 and memory < 50:
-                    priority = "Low"
-                
-                return priority
-            
-            # Process relationships analysis
-            # This is a simplified version - the real relationships would need deeper analysis
-            def determine_relations(proc_name):
-                relations = []
-                
-                # Web browsers often relate to networking and plugins
-                if proc_name in ["chrome.exe", "firefox.exe", "msedge.exe", "safari.exe", "opera.exe"]:
-                    relations = ["Network Services", "Media Plugins", "Extensions"]
-                
-                # Office applications relate to document services
-                elif proc_name in ["word.exe", "excel.exe", "powerpnt.exe", "winword.exe"]:
-                    relations = ["Document Services", "Cloud Sync", "Printing"]
-                
-                # Development tools
-                elif proc_name in ["code.exe", "devenv.exe", "idea64.exe", "pycharm64.exe"]:
-                    relations = ["Runtime Environments", "Source Control", "Build Tools"]
-                
-                # Media applications
-                elif proc_name in ["spotify.exe", "vlc.exe", "itunes.exe"]:
-                    relations = ["Audio Services", "Media Libraries", "Network"]
-                
-                # System processes have many relationships
-                elif proc_name in ["svchost.exe", "services.exe"]:
-                    relations = ["System Services", "Drivers", "User Sessions"]
-                
-                # Simple relation count for other processes
-                else:
-                    relation_count = min(max(1, int(len(proc_name) / 5)), 5)  # Between 1-5 relations
-                    relations = [f"Related Services ({relation_count})"]
-                
-                return ", ".join(relations)
-            
-            # Populate the tree
-            for proc in processes:
-                # Get process name
-                process_name = proc['name']
-                
-                # Determine category
-                category = categories.get(process_name, "Application")
-                
-                # Determine priority
-                priority = assign_priority(proc)
-                
-                # Determine relations
-                relations = determine_relations(process_name)
-                
-                # Add to tree (note: removed Optimizations column)
+                    rows.append((info, None, info.get('name') or "unknown", cpu, memory_mb, None))
+            else:
+                for app in groups.top(len(groups.groups)):
+                    identity = app['identity']
+                    # Applications are classified by executable alone, cached per executable
+                    info = {'name': app_label(identity).strip("[]"), 'exe': identity if identity.startswith("/") else None}
+                    rows.append((info, identity, app['label'], app['cpu'], app['rss'] / (1024*1024),
+                                 f"{app['processes']} processes ({app['children']} children), "
+                                 f"I/O {' / '.join(format_io_rates((app['read'], app['write'], 0.0))[:2])}"))
+            
+            # Sort by resource usage (CPU + Memory impact) and take the top 30 for analysis
+            rows.sort(key=lambda row: row[3] + row[4] / 100, reverse=True)
+            
+            classifier = self.app.classifier
+            for info, key, name, cpu, memory_mb, relations in rows[:30]:
+                classification = classifier.classify(info, key)
                 self.pi_tree.insert('', 'end', values=(
-                    process_name,
-                    category,
-                    priority,
-                    relations
+                    name,
+                    classification.category,
+                    usage_priority(classification, cpu, memory_mb),
+                    relations or classification.relations
                 ))
             
         except Exception as e:
@@ -0,0 +1,66 @@
+import tkinter as tk
+from collections import OrderedDict
+
+import numpy as np
+
+def render_sparkline(cpu, rss, width, height, cpu_color, rss_color, bg):
+    """PhotoImage pixel data for a CPU line drawn over an RSS line"""
+    grid = np.zeros((height, width), dtype=np.intp)  # 0 = background, 1 = RSS, 2 = CPU
+    rows = np.arange(height)[:, None]
+
+    # CPU keeps a fixed floor so an idle process stays flat; RSS uses its own range so growth shows
+    for colour_index, values, floor in ((1, rss, None), (2, cpu, 10.0)):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            continue
+        if floor is not None:
+            low, high = 0.0, max(values.max(), floor)
+        else:
+            low, high = values.min(), values.max()
+            if high - low < max(high * 0.01, 1e-9):
+                low, high = low - 1.0, high + 1.0  # Steady memory: a flat line through the middle
+
+        # Resample to one value per pixel column, then to pixel rows (top row is the maximum)
+        columns = np.interp(np.linspace(0, len(values) - 1, width), np.arange(len(values)), values)
+        y = np.rint((1 - (columns - low) / (high - low)) * (height - 1)).astype(np.intp)
+
+        # Join each column to the previous one so steep changes draw as a continuous line
+        previous = np.concatenate(([y[0]], y[:-1]))
+        lo, hi = np.minimum(previous, y), np.maximum(previous, y)
+        grid[(rows >= lo) & (rows <= hi)] = colour_index
+
+    palette = np.array([bg, rss_color, cpu_color])
+    return " ".join("{" + " ".join(row) + "}" for row in palette[grid])
+
+
+class SparklineCache:
+    """Tk images for process sparklines, redrawn only when their data version changes"""
+
+    def __init__(self, width=60, height=16, max_images=400):
+        self.width = width
+        self.height = height
+        self.max_images = max_images
+        self.images = OrderedDict()  # key -> [version, PhotoImage], least recently used first
+        self.redraws = 0
+
+    def get(self, key, version, cpu, rss, theme):
+        """Image for a key, redrawing it in place if the version moved on"""
+        cached = self.images.get(key)
+        if cached is not None:
+            self.images.move_to_end(key)
+            if cached[0] == version:
+                return cached[1]
+            image = cached[1]
+        else:
+            if len(self.images) >= self.max_images:
+                # Reuse the least recently shown image rather than allocating a new one
+                _, (_, image) = self.images.popitem(last=False)
+            else:
+                image = tk.PhotoImage(width=self.width, height=self.height)
+
+        image.put(render_sparkline(cpu, rss, self.width, self.height,
+                                   theme["cpu_color"], theme["mem_color"], theme["card_bg"]))
+        self.images[key] = [version, image]
+        self.redraws += 1
+        return image
@@ -1,9 +1,18 @@
+# sklearn and statsmodels take seconds to import, so they are imported where they
+# are used (or ahead of time by preload_ai_stack) instead of at module load
+import itertools
 import numpy as np
-from sklearn.ensemble import IsolationForest
-from statsmodels.tsa.arima.model import ARIMA
-import pandas as pd
+import multiprocessing
+import os
+import pickle
+import time
 from datetime import datetime, timedelta
 
+from utils.process_utils import snapshot_columns
+
+# Bump whenever the layout of the persisted model state changes
+MODEL_STATE_SCHEMA_VERSION = 1
+
 class ResourcePredictor:
     """Predictive analytics for system resource usage"""
     
@@ -13,26 +22,98 @@ class ResourcePredictor:
         self.mem_model = None
         self.disk_model = None
         self.min_samples_for_prediction = 30
+        self.fitted_params = {}  # Last ARIMA parameters per series, persisted across restarts
+        self.latest_predictions = None  # From the last background forecast
     
-    def can_predict(self, data):
-        """Check if we have enough data to make predictions"""
-        return len(data) >= self.min_samples_for_prediction
+    def can_predict(self, data, name=None):
+        """Check if we have enough data (or saved parameters) to make predictions"""
+        return len(data) >= self.min_samples_for_prediction or (len(data) > 0 and name in self.fitted_params)
     
-    def predict_next_values(self, data, steps=5):
+    def forecast_from_params(self, data, params, steps=5):
+        """Forecast an AR(1) series directly from saved (const, ar.L1, sigma2) parameters"""
+        mean, phi = params[0], params[1]
+        deviation = data[-1] - mean
+        return np.array([mean + deviation * phi ** step for step in range(1, steps + 1)])
+    
+    def predict_next_values(self, data, steps=5, name=None):
         """Predict the next values using ARIMA model"""
-        if not self.can_predict(data):
+        if not self.can_predict(data, name):
             return None
             
         try:
-            # Use a simple ARIMA model for prediction
+            # Not enough history yet: fall back on the parameters from the last session
+            if len(data) < self.min_samples_for_prediction:
+                return self.forecast_from_params(data, self.fitted_params[name], steps)
+            
+            from statsmodels.tsa.arima.model import ARIMA
+            
+            # Use a simple ARIMA model for prediction, warm-started from the last fit
             model = ARIMA(data, order=(1, 0, 0))
-            model_fit = model.fit()
+            if name in self.fitted_params:
+                model_fit = model.fit(start_params=self.fitted_params[name])
+            else:
+                model_fit = model.fit()
+            if name:
+                self.fitted_params[name] = np.asarray(model_fit.params).tolist()
             forecast = model_fit.forecast(steps=steps)
             return forecast
         except Exception as e:
             print(f"Prediction error: {e}")
             return None
     
+    def validate(self, cpu_data, mem_data, disk_data, tolerance=3.0, min_error=2.0):
+        """Check that the saved parameters still forecast recent data.
+        
+        Each series' one-step-ahead forecasts must have an RMS error within tolerance
+        times the fitted noise level (at least min_error percentage points).
+        """
+        for name, data in (('cpu', cpu_data), ('memory', mem_data), ('disk', disk_data)):
+            params = self.fitted_params.get(name)
+            if params is None or len(data) < 2:
+                continue
+            try:
+                mean, phi, sigma2 = map(float, params)
+                if not (abs(phi) < 1 and sigma2 >= 0):
+                    return False
+                data = np.asarray(data, dtype=float)
+                errors = data[1:] - (mean + (data[:-1] - mean) * phi)
+                if np.sqrt(np.mean(errors ** 2)) > tolerance * max(np.sqrt(sigma2), min_error):
+                    return False
+            except Exception as e:
+                print(f"Predictor validation error: {e}")
+                return False
+        return True
+    
+    def reset(self):
+        """Forget the saved parameters"""
+        self.fitted_params = {}
+        self.latest_predictions = None
+    
+    def get_state(self):
+        """Fitted state to persist between sessions"""
+        return {'fitted_params': dict(self.fitted_params)}
+    
+    def set_state(self, state):
+        """Restore state saved by get_state"""
+        self.fitted_params = {name: list(params) for name, params in state.get('fitted_params', {}).items()
+                              if len(params) == 3}
+    
+    def predict_async(self, trainer, cpu_history, mem_history, disk_history, on_complete=None):
+        """Refresh latest_predictions on the trainer's worker pool; False if there is too little data or a forecast is running"""
+        if not self.can_predict(cpu_history, 'cpu') or trainer.is_busy("resource_predictor"):
+            return False
+        
+        def finished(result, error):
+            if result is not None:
+                self.latest_predictions, params = result
+                self.fitted_params.update(params)
+            if on_complete:
+                on_complete(result is not None, error)
+        
+        return trainer.submit("resource_predictor", fit_forecasts,
+                              (list(cpu_history), list(mem_history), list(disk_history), dict(self.fitted_params)),
+                              on_complete=finished)
+    
     def get_predictions(self, cpu_history, mem_history, disk_history):
         """Get predictions for CPU, memory and disk usage"""
         predictions = {
@@ -43,10 +124,10 @@ class ResourcePredictor:
         }
         
         # Only make predictions if we have enough data
-        if self.can_predict(cpu_history):
-            cpu_pred = self.predict_next_values(cpu_history)
-            mem_pred = self.predict_next_values(mem_history)
-            disk_pred = self.predict_next_values(disk_history)
+        if self.can_predict(cpu_history, 'cpu'):
+            cpu_pred = self.predict_next_values(cpu_history, name='cpu')
+            mem_pred = self.predict_next_values(mem_history, name='memory')
+            disk_pred = self.predict_next_values(disk_history, name='disk')
             
             if cpu_pred is not None and mem_pred is not None and disk_pred is not None:
                 # Generate time labels for predictions (5 minutes into future)
@@ -88,26 +169,86 @@ class AnomalyDetector:
         self.update_count += 1
         return False
     
+    def prepare_training_data(self, cpu_data, mem_data, disk_data):
+        """Combine the data into a single feature matrix"""
+        return np.column_stack((cpu_data, mem_data, disk_data))
+    
+    def install_model(self, model):
+        """Start using a freshly fitted model"""
+        self.model = model
+        self.is_trained = True
+        self.last_training_time = datetime.now().strftime("%H:%M:%S")
+    
     def train(self, cpu_data, mem_data, disk_data):
         """Train the anomaly detection model"""
         if len(cpu_data) < self.min_samples_for_training:
             return False
             
         try:
-            # Combine the data into a single feature matrix
-            X = np.column_stack((cpu_data, mem_data, disk_data))
-            
-            # Train an Isolation Forest model
-            self.model = IsolationForest(contamination=0.05, random_state=42)
-            self.model.fit(X)
-            
-            self.is_trained = True
-            self.last_training_time = datetime.now().strftime("%H:%M:%S")
+            X = self.prepare_training_data(cpu_data, mem_data, disk_data)
+            self.install_model(fit_isolation_forest(X))
             return True
         except Exception as e:
             print(f"Training error: {e}")
             return False
     
+    def validate(self, cpu_data, mem_data, disk_data, max_outlier_fraction=0.5):
+        """Check that the model still describes recent data"""
+        if not self.is_trained or len(cpu_data) == 0:
+            return False
+        try:
+            X = self.prepare_training_data(cpu_data, mem_data, disk_data)
+            if getattr(self.model, 'n_features_in_', X.shape[1]) != X.shape[1]:
+                return False
+            return float(np.mean(self.model.predict(X) == -1)) <= max_outlier_fraction
+        except Exception as e:
+            print(f"Model validation error: {e}")
+            return False
+    
+    def get_state(self):
+        """Fitted state to persist between sessions"""
+        if not self.is_trained:
+            return None
+        return {'model': self.model, 'last_training_time': self.last_training_time}
+    
+    def set_state(self, state):
+        """Restore state saved by get_state"""
+        self.model = state['model']
+        self.is_trained = True
+        self.last_training_time = state.get('last_training_time')
+    
+    def reset(self):
+        """Forget the current model"""
+        self.model = None
+        self.is_trained = False
+        self.last_training_time = None
+        self.update_count = 0
+    
+    def train_async(self, trainer, cpu_data, mem_data, disk_data, on_progress=None, on_complete=None):
+        """Train the model on the trainer's worker pool, keeping the current model until the new one is ready"""
+        if len(cpu_data) < self.min_samples_for_training:
+            return False
+        
+        if on_progress:
+            on_progress(25, "Preprocessing training data...")
+        X = self.prepare_training_data(cpu_data, mem_data, disk_data)
+        
+        def finished(model, error):
+            if model is not None:
+                if on_progress:
+                    on_progress(75, "Validating model parameters...")
+                try:
+                    # Make sure the returned model can actually score our data before using it
+                    model.score_samples(X[-1:])
+                    self.install_model(model)
+                except Exception as e:
+                    model, error = None, f"validation failed: {e}"
+            if on_complete:
+                on_complete(model is not None, error)
+        
+        return trainer.submit("anomaly_detector", fit_isolation_forest, (X,),
+                              on_progress=on_progress, on_complete=finished)
+    
     def detect_anomalies(self, cpu_data, mem_data, disk_data):
         """Detect anomalies in the current resource usage"""
         if not self.is_trained:
@@ -139,4 +280,467 @@ class AnomalyDetector:
             }
         except Exception as e:
             print(f"Anomaly detection error: {e}")
-            return None 
+            return None
+
+
+
+class StreamingAnomalyDetector:
+    """Streaming anomaly detection using robust online z-scores.
+    
+    Each metric keeps an EWMA estimate of its median and MAD, so every sample is
+    scored and absorbed in constant time. A sustained one-sided shift is treated
+    as drift and the baseline is moved to the new level instead of retraining.
+    """
+    
+    def __init__(self, metrics=("cpu", "memory", "disk"), alpha=0.05, threshold=4.0,
+                 warmup_samples=30, drift_patience=30, min_scale=0.5):
+        self.alpha = alpha                      # EWMA weight for median/MAD updates
+        self.threshold = threshold              # Robust z-score that counts as anomalous
+        self.warmup_samples = warmup_samples    # Samples before flags are raised
+        self.drift_patience = drift_patience    # Consecutive same-side anomalies that mean drift
+        self.min_scale = min_scale              # Floor for the MAD so flat series don't explode
+        self.metrics = []
+        self.index = {}
+        self.median = np.zeros(0)
+        self.mad = np.zeros(0)
+        self.level = np.zeros(0)                # Fast EWMA of raw values, used to re-baseline on drift
+        self.count = np.zeros(0, dtype=np.int64)
+        self.streak = np.zeros(0, dtype=np.int64)
+        self.active = np.zeros(0, dtype=bool)
+        self.last_result = None
+        for name in metrics:
+            self.add_metric(name)
+    
+    def add_metric(self, name):
+        """Start tracking another metric"""
+        if name in self.index:
+            return
+        self.index[name] = len(self.metrics)
+        self.metrics.append(name)
+        self.median = np.append(self.median, 0.0)
+        self.mad = np.append(self.mad, 0.0)
+        self.level = np.append(self.level, 0.0)
+        self.count = np.append(self.count, 0)
+        self.streak = np.append(self.streak, 0)
+        self.active = np.append(self.active, False)
+    
+    def is_ready(self):
+        """Check if every metric is past its warmup period"""
+        return bool(self.metrics) and bool(np.all(self.count >= self.warmup_samples))
+    
+    def update(self, sample):
+        """Score a {metric: value} sample and fold it into the baselines"""
+        for name in sample:
+            if name not in self.index:
+                self.add_metric(name)
+        
+        values = np.full(len(self.metrics), np.nan)
+        for name, value in sample.items():
+            values[self.index[name]] = value
+        seen = ~np.isnan(values)
+        
+        # First sample of a metric seeds its baseline
+        first = seen & (self.count == 0)
+        self.median[first] = values[first]
+        self.level[first] = values[first]
+        
+        # Robust z-score against the current baseline
+        scale = np.maximum(1.4826 * self.mad, self.min_scale)
+        z = np.where(seen, (values - self.median) / scale, 0.0)
+        warm = self.count >= self.warmup_samples
+        flagged = seen & warm & (np.abs(z) > self.threshold)
+        
+        # Clipped update keeps single outliers from dragging the median around;
+        # flagged samples don't widen the MAD so a level shift can be seen as drift
+        delta = np.where(seen, values - self.median, 0.0)
+        step = np.clip(delta, -3 * scale, 3 * scale)
+        self.median += self.alpha * step
+        spread = np.where(seen & ~flagged, np.abs(delta) - self.mad, 0.0)
+        self.mad += self.alpha * np.minimum(spread, 3 * scale)
+        self.level += np.where(seen, 0.3 * (np.nan_to_num(values) - self.level), 0.0)
+        self.count += seen
+        
+        # Drift: the same side of the baseline is exceeded for drift_patience samples
+        direction = np.sign(z) * flagged
+        same_side = (direction != 0) & (direction == np.sign(self.streak))
+        self.streak = np.where(same_side, self.streak + direction,
+                               np.where(flagged, direction, 0)).astype(np.int64)
+        drifted = np.abs(self.streak) >= self.drift_patience
+        if drifted.any():
+            self.median[drifted] = self.level[drifted]
+            self.streak[drifted] = 0
+            flagged &= ~drifted
+        
+        onset = flagged & ~self.active
+        self.active = flagged
+        
+        result = {
+            'is_anomaly': bool(flagged.any()),
+            'score': float(np.max(np.abs(z))) if len(z) else 0.0,
+            'scores': {name: float(z[i]) for i, name in enumerate(self.metrics)},
+            'anomalous_metrics': [self.metrics[i] for i in np.flatnonzero(flagged)],
+            'new_anomalies': [self.metrics[i] for i in np.flatnonzero(onset)],
+            'drift': [self.metrics[i] for i in np.flatnonzero(drifted)],
+            'detection_time': datetime.now().strftime("%H:%M:%S")
+        }
+        result.update(sample)
+        self.last_result = result
+        return result
+    
+    def validate(self, samples, max_outlier_fraction=0.5):
+        """Check that the baselines still describe a list of recent {metric: value} samples"""
+        if not samples or not self.is_ready():
+            return False
+        scale = np.maximum(1.4826 * self.mad, self.min_scale)
+        outliers = 0
+        total = 0
+        for sample in samples:
+            for name, value in sample.items():
+                if name in self.index:
+                    i = self.index[name]
+                    outliers += abs(value - self.median[i]) / scale[i] > self.threshold
+                    total += 1
+        return total > 0 and outliers / total <= max_outlier_fraction
+    
+    def get_state(self):
+        """Baselines to persist between sessions"""
+        return {
+            'metrics': list(self.metrics),
+            'median': self.median.tolist(),
+            'mad': self.mad.tolist(),
+            'count': self.count.tolist()
+        }
+    
+    def set_state(self, state):
+        """Restore baselines saved by get_state"""
+        for i, name in enumerate(state['metrics']):
+            self.add_metric(name)
+            j = self.index[name]
+            self.median[j] = state['median'][i]
+            self.level[j] = state['median'][i]
+            self.mad[j] = state['mad'][i]
+            self.count[j] = state['count'][i]
+    
+    def reset(self):
+        """Forget all baselines"""
+        metrics = list(self.metrics)
+        self.__init__(metrics, self.alpha, self.threshold, self.warmup_samples,
+                      self.drift_patience, self.min_scale)
+
+
+
+class ProcessAnomalyDetector:
+    """Per-process baselines for the whole process table, scored in one vectorized pass.
+    
+    Each live process owns a row in columnar EWMA mean/variance arrays for CPU,
+    RSS, threads and file descriptors. Rows are found by pid and checked against
+    the stored create_time, so a reused pid starts a fresh baseline. Rows of
+    exited processes are recycled.
+    """
+    
+    FEATURES = ("cpu", "rss", "threads", "fds")
+    
+    def __init__(self, capacity=1024, alpha=0.1, threshold=4.0, warmup_samples=10,
+                 min_scale=(2.0, 8 * 1024 * 1024, 2.0, 4.0)):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup_samples = warmup_samples
+        self.min_scale = np.asarray(min_scale, dtype=np.float64)  # Per-feature noise floor
+        self.slots = {}      # pid -> row
+        self.free_rows = []
+        self.size = 0        # Rows handed out so far
+        self.mean = np.zeros((capacity, len(self.FEATURES)))
+        self.var = np.zeros((capacity, len(self.FEATURES)))
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.created = np.zeros(capacity)  # create_time of the process holding each row
+        self.pids = np.zeros(capacity, dtype=np.int64)  # pid holding each row
+        self.in_use = np.zeros(capacity, dtype=bool)
+    
+    def _grow(self):
+        """Double the row capacity"""
+        capacity = len(self.count) * 2
+        self.mean = np.resize(self.mean, (capacity, len(self.FEATURES)))
+        self.var = np.resize(self.var, (capacity, len(self.FEATURES)))
+        self.count = np.resize(self.count, capacity)
+        self.active = np.resize(self.active, capacity)
+        self.created = np.resize(self.created, capacity)
+        self.pids = np.resize(self.pids, capacity)
+        self.in_use = np.resize(self.in_use, capacity)
+        self.in_use[len(self.count) // 2:] = False
+    
+    def _rows(self, pids, created):
+        """Rows for a batch of processes; new processes (and reused pids) get a reset row"""
+        rows = np.fromiter(map(self.slots.get, pids, itertools.repeat(-1)), dtype=np.intp, count=len(pids))
+        missing = np.flatnonzero(rows < 0)
+        if len(missing):
+            # Recycled rows first, then fresh ones past the rows handed out so far, in one pass
+            split = max(0, len(self.free_rows) - len(missing))
+            new_rows = self.free_rows[split:]
+            del self.free_rows[split:]
+            extra = len(missing) - len(new_rows)
+            while self.size + extra > len(self.count):
+                self._grow()
+            new_rows += range(self.size, self.size + extra)
+            self.size += extra
+            rows[missing] = new_rows
+            new_pids = [pids[i] for i in missing.tolist()]
+            self.slots.update(zip(new_pids, new_rows))
+            self.pids[new_rows] = new_pids
+            self.in_use[new_rows] = True
+            self.created[new_rows] = np.nan  # Never equal, so they reset below
+        reset = rows[self.created[rows] != created]
+        self.count[reset] = 0
+        self.active[reset] = False
+        self.created[rows] = created
+        return rows
+    
+    def release(self, pids):
+        """Free the rows of processes that have exited"""
+        for pid in pids:
+            row = self.slots.pop(pid, None)
+            if row is not None:
+                self.in_use[row] = False
+                self.free_rows.append(row)
+    
+    def score(self, pids, created, features):
+        """Score and absorb one (n, 4) feature matrix; returns (z-scores, flagged mask, onset mask)"""
+        rows = self._rows(pids, created)
+        count = self.count[rows]
+        mean = self.mean[rows]
+        var = self.var[rows]
+        
+        # New processes start their baseline at their first sample
+        fresh = count == 0
+        mean[fresh] = features[fresh]
+        var[fresh] = 0.0
+        
+        scale = np.maximum(np.sqrt(var), self.min_scale)
+        delta = features - mean
+        z = delta / scale
+        flagged = (count >= self.warmup_samples) & (np.abs(z) > self.threshold).any(axis=1)
+        onset = flagged & ~self.active[rows]
+        
+        # Clip the update so one burst doesn't immediately become the new normal
+        scale *= 3
+        np.minimum(delta, scale, out=delta)
+        np.maximum(delta, -scale, out=delta)
+        self.mean[rows] = mean + self.alpha * delta
+        self.var[rows] = (1 - self.alpha) * (var + self.alpha * delta * delta)
+        self.count[rows] = count + 1
+        self.active[rows] = flagged
+        
+        # Anything not in this snapshot has exited
+        if len(self.slots) > len(rows):
+            exited = self.in_use.copy()
+            exited[rows] = False
+            self.release(self.pids[exited].tolist())
+        return z, flagged, onset
+    
+    def update_from_snapshot(self, snapshot, fd_attr='num_fds', columns=None):
+        """Score a process snapshot; returns details for processes that just started misbehaving.
+        
+        columns is snapshot_columns(snapshot, fd_attr) when the caller already has it.
+        """
+        if not snapshot:
+            return []
+        columns = columns if columns is not None else snapshot_columns(snapshot, fd_attr)
+        pids = columns.pids
+        created = np.nan_to_num(np.array(columns.create_times, dtype=float))
+        features = np.nan_to_num(np.column_stack((columns.cpu, columns.rss, columns.threads, columns.fds)))
+        
+        z, flagged, onset = self.score(pids, created, features)
+        anomalies = []
+        for i in np.flatnonzero(onset):
+            deviating = [name for name, value in zip(self.FEATURES, z[i]) if abs(value) > self.threshold]
+            anomalies.append({
+                'pid': snapshot[i]['pid'],
+                'name': snapshot[i].get('name') or "unknown",
+                'features': deviating,
+                'scores': dict(zip(self.FEATURES, z[i].tolist())),
+                'values': dict(zip(self.FEATURES, features[i].tolist()))
+            })
+        return anomalies
+
+def preload_ai_stack():
+    """Import sklearn and statsmodels; returns the time it took in seconds"""
+    start = time.perf_counter()
+    import sklearn.ensemble
+    import statsmodels.tsa.arima.model
+    return time.perf_counter() - start
+
+
+def save_model_state(path, predictor=None, detector=None, stream_detector=None):
+    """Write fitted model state to disk with a schema version"""
+    import sklearn
+    
+    state = {
+        'schema_version': MODEL_STATE_SCHEMA_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'saved_at': time.time(),
+        'predictor': predictor.get_state() if predictor else None,
+        'anomaly_detector': detector.get_state() if detector else None,
+        'stream_detector': stream_detector.get_state() if stream_detector else None
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file first so a crash never leaves a truncated state file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"Error saving model state: {e}")
+        return False
+
+
+def load_model_state(path, max_age=None):
+    """Read model state written by save_model_state; returns None if missing, stale or incompatible"""
+    import sklearn
+    
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+    except Exception as e:
+        print(f"Error loading model state: {e}")
+        return None
+    
+    if not isinstance(state, dict) or state.get('schema_version') != MODEL_STATE_SCHEMA_VERSION:
+        print("Ignoring saved model state: schema version mismatch")
+        return None
+    if state.get('sklearn_version') != sklearn.__version__:
+        # Pickled estimators are not guaranteed to work across sklearn upgrades
+        state['anomaly_detector'] = None
+    if max_age is not None and time.time() - state.get('saved_at', 0) > max_age:
+        print("Ignoring saved model state: too old")
+        return None
+    return state
+
+def fit_forecasts(cpu_history, mem_history, disk_history, fitted_params):
+    """Fit the three ARIMA forecasts (runs inside a training worker process); returns (predictions, parameters)"""
+    predictor = ResourcePredictor()
+    predictor.fitted_params = dict(fitted_params)
+    with np.errstate(all='ignore'):
+        predictions = predictor.get_predictions(cpu_history, mem_history, disk_history)
+    return predictions, predictor.fitted_params
+
+def fit_isolation_forest(X, contamination=0.05, random_state=42):
+    """Fit an Isolation Forest (runs inside a training worker process)"""
+    from sklearn.ensemble import IsolationForest
+    
+    model = IsolationForest(contamination=contamination, random_state=random_state)
+    model.fit(X)
+    return model
+
+
+class TrainingJob:
+    """A single model fit submitted to the BackgroundTrainer"""
+    
+    def __init__(self, name, result, time_budget, on_progress=None, on_complete=None):
+        self.name = name
+        self.result = result
+        self.time_budget = time_budget
+        self.started = time.monotonic()
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+    
+    def elapsed(self):
+        """Seconds since the job was submitted"""
+        return time.monotonic() - self.started
+    
+    def report(self, percent, message):
+        """Forward a progress event to the caller"""
+        if self.on_progress:
+            try:
+                self.on_progress(percent, message)
+            except Exception as e:
+                print(f"Training progress callback error: {e}")
+    
+    def finish(self, model, error):
+        """Forward the completion event to the caller"""
+        if self.on_complete:
+            try:
+                self.on_complete(model, error)
+            except Exception as e:
+                print(f"Training completion callback error: {e}")
+
+
+class BackgroundTrainer:
+    """Runs model fits in a worker process pool with a time budget.
+    
+    Nothing here blocks: poll() is called periodically from the Tk loop and all
+    progress/completion callbacks are invoked from it, on the Tk thread.
+    """
+    
+    def __init__(self, processes=1, time_budget=30.0):
+        self.processes = processes
+        self.time_budget = time_budget
+        self.pool = None
+        self.jobs = {}
+    
+    def _get_pool(self):
+        """Create the worker pool on first use"""
+        if self.pool is None:
+            # Spawn instead of fork so workers never inherit the Tk/X11 state
+            self.pool = multiprocessing.get_context("spawn").Pool(processes=self.processes)
+        return self.pool
+    
+    def is_busy(self, name=None):
+        """Check if a job (or any job) is still running"""
+        return name in self.jobs if name else bool(self.jobs)
+    
+    def get_job(self, name):
+        """Get a running job by name"""
+        return self.jobs.get(name)
+    
+    def submit(self, name, func, args=(), on_progress=None, on_complete=None, time_budget=None):
+        """Queue func(*args) on the pool; returns False if a job with this name is still running"""
+        if name in self.jobs:
+            return False
+        
+        try:
+            result = self._get_pool().apply_async(func, args)
+        except Exception as e:
+            print(f"Error submitting training job: {e}")
+            return False
+        
+        job = TrainingJob(name, result, time_budget or self.time_budget, on_progress, on_complete)
+        self.jobs[name] = job
+        job.report(50, "Training model in background worker...")
+        return True
+    
+    def poll(self):
+        """Deliver finished jobs and stop the ones that ran over their time budget"""
+        for name, job in list(self.jobs.items()):
+            if job.result.ready():
+                del self.jobs[name]
+                try:
+                    model = job.result.get(0)
+                except Exception as e:
+                    job.finish(None, f"training failed: {e}")
+                    continue
+                job.finish(model, None)
+            elif job.elapsed() > job.time_budget:
+                self.cancel(reason=f"timed out after {job.time_budget:.0f}s")
+                break
+    
+    def cancel(self, reason="cancelled"):
+        """Cancel all running jobs; fits already in a worker are stopped by terminating the pool"""
+        jobs = list(self.jobs.values())
+        self.jobs = {}
+        if self.pool is not None:
+            try:
+                self.pool.terminate()
+            except Exception as e:
+                print(f"Error terminating training pool: {e}")
+            # A fresh pool is created on the next submit
+            self.pool = None
+        for job in jobs:
+            job.finish(None, reason)
+    
+    def shutdown(self):
+        """Stop all workers (called when the application closes)"""
+        self.cancel(reason="shutting down")
@@ -0,0 +1,79 @@
+import re
+import time
+from collections import deque
+
+# Parts of an alert message that change between repeats of the same alert
+VOLATILE_PATTERN = re.compile(r"^\[[^\]]*\]\s*|[-+]?\d+(?:\.\d+)?")
+
+
+def alert_key(message):
+    """Coalescing key for a message: the text without its timestamp and numbers"""
+    return VOLATILE_PATTERN.sub("", message).strip()
+
+
+class AlertLogEntry:
+    """One line of the alert log, possibly standing for several repeats"""
+
+    __slots__ = ("seq", "key", "message", "first", "last", "count")
+
+    def __init__(self, seq, key, message, now):
+        self.seq = seq
+        self.key = key
+        self.message = message
+        self.first = now
+        self.last = now
+        self.count = 1
+
+    def text(self):
+        if self.count == 1:
+            return self.message
+        return f"{self.message} (×{self.count} in last {max(1, round(self.last - self.first))}s)"
+
+
+class AlertLog:
+    """Bounded alert history that folds repeats of the same alert into one line"""
+
+    def __init__(self, maxlen=500, coalesce_window=10.0):
+        self.entries = deque()
+        self.maxlen = maxlen
+        self.coalesce_window = coalesce_window
+        self.latest_by_key = {}
+        self.next_seq = 0
+
+    def add(self, message, key=None, now=None):
+        """Record an alert; returns (entry, is_new, trimmed) where trimmed counts lines dropped from the top"""
+        now = time.monotonic() if now is None else now
+        key = key if key is not None else alert_key(message)
+
+        entry = self.latest_by_key.get(key)
+        if entry is not None and now - entry.first <= self.coalesce_window and entry.seq >= self.first_seq():
+            entry.message = message
+            entry.last = now
+            entry.count += 1
+            return entry, False, 0
+
+        entry = AlertLogEntry(self.next_seq, key, message, now)
+        self.next_seq += 1
+        self.entries.append(entry)
+        self.latest_by_key[key] = entry
+
+        trimmed = 0
+        while len(self.entries) > self.maxlen:
+            dropped = self.entries.popleft()
+            if self.latest_by_key.get(dropped.key) is dropped:
+                del self.latest_by_key[dropped.key]
+            trimmed += 1
+        return entry, True, trimmed
+
+    def first_seq(self):
+        return self.entries[0].seq if self.entries else self.next_seq
+
+    def line_number(self, entry):
+        """1-based line of an entry in a widget that mirrors the log"""
+        return entry.seq - self.first_seq() + 1
+
+    def lines(self):
+        return [entry.text() for entry in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
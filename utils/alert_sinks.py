@@ -0,0 +1,187 @@
+import json
+import os
+import queue
+import re
+import socket
+import threading
+import time
+import urllib.request
+from datetime import datetime
+
+# Syslog severities (RFC 5424) for the alert levels used in the log
+SYSLOG_SEVERITY = {'CRITICAL': 2, 'WARNING': 4, 'ANOMALY': 4, 'RESOLVED': 5, 'INFO': 6}
+SYSLOG_FACILITY_USER = 1
+
+# "[12:00:01] WARNING: ..." -> WARNING
+SEVERITY_PATTERN = re.compile(r"^(?:\[[^\]]*\]\s*)?([A-Z]+):")
+
+
+def alert_record(message, **details):
+    """Structured form of a logged alert for the sinks"""
+    match = SEVERITY_PATTERN.match(message)
+    record = {
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'severity': match.group(1) if match else "INFO",
+        'message': message
+    }
+    record.update(details)
+    return record
+
+
+class AlertSink:
+    """Delivers alert records from a bounded queue in batches on its own thread"""
+
+    def __init__(self, name, max_queue=1000, batch_size=50, flush_interval=1.0):
+        self.name = name
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.dropped = 0  # Refused because the queue was full
+        self.failed = 0   # Lost because a write raised
+        self.last_error = None
+        self.closing = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"alert-sink-{name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, record):
+        """Queue a record without ever blocking the caller; returns False if it was dropped"""
+        try:
+            self.queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def write_batch(self, records):
+        """Deliver a batch of records; implemented by each sink"""
+        raise NotImplementedError
+
+    def _run(self):
+        while not (self.closing.is_set() and self.queue.empty()):
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            try:
+                self.write_batch(batch)
+                self.sent += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                self.last_error = str(e)
+                print(f"Error delivering alerts to {self.name}: {e}")
+
+    def close(self, timeout=2.0):
+        """Flush what is queued (within the timeout) and stop the worker"""
+        self.closing.set()
+        self.thread.join(timeout)
+        self.release()
+
+    def release(self):
+        """Free sink resources after the worker has stopped"""
+
+    def stats(self):
+        return {
+            'sink': self.name,
+            'queued': self.queue.qsize(),
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'last_error': self.last_error
+        }
+
+
+class JsonlFileSink(AlertSink):
+    """Appends alerts as JSON lines, rotating the file when it grows past max_bytes"""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3, **kwargs):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__(f"jsonl:{path}", **kwargs)
+
+    def rotate(self):
+        """alerts.jsonl -> alerts.jsonl.1 -> ... -> alerts.jsonl.<backups>"""
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write_batch(self, records):
+        data = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+            self.rotate()
+        with open(self.path, "a") as f:
+            f.write(data)
+
+
+class SyslogSink(AlertSink):
+    """Sends alerts to the local syslog socket (or a host, port pair over UDP)"""
+
+    def __init__(self, address="/dev/log", ident="process-monitor", **kwargs):
+        self.address = address
+        self.ident = ident
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            address = tuple(address)
+        self.sock.connect(address)
+        super().__init__(f"syslog:{self.address}", **kwargs)
+
+    def write_batch(self, records):
+        # Syslog has no batch format; the batch just amortises the wake-ups
+        for record in records:
+            priority = SYSLOG_FACILITY_USER * 8 + SYSLOG_SEVERITY.get(record.get('severity'), 6)
+            self.sock.send(f"<{priority}>{self.ident}: {record['message']}".encode("utf-8", "replace"))
+
+    def release(self):
+        self.sock.close()
+
+
+class WebhookSink(AlertSink):
+    """POSTs batches of alerts as a JSON array to a URL"""
+
+    def __init__(self, url, timeout=5.0, headers=None, **kwargs):
+        self.url = url
+        self.timeout = timeout
+        self.headers = {'Content-Type': "application/json", **(headers or {})}
+        super().__init__(f"webhook:{url}", **kwargs)
+
+    def write_batch(self, records):
+        body = json.dumps(records, default=str).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+SINK_TYPES = {
+    'jsonl': JsonlFileSink,
+    'syslog': SyslogSink,
+    'webhook': WebhookSink,
+}
+
+
+def create_alert_sinks(specs):
+    """Build sinks from config entries such as {'type': 'webhook', 'url': '...'}; bad entries are skipped"""
+    sinks = []
+    for spec in specs:
+        options = dict(spec)
+        kind = options.pop('type', None)
+        try:
+            sinks.append(SINK_TYPES[kind](**options))
+        except Exception as e:
+            print(f"Error creating {kind} alert sink: {e}")
+    return sinks
@@ -0,0 +1,275 @@
+import re
+import time
+
+import numpy as np
+
+# "cpu > 90 for 30s clear 80 cooldown 5m", "avg(cpu) over 5m > 80" or "process chrome rss_mb > 2048 for 1m"
+RULE_PATTERN = re.compile(
+    r"^\s*(?:process\s+(?P<process>\S+)\s+)?"
+    r"(?:(?P<aggregate>avg|min|max)\((?P<windowed>\w+)\)\s+over\s+(?P<window>[\d.]+[smh]?)|(?P<metric>\w+))"
+    r"\s*(?P<op>[<>])\s*(?P<threshold>[-\d.]+)"
+    r"(?:\s+for\s+(?P<duration>[\d.]+[smh]?))?"
+    r"(?:\s+clear\s+(?P<clear>[-\d.]+))?"
+    r"(?:\s+cooldown\s+(?P<cooldown>[\d.]+[smh]?))?"
+    r"(?:\s+(?P<severity>info|warning|critical))?\s*$",
+    re.IGNORECASE
+)
+
+# Display names used in alert messages
+METRIC_LABELS = {'cpu': "CPU usage", 'memory': "Memory usage", 'disk': "Disk usage", 'rss_mb': "memory (MB)",
+                 'disk_util': "Disk I/O utilisation", 'disk_await': "Disk await (ms)", 'disk_iops': "Disk IOPS",
+                 'net_rx_mbps': "Network receive (MB/s)", 'net_tx_mbps': "Network send (MB/s)",
+                 'net_errors': "Network errors/s", 'net_drops': "Network drops/s"}
+METRIC_UNITS = {'cpu': "%", 'memory': "%", 'disk': "%", 'disk_util': "%", 'disk_await': " ms", 'disk_iops': " IOPS",
+                'net_rx_mbps': " MB/s", 'net_tx_mbps': " MB/s", 'net_errors': "/s", 'net_drops': "/s"}
+
+# Per-process metrics and how they are read from a process snapshot entry
+PROCESS_METRICS = {
+    'cpu': lambda info: info.get('cpu_percent') or 0.0,
+    'rss_mb': lambda info: info['memory_info'].rss / (1024 * 1024) if info.get('memory_info') else 0.0,
+    'threads': lambda info: info.get('num_threads') or 0,
+}
+
+
+def parse_duration(text):
+    """Seconds from '30', '30s', '5m' or '1h'"""
+    if not text:
+        return 0.0
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    if text[-1].lower() in units:
+        return float(text[:-1]) * units[text[-1].lower()]
+    return float(text)
+
+
+class AlertRule:
+    """A threshold with hysteresis, a duration window and a cooldown"""
+
+    def __init__(self, name, metric, op, threshold, clear=None, duration=0.0, cooldown=60.0,
+                 severity="WARNING", process=None, aggregate=None, window=0.0):
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.threshold = float(threshold)
+        self.clear = float(clear) if clear is not None else self.threshold  # Level the value must cross back over
+        self.duration = float(duration)  # Seconds the condition must hold before firing
+        self.cooldown = float(cooldown)  # Minimum seconds between two firings
+        self.severity = severity.upper()
+        self.process = process  # Process name, '*' for any process, None for a system metric
+        self.aggregate = aggregate  # "avg", "min" or "max" of the metric over the last `window` seconds
+        self.window = float(window)
+        # Where the rule's value comes from: the metric itself, or its aggregate over the window
+        self.source = f"{aggregate}({metric}) over {self.window:g}s" if aggregate else metric
+
+    @classmethod
+    def parse(cls, text, name=None):
+        """Build a rule from its text form"""
+        match = RULE_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Cannot parse alert rule: {text!r}")
+        fields = match.groupdict()
+        if fields['aggregate'] and fields['process']:
+            raise ValueError(f"Windowed alert rules apply to system metrics only: {text!r}")
+        return cls(name or text.strip(),
+                   (fields['metric'] or fields['windowed']).lower(),
+                   fields['op'],
+                   fields['threshold'],
+                   clear=fields['clear'],
+                   duration=parse_duration(fields['duration']),
+                   cooldown=parse_duration(fields['cooldown']) if fields['cooldown'] else 60.0,
+                   severity=fields['severity'] or "WARNING",
+                   process=fields['process'],
+                   aggregate=fields['aggregate'],
+                   window=parse_duration(fields['window']))
+
+    def describe(self):
+        text = f"{self.source} {self.op} {self.threshold:g}"
+        if self.process:
+            text = f"process {self.process} {text}"
+        if self.duration:
+            text += f" for {self.duration:g}s"
+        return text
+
+
+class AlertEngine:
+    """Evaluates all alert rules at once per tick with NumPy arrays of rule state"""
+
+    def __init__(self, rules=()):
+        self.rules = []
+        self.process_state = {}  # (rule index, pid) -> [pending_since, active, last_fired]
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, rule):
+        """Add a rule (an AlertRule or its text form) and recompile the rule arrays"""
+        if isinstance(rule, str):
+            rule = AlertRule.parse(rule)
+        self.rules.append(rule)
+        self._compile()
+        return rule
+
+    def remove_rule(self, name):
+        """Drop a rule by name"""
+        self.rules = [rule for rule in self.rules if rule.name != name]
+        self.process_state.clear()
+        self._compile()
+
+    def set_threshold(self, name, threshold):
+        """Move a rule's threshold, keeping the same hysteresis gap"""
+        for rule in self.rules:
+            if rule.name == name:
+                gap = rule.threshold - rule.clear
+                rule.threshold = float(threshold)
+                rule.clear = rule.threshold - gap
+        self.thresholds = np.array([rule.threshold for rule in self.compiled_rules])
+        self.clears = np.array([rule.clear for rule in self.compiled_rules])
+
+    def _compile(self):
+        """Turn the rule list into arrays, carrying over the state of existing rules"""
+        old = {rule.name: i for i, rule in enumerate(getattr(self, 'compiled_rules', []))}
+        system = [rule for rule in self.rules if rule.process is None]
+        self.compiled_rules = system
+        self.process_rules = [rule for rule in self.rules if rule.process is not None]
+
+        self.metric_names = sorted({rule.source for rule in system})
+        self.metric_index = np.array([self.metric_names.index(rule.source) for rule in system], dtype=np.intp)
+        self.windowed = {rule.source: rule for rule in system if rule.aggregate}
+        self.signs = np.array([1.0 if rule.op == '>' else -1.0 for rule in system])
+        self.thresholds = np.array([rule.threshold for rule in system])
+        self.clears = np.array([rule.clear for rule in system])
+        self.durations = np.array([rule.duration for rule in system])
+        self.cooldowns = np.array([rule.cooldown for rule in system])
+
+        pending, active, fired = np.full(len(system), np.nan), np.zeros(len(system), dtype=bool), np.full(len(system), -np.inf)
+        for i, rule in enumerate(system):
+            if rule.name in old:
+                j = old[rule.name]
+                pending[i], active[i], fired[i] = self.pending_since[j], self.active[j], self.last_fired[j]
+        self.pending_since, self.active, self.last_fired = pending, active, fired
+
+    def _step(self, values, pending_since, active, last_fired, signs, thresholds, clears, durations, cooldowns, now):
+        """Advance rule state one tick; returns (fired, cleared) masks and updates the state arrays in place"""
+        signed = signs * values
+        breach = signed > signs * thresholds           # NaN (missing metric) never breaches...
+        recovered = signed < signs * clears            # ...and never clears
+        pending_since[breach & np.isnan(pending_since)] = now
+        pending_since[~breach] = np.nan
+        fired = ~active & breach & (now - pending_since >= durations) & (now - last_fired >= cooldowns)
+        cleared = active & recovered
+        active |= fired
+        active &= ~cleared
+        last_fired[fired] = now
+        return fired, cleared
+
+    def evaluate(self, metrics, now=None, history=None):
+        """Evaluate the system rules against the latest metric values; returns fired/cleared events.
+
+        history is a RangeIndex of recent samples, needed by windowed rules ("avg(cpu) over 5m > 80").
+        """
+        if not self.compiled_rules:
+            return []
+        now = time.monotonic() if now is None else now
+        if self.windowed:
+            metrics = dict(metrics)
+            for source, rule in self.windowed.items():
+                metrics[source] = window_value(history, rule)
+        latest = np.array([metrics.get(name, np.nan) for name in self.metric_names], dtype=float)
+        values = latest[self.metric_index]
+        fired, cleared = self._step(values, self.pending_since, self.active, self.last_fired, self.signs,
+                                    self.thresholds, self.clears, self.durations, self.cooldowns, now)
+
+        events = []
+        for i in np.flatnonzero(fired | cleared):
+            events.append({
+                'rule': self.compiled_rules[i],
+                'state': 'fired' if fired[i] else 'cleared',
+                'value': float(values[i]),
+                'process': None
+            })
+        return events
+
+    def evaluate_processes(self, snapshot, now=None):
+        """Evaluate the per-process rules against a process snapshot"""
+        if not self.process_rules or not snapshot:
+            return []
+        now = time.monotonic() if now is None else now
+        pids = np.array([info['pid'] for info in snapshot], dtype=np.int64)
+        names = np.array([info.get('name') or "" for info in snapshot], dtype=object)
+        columns = {}
+
+        events = []
+        live = set()
+        for r, rule in enumerate(self.process_rules):
+            if rule.metric not in PROCESS_METRICS:
+                continue
+            if rule.metric not in columns:
+                read = PROCESS_METRICS[rule.metric]
+                columns[rule.metric] = np.array([read(info) for info in snapshot], dtype=float)
+            values = columns[rule.metric]
+            mask = np.ones(len(pids), dtype=bool) if rule.process == '*' else names == rule.process
+
+            # Only breaching processes and ones with an active alert carry state
+            sign = 1.0 if rule.op == '>' else -1.0
+            candidates = np.flatnonzero(mask & (sign * values > sign * rule.threshold))
+            tracked = [i for i in np.flatnonzero(mask) if (r, int(pids[i])) in self.process_state]
+            rows = np.union1d(candidates, np.array(tracked, dtype=np.intp))
+            if len(rows) == 0:
+                continue
+
+            state = np.array([self.process_state.get((r, int(pids[i])), [np.nan, 0.0, -np.inf]) for i in rows], dtype=float)
+            pending_since, active, last_fired = state[:, 0].copy(), state[:, 1].astype(bool), state[:, 2].copy()
+            n = len(rows)
+            fired, cleared = self._step(values[rows], pending_since, active, last_fired,
+                                        np.full(n, sign), np.full(n, rule.threshold), np.full(n, rule.clear),
+                                        np.full(n, rule.duration), np.full(n, rule.cooldown), now)
+
+            for k, i in enumerate(rows):
+                key = (r, int(pids[i]))
+                if active[k] or not np.isnan(pending_since[k]) or now - last_fired[k] < rule.cooldown:
+                    self.process_state[key] = [pending_since[k], float(active[k]), last_fired[k]]
+                    live.add(key)
+                else:
+                    self.process_state.pop(key, None)
+                if fired[k] or cleared[k]:
+                    events.append({
+                        'rule': rule,
+                        'state': 'fired' if fired[k] else 'cleared',
+                        'value': float(values[i]),
+                        'process': {'pid': int(pids[i]), 'name': names[i]}
+                    })
+
+        # Forget processes that have exited
+        for key in [key for key in self.process_state if key not in live]:
+            del self.process_state[key]
+        return events
+
+    def active_alerts(self):
+        """Names of the system rules currently in the alerting state"""
+        return [rule.name for rule, active in zip(self.compiled_rules, self.active) if active]
+
+
+def window_value(history, rule):
+    """A windowed rule's aggregate over the newest `window` seconds of history, NaN without readings"""
+    if history is None or rule.metric not in history.columns or not len(history):
+        return np.nan
+    stats = history.query(rule.metric, history.latest_time - rule.window)
+    return {'avg': stats.mean, 'min': stats.min, 'max': stats.max}[rule.aggregate]
+
+
+def default_alert_rules(thresholds, duration=10, hysteresis=10, cooldown=60):
+    """Rules equivalent to the classic cpu/memory/disk thresholds"""
+    return [AlertRule(metric, metric, '>', value, clear=value - hysteresis, duration=duration, cooldown=cooldown)
+            for metric, value in thresholds.items()]
+
+
+def format_alert_event(event, timestamp):
+    """One alert log line for an engine event"""
+    rule = event['rule']
+    label = METRIC_LABELS.get(rule.metric, rule.metric)
+    if rule.aggregate:
+        label = f"{label} ({rule.aggregate} over {rule.window:g}s)"
+    subject = f"{event['process']['name']} (PID {event['process']['pid']}) {label}" if event['process'] else label
+    if event['state'] == 'fired':
+        crossed = "exceeded" if rule.op == '>' else "fell below"
+        held = f" for {rule.duration:g}s" if rule.duration else ""
+        return f"[{timestamp}] {rule.severity}: {subject} at {event['value']:.1f} {crossed} {rule.threshold:g}{held}"
+    return f"[{timestamp}] RESOLVED: {subject} back to {event['value']:.1f} (clear level {rule.clear:g})"
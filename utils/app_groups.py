@@ -0,0 +1,170 @@
+import math
+import posixpath
+
+# Values summed per application: CPU %, RSS bytes, read and write bytes/s
+GROUP_FIELDS = ("cpu", "rss", "read", "write")
+GROUP_MODES = ("exe", "tree")
+
+# Group-by choices offered in the UI and the mode each one selects (None lists processes individually)
+GROUP_BY_CHOICES = {"Process": None, "Executable": "exe", "Process tree": "tree"}
+
+
+def app_identity(info):
+    """What makes two processes the same application: the executable, or the name when it can't be read"""
+    return info.get('exe') or f"[{info.get('name') or 'unknown'}]"
+
+
+def app_label(identity):
+    return posixpath.basename(identity) if identity.startswith("/") else identity
+
+
+class ApplicationGroups:
+    """Processes rolled up into applications, maintained incrementally from successive snapshots.
+
+    mode "exe" groups every process running the same executable; mode "tree" groups a
+    process with its descendants running the same executable, so separate instances
+    (two gunicorn masters, say) stay apart. Group membership is worked out once per
+    process and totals are adjusted by each member's change, so a snapshot costs one
+    pass with no regrouping.
+    """
+
+    def __init__(self, mode="exe"):
+        if mode not in GROUP_MODES:
+            raise ValueError(f"Unknown grouping mode: {mode}")
+        self.mode = mode
+        self.members = {}   # (pid, create_time) -> [group id, values, is_root]
+        self.groups = {}    # group id -> {'label', 'identity', 'totals', 'members', 'roots'}
+        self.children = {}  # parent pid -> keys of its children, for re-homing orphans
+        self.regrouped = 0  # Processes whose group had to be (re)computed
+
+    def set_mode(self, mode):
+        """Switch grouping mode; the next update regroups everything"""
+        if mode not in GROUP_MODES:
+            raise ValueError(f"Unknown grouping mode: {mode}")
+        if mode != self.mode:
+            self.mode = mode
+            self.members, self.groups, self.children = {}, {}, {}
+
+    def _values(self, info, io_rate):
+        memory = info.get('memory_info')
+        values = (info.get('cpu_percent') or 0.0, memory.rss if memory else 0.0)
+        if io_rate is None:
+            return values + (0.0, 0.0)
+        rates = io_rate(info['pid'])
+        if rates is None or math.isnan(rates[0]):
+            return values + (0.0, 0.0)
+        return values + (float(rates[0]), float(rates[1]))
+
+    def _place(self, info, by_pid):
+        """Group id of a process and whether it heads its part of the group"""
+        identity = app_identity(info)
+        parent = by_pid.get(info.get('ppid'))
+        is_root = parent is None or parent['pid'] == info['pid'] or app_identity(parent) != identity
+        if self.mode == "exe":
+            return identity, identity, is_root
+        # Walk up while the parent runs the same executable; the topmost one names the group
+        root, seen = info, {info['pid']}
+        while True:
+            parent = by_pid.get(root.get('ppid'))
+            if parent is None or parent['pid'] in seen or app_identity(parent) != identity:
+                break
+            seen.add(parent['pid'])
+            root = parent
+        return (root['pid'], root.get('create_time')), identity, is_root
+
+    def _add(self, key, gid, identity, values, is_root):
+        group = self.groups.get(gid)
+        if group is None:
+            label = app_label(identity)
+            if self.mode == "tree":
+                label = f"{label} ({gid[0]})"
+            group = self.groups[gid] = {'label': label, 'identity': identity, 'totals': [0.0] * len(GROUP_FIELDS),
+                                        'members': set(), 'roots': 0}
+        group['totals'] = [total + value for total, value in zip(group['totals'], values)]
+        group['members'].add(key)
+        group['roots'] += is_root
+        self.members[key] = [gid, values, is_root]
+
+    def _remove(self, key):
+        gid, values, is_root = self.members.pop(key)
+        group = self.groups[gid]
+        group['members'].discard(key)
+        if not group['members']:
+            del self.groups[gid]  # Drop rather than keep an empty group with rounding residue
+            return
+        group['totals'] = [total - value for total, value in zip(group['totals'], values)]
+        group['roots'] -= is_root
+
+    def update(self, snapshot, io_rate=None):
+        """Apply a new snapshot. io_rate, if given, maps a pid to its (read, write, ...) bytes/s."""
+        by_pid, seen, new = {}, set(), []
+        members, groups = self.members, self.groups
+        for info in snapshot:
+            key = (info['pid'], info.get('create_time'))
+            by_pid[key[0]] = info
+            seen.add(key)
+            values = self._values(info, io_rate)
+            member = members.get(key)
+            if member is None:
+                new.append(key)
+            elif values != member[1]:
+                # Known process: only its change moves the group totals
+                totals, old = groups[member[0]]['totals'], member[1]
+                totals[0] += values[0] - old[0]
+                totals[1] += values[1] - old[1]
+                totals[2] += values[2] - old[2]
+                totals[3] += values[3] - old[3]
+                member[1] = values
+
+        # Exited processes leave their groups; their children may now head a group of their own,
+        # and in tree mode so may the same-executable subtree below each of them
+        regroup = set()
+        for key in members.keys() - seen:
+            gid = members[key][0]
+            identity = groups[gid]['identity']
+            self._remove(key)
+            orphans = list(self.children.pop(key[0], ()))
+            while orphans:
+                child = orphans.pop()
+                if child in regroup:
+                    continue
+                regroup.add(child)
+                member = members.get(child)
+                if self.mode == "tree" and member is not None and groups[member[0]]['identity'] == identity:
+                    orphans.extend(self.children.get(child[0], ()))
+            if self.mode == "tree" and gid == key and gid in groups:
+                # The process that named this group is gone: re-home everyone under it
+                regroup.update(groups[gid]['members'])
+        for key in regroup:
+            if key in members:
+                self._remove(key)
+                new.append(key)
+
+        for key in new:
+            info = by_pid[key[0]]
+            gid, identity, is_root = self._place(info, by_pid)
+            self._add(key, gid, identity, self._values(info, io_rate), is_root)
+            self.children.setdefault(info.get('ppid'), set()).add(key)
+            self.regrouped += 1
+
+        # Children lists of pids that are no longer parents of anything current
+        for pid in [pid for pid in self.children if pid not in by_pid]:
+            del self.children[pid]
+        return groups
+
+    def top(self, n=30, field="cpu"):
+        """The n largest applications by one of GROUP_FIELDS, as flat dicts"""
+        index = GROUP_FIELDS.index(field)
+        ranked = sorted(self.groups.items(), key=lambda item: -item[1]['totals'][index])[:n]
+        return [dict(zip(GROUP_FIELDS, (max(total, 0.0) for total in group['totals'])), id=gid, label=group['label'],
+                     identity=group['identity'], processes=len(group['members']),
+                     children=len(group['members']) - group['roots'])
+                for gid, group in ranked]
+
+    def stats(self):
+        return {
+            'mode': self.mode,
+            'applications': len(self.groups),
+            'processes': len(self.members),
+            'regrouped': self.regrouped
+        }
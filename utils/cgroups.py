@@ -0,0 +1,129 @@
+import posixpath
+import re
+import time
+
+# Files read from each cgroup directory
+CGROUP_STAT_FILES = ("cpu.stat", "memory.current", "io.stat", "memory.pressure")
+
+# Unit names that are just a container or pod id, shortened for display
+CGROUP_LABEL_PATTERNS = [
+    (re.compile(r"^docker-([0-9a-f]{12})[0-9a-f]*\.scope$"), "docker {}"),
+    (re.compile(r"^cri-containerd-([0-9a-f]{12})[0-9a-f]*\.scope$"), "container {}"),
+    (re.compile(r"^crio-([0-9a-f]{12})[0-9a-f]*\.scope$"), "container {}"),
+    (re.compile(r"^kubepods-(?:besteffort-|burstable-)?pod([0-9a-f_]{8})[0-9a-f_]*\.slice$"), "pod {}"),
+]
+
+
+def parse_proc_cgroup(text):
+    """The cgroup v2 path from /proc/<pid>/cgroup ("0::/system.slice/nginx.service"), or None on v1-only hosts"""
+    for line in text.splitlines():
+        if line.startswith("0::"):
+            return line[3:].strip() or "/"
+    return None
+
+
+def cgroup_label(path):
+    """Short display name for a cgroup path"""
+    name = posixpath.basename(path) or "/"
+    for pattern, label in CGROUP_LABEL_PATTERNS:
+        match = pattern.match(name)
+        if match:
+            return label.format(match.group(1))
+    return name
+
+
+def parse_cgroup_stats(files):
+    """Cumulative CPU usec, memory bytes, I/O bytes and memory pressure from the raw cgroup files"""
+    stats = {'usage_usec': None, 'memory': None, 'rbytes': 0, 'wbytes': 0, 'pressure': None}
+    for line in (files.get("cpu.stat") or "").splitlines():
+        key, _, value = line.partition(" ")
+        if key == "usage_usec":
+            stats['usage_usec'] = int(value)
+    memory = (files.get("memory.current") or "").strip()
+    stats['memory'] = int(memory) if memory.isdigit() else None
+    for line in (files.get("io.stat") or "").splitlines():
+        for field in line.split()[1:]:
+            key, _, value = field.partition("=")
+            if key in ("rbytes", "wbytes"):
+                stats[key] += int(value)
+    for line in (files.get("memory.pressure") or "").splitlines():
+        if line.startswith("some "):
+            stats['pressure'] = float(dict(f.split("=") for f in line.split()[1:])['avg10'])
+    return stats
+
+
+class CgroupCollector:
+    """Per-cgroup CPU, memory, I/O and memory pressure read straight from the cgroup v2 filesystem"""
+
+    def __init__(self, data_source):
+        self.data_source = data_source
+        self.paths = {}     # (pid, create_time) -> cgroup path, read once per process
+        self.previous = {}  # cgroup path -> (stats, time) for rates
+        self.groups = {}    # cgroup path -> latest summary, including ancestors of occupied cgroups
+        self.available = None
+
+    def collect(self, snapshot, now=None):
+        """Map the snapshot's processes to cgroups and refresh every cgroup on the way to the root"""
+        now = time.monotonic() if now is None else now
+        members = {}
+        seen = set()
+        for info in snapshot:
+            key = (info['pid'], info.get('create_time'))
+            seen.add(key)
+            if key not in self.paths:
+                text = self.data_source.process_cgroup(info['pid'])
+                self.paths[key] = parse_proc_cgroup(text) if text else None  # None: unreadable or cgroup v1
+            path = self.paths[key]
+            if path is not None:
+                members[path] = members.get(path, 0) + 1
+        # Forget exited processes
+        for key in self.paths.keys() - seen:
+            del self.paths[key]
+
+        self.available = bool(members)
+        totals = {}
+        for path, count in members.items():
+            node = path
+            while True:
+                totals[node] = totals.get(node, 0) + count
+                if node == "/":
+                    break
+                node = posixpath.dirname(node)
+
+        groups, previous = {}, {}
+        for path, processes in totals.items():
+            files = self.data_source.cgroup_stats(path)
+            if files is None:
+                continue
+            stats = parse_cgroup_stats(files)
+            before = self.previous.get(path)
+            summary = {
+                'path': path,
+                'label': cgroup_label(path),
+                'parent': posixpath.dirname(path) if path != "/" else None,
+                'own_processes': members.get(path, 0),
+                'processes': processes,
+                'cpu_percent': None,
+                'memory': stats['memory'],
+                'read_bytes_per_sec': None,
+                'write_bytes_per_sec': None,
+                'memory_pressure': stats['pressure']
+            }
+            if before is not None and now > before[1]:
+                old, elapsed = before[0], now - before[1]
+                if stats['usage_usec'] is not None and old['usage_usec'] is not None:
+                    # Percent of one CPU, like the per-process figures
+                    summary['cpu_percent'] = max(stats['usage_usec'] - old['usage_usec'], 0) / (elapsed * 1e4)
+                summary['read_bytes_per_sec'] = max(stats['rbytes'] - old['rbytes'], 0) / elapsed
+                summary['write_bytes_per_sec'] = max(stats['wbytes'] - old['wbytes'], 0) / elapsed
+            groups[path] = summary
+            previous[path] = (stats, now)
+        self.groups, self.previous = groups, previous
+        return groups
+
+    def stats(self):
+        return {
+            'cgroups': len(self.groups),
+            'cached_processes': len(self.paths),
+            'available': self.available
+        }
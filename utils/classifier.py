@@ -0,0 +1,176 @@
+import re
+from collections import namedtuple
+
+from utils.cgroups import parse_proc_cgroup
+
+Classification = namedtuple("Classification", ["category", "importance", "relations"])
+
+# Built-in rules, checked in order after any site rules; the first rule whose patterns all
+# match wins. Patterns are regexes searched in the process name, exe path, parent pid,
+# command line, cgroup path or user. Names may carry a Windows ".exe" suffix. Rules that need only the
+# name or exe come first, so the command line and cgroup are read for few processes.
+CLASSIFIER_RULES = [
+    # Kernel and init
+    {"name": r"^(kthreadd|kworker|ksoftirqd|kswapd\d*|migration|rcu_\w+|jbd2|irq/|watchdog|cpuhp|khugepaged|kcompactd)",
+     "exe": r"^$", "category": "Kernel Thread", "importance": "Critical", "relations": "Kernel"},
+    {"ppid": r"^2$", "exe": r"^$", "category": "Kernel Thread", "importance": "Critical", "relations": "Kernel"},
+    {"name": r"^systemd$", "cgroup": r"^/user\.slice/", "category": "Session", "importance": "High",
+     "relations": "User Sessions"},
+    {"name": r"^(systemd|init)$", "category": "System Init", "importance": "Critical", "relations": "All services"},
+    {"name": r"^(System|Registry|smss|csrss|wininit|lsass)(\.exe)?$", "category": "System Core",
+     "importance": "Critical", "relations": "Drivers, User Sessions"},
+    {"name": r"^(services|svchost|winlogon)(\.exe)?$", "category": "System Service", "importance": "High",
+     "relations": "System Services, Drivers, User Sessions"},
+    {"exe": r"/systemd/systemd-[\w-]+$|/(dbus-daemon|dbus-broker|udevd|polkitd|rsyslogd|chronyd|ntpd|cron|crond|atd)$",
+     "category": "System Service", "importance": "High", "relations": "System Services"},
+    {"name": r"^(rsyslogd|cron|crond|dbus-daemon|systemd-\w+|udevd|polkitd|chronyd|irqbalance)$",
+     "category": "System Service", "importance": "High", "relations": "System Services"},
+    {"name": r"^(sshd|sudo|login|agetty|gdm|lightdm|sddm)$", "category": "Session", "importance": "High",
+     "relations": "User Sessions, Network"},
+
+    # Containers and orchestration
+    {"name": r"^(dockerd|containerd|containerd-shim[\w-]*|runc|crio|conmon|podman|kubelet|kube-proxy)$",
+     "category": "Container Runtime", "importance": "High", "relations": "Containers, Network"},
+    {"cgroup": r"/(docker|cri-containerd|crio|libpod)-[0-9a-f]{12}", "category": "Container",
+     "importance": "Normal", "relations": "Container Runtime"},
+
+    # Servers
+    {"name": r"^(postgres|postmaster|mysqld|mariadbd|mongod|redis-server|memcached|sqlservr)(\.exe)?$",
+     "category": "Database", "importance": "High", "relations": "Clients, Storage"},
+    {"name": r"^(nginx|httpd|apache2?|haproxy|envoy|caddy|traefik)(\.exe)?$", "category": "Web Server",
+     "importance": "High", "relations": "Network Services, Application Servers"},
+    {"cmdline": r"\b(gunicorn|uwsgi|uvicorn|celery|php-fpm|puma|unicorn)\b", "category": "Application Server",
+     "importance": "Normal", "relations": "Web Server, Database"},
+    {"name": r"^(gunicorn|uwsgi|celery|php-fpm[\d.]*)$", "category": "Application Server", "importance": "Normal",
+     "relations": "Web Server, Database"},
+    {"name": r"^(prometheus|node_exporter|grafana-server|telegraf|collectd|fluent-bit|filebeat)$",
+     "category": "Monitoring", "importance": "Normal", "relations": "Network Services"},
+    {"name": r"^(MsMpEng|avguard|avp|avgui|clamd|freshclam|auditd)(\.exe)?$", "category": "Security",
+     "importance": "High", "relations": "File System"},
+
+    # Desktop applications
+    {"name": r"^(chrome|chromium|firefox|msedge|safari|opera|brave)(\.exe)?$", "category": "Web Browser",
+     "importance": "Normal", "relations": "Network Services, Media Plugins, Extensions"},
+    {"exe": r"/(google-chrome|chromium|firefox|opera|brave)", "category": "Web Browser", "importance": "Normal",
+     "relations": "Network Services, Media Plugins, Extensions"},
+    {"name": r"^(outlook|thunderbird|evolution)(\.exe)?$", "category": "Email Client", "importance": "Normal",
+     "relations": "Network Services"},
+    {"name": r"^(word|winword|excel|powerpnt|onenote|soffice\.bin|libreoffice)(\.exe)?$", "category": "Office Suite",
+     "importance": "Normal", "relations": "Document Services, Cloud Sync, Printing"},
+    {"name": r"^(code|devenv|studio64|idea64|pycharm64|atom|sublime_text|eclipse|nvim|vim|emacs)(\.exe)?$",
+     "category": "Development", "importance": "Normal", "relations": "Runtime Environments, Source Control, Build Tools"},
+    {"name": r"^(photoshop|illustrator|premiere|afterfx|gimp|inkscape|blender|krita)(\.exe)?$", "category": "Creative",
+     "importance": "Normal", "relations": "Media Libraries"},
+    {"name": r"^(spotify|vlc|itunes|musicbee|wmplayer|mpv|pulseaudio|pipewire)(\.exe)?$", "category": "Media",
+     "importance": "Normal", "relations": "Audio Services, Media Libraries, Network"},
+    {"name": r"^(steam|EpicGamesLauncher|Battle\.net|GalaxyClient)(\.exe)?$", "category": "Gaming",
+     "importance": "Normal", "relations": "Network Services"},
+    {"name": r"^(OneDrive|Dropbox|GoogleDriveFS|dropbox|nextcloud|syncthing)(\.exe)?$", "category": "Cloud Sync",
+     "importance": "Normal", "relations": "Network Services, File System"},
+    {"name": r"^(slack|teams|discord|zoom|skype|signal-desktop)(\.exe)?$", "category": "Communication",
+     "importance": "Normal", "relations": "Network Services, Audio Services"},
+    {"name": r"^(Xorg|Xwayland|gnome-shell|kwin_\w+|plasmashell|explorer|dwm)(\.exe)?$", "category": "User Interface",
+     "importance": "High", "relations": "User Sessions"},
+
+    # Runtimes and shells, after the servers that run on them
+    {"name": r"^(python[\d.]*|java|javaw|node|ruby|perl|php|dotnet)(\.exe)?$", "category": "Runtime",
+     "importance": "Normal", "relations": "Runtime Environments"},
+    {"name": r"^(bash|zsh|fish|sh|dash|tmux|screen|conhost|cmd|powershell|pwsh)(\.exe)?$",
+     "category": "Command Line", "importance": "Normal", "relations": "User Sessions"},
+
+    # Whatever systemd runs as a service, and anything in a user session
+    {"cgroup": r"^/system\.slice/", "category": "System Service", "importance": "Normal",
+     "relations": "System Services"},
+    {"cgroup": r"^/user\.slice/", "category": "Application", "importance": "Normal", "relations": "User Sessions"},
+]
+
+CLASSIFIER_FIELDS = ("name", "exe", "ppid", "cmdline", "cgroup", "user")
+DEFAULT_CLASSIFICATION = Classification("Application", "Normal", "Standalone")
+
+
+class ProcessClassifier:
+    """Rule-based process categories, compiled once and cached per (pid, create_time).
+
+    Name, exe and parent pid come from the snapshot. The command line, cgroup and user are read from
+    the data source only when a rule still in the running needs them, and only once per
+    process, so classifying a process seen before is a dictionary lookup.
+    """
+
+    def __init__(self, data_source, rules=None):
+        self.data_source = data_source
+        self.rules = []
+        for rule in list(rules or []) + CLASSIFIER_RULES:
+            patterns = [(field, re.compile(rule[field])) for field in CLASSIFIER_FIELDS if field in rule]
+            self.rules.append((patterns, Classification(rule["category"], rule.get("importance", "Normal"),
+                                                        rule.get("relations", "Standalone"))))
+        self.cache = {}  # (pid, create_time) -> Classification
+        self.lookups = 0
+        self.misses = 0
+
+    def _field(self, field, info, fetched):
+        """Text of one field for a process, read at most once per classification"""
+        if field not in fetched:
+            pid = info.get('pid')
+            if field in ("name", "exe"):
+                value = info.get(field)
+            elif field == "ppid":
+                value = None if info.get('ppid') is None else str(info['ppid'])
+            elif pid is None:
+                value = None  # An application rather than one process: only name and exe apply
+            elif field == "cmdline":
+                value = self.data_source.process_cmdline(pid)
+            elif field == "cgroup":
+                text = self.data_source.process_cgroup(pid)
+                value = parse_proc_cgroup(text) if text else None
+            else:
+                value = self.data_source.process_user(pid)
+            fetched[field] = value
+        return fetched[field]
+
+    def classify(self, info, key=None):
+        """Classification of a snapshot entry; key defaults to its (pid, create_time)"""
+        key = key if key is not None else (info['pid'], info.get('create_time'))
+        self.lookups += 1
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        self.misses += 1
+        fetched = {}
+        result = DEFAULT_CLASSIFICATION
+        for patterns, classification in self.rules:
+            for field, pattern in patterns:
+                value = self._field(field, info, fetched)
+                # Kernel threads (and unreadable processes) have no exe: match that as ""
+                if value is None and field == "exe":
+                    value = ""
+                if value is None or not pattern.search(value):
+                    break
+            else:
+                result = classification
+                break
+        self.cache[key] = result
+        return result
+
+    def prune(self, snapshot):
+        """Forget processes that are no longer in the snapshot"""
+        live = {(info['pid'], info.get('create_time')) for info in snapshot}
+        for key in [key for key in self.cache if isinstance(key, tuple) and key not in live]:
+            del self.cache[key]
+
+    def stats(self):
+        return {
+            'rules': len(self.rules),
+            'cached': len(self.cache),
+            'hit_rate': round(1 - self.misses / self.lookups, 3) if self.lookups else None
+        }
+
+
+def usage_priority(classification, cpu, memory_mb):
+    """Priority column: the rule's importance for critical and high processes, else one from current usage"""
+    if classification.importance in ("Critical", "High"):
+        return classification.importance
+    if cpu > 20 or memory_mb > 500:
+        return "High Usage"
+    if cpu < 1 and memory_mb < 50:
+        return "Low"
+    return "Normal"
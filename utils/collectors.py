@@ -0,0 +1,185 @@
+import re
+import time
+
+import numpy as np
+
+# /proc/diskstats columns after "major minor name" that the disk collector reads
+DISKSTATS_FIELDS = ("reads", "reads_merged", "sectors_read", "ms_reading", "writes", "writes_merged",
+                    "sectors_written", "ms_writing", "in_flight", "ms_io", "ms_weighted")
+SECTOR_BYTES = 512
+
+# Virtual block devices that carry no physical I/O of their own
+VIRTUAL_DEVICE_PATTERN = re.compile(r"^(loop|ram|zram|fd|sr)\d+$")
+
+
+def counter_deltas(current, previous, wrap=2 ** 32):
+    """Increase of monotonic counters that wrap at `wrap`, allowing for wraparound and counter resets"""
+    delta = current - previous
+    # A drop is a wrap only from the top half of the range to the bottom half;
+    # anything else (10 after 1000, say) is a reset, and the delta is the new value
+    half = wrap // 2
+    wrapped = (delta < 0) & (previous >= half) & (previous < wrap) & (current < half)
+    delta = np.where(wrapped, delta + wrap, delta)
+    return np.where(delta < 0, current, delta)
+
+
+def looks_like_partition(name, disks):
+    """Guess from the name alone: sda1 of sda and nvme0n1p2 of nvme0n1, but not dm-10 of dm-1 or md12 of md1"""
+    for disk in disks:
+        if name != disk and name.startswith(disk):
+            # After a name ending in a digit, a partition number needs the "p" separator
+            if re.fullmatch(r"p\d+" if disk[-1].isdigit() else r"\d+", name[len(disk):]):
+                return True
+    return False
+
+
+def parse_diskstats(text, include_partitions=False, is_partition=None):
+    """Device names and an (n, 11) array of counters from /proc/diskstats text.
+
+    is_partition(name) answers whether a device is a partition (True/False, or None when
+    unknown); without an answer the device name decides.
+    """
+    names, rows = [], []
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 3 + len(DISKSTATS_FIELDS) or VIRTUAL_DEVICE_PATTERN.match(fields[2]):
+            continue
+        names.append(fields[2])
+        rows.append([float(v) for v in fields[3:3 + len(DISKSTATS_FIELDS)]])
+
+    if not include_partitions:
+        # A partition's I/O is already counted in its whole disk
+        disks = set(names)
+        whole = []
+        for name in names:
+            partition = is_partition(name) if is_partition else None
+            whole.append(not (looks_like_partition(name, disks) if partition is None else partition))
+        names = [name for name, keep in zip(names, whole) if keep]
+        rows = [row for row, keep in zip(rows, whole) if keep]
+    return names, np.array(rows, dtype=float).reshape(len(rows), len(DISKSTATS_FIELDS))
+
+
+class DiskIOCollector:
+    """Per-device IOPS, throughput, average await and utilisation from /proc/diskstats deltas"""
+
+    def __init__(self, data_source, include_partitions=False):
+        self.data_source = data_source
+        self.include_partitions = include_partitions
+        self.previous = None  # ({device: row}, counters, time)
+        self.partitions = {}  # device -> is_partition answer, asked once per device
+        self.devices = {}     # Latest per-device rates
+        self.totals = None    # Latest system-wide summary
+
+    def is_partition(self, device):
+        if device not in self.partitions:
+            self.partitions[device] = self.data_source.is_partition(device)
+        return self.partitions[device]
+
+    def collect(self, now=None):
+        """Sample the counters; returns the system-wide summary, or None until two samples exist"""
+        text = self.data_source.diskstats()
+        if not text:
+            return None
+        now = time.monotonic() if now is None else now
+        names, counters = parse_diskstats(text, self.include_partitions, self.is_partition)
+        previous, self.previous = self.previous, ({name: i for i, name in enumerate(names)}, counters, now)
+        if previous is None:
+            return None
+
+        # Only devices present in both samples (hot-plugged ones start next time)
+        rows_before, counters_before, then = previous
+        elapsed = now - then
+        matched = [(i, rows_before[name]) for i, name in enumerate(names) if name in rows_before]
+        if elapsed <= 0 or not matched:
+            return None
+        current_rows, previous_rows = map(list, zip(*matched))
+        delta = counter_deltas(counters[current_rows], counters_before[previous_rows])
+
+        f = {name: delta[:, i] for i, name in enumerate(DISKSTATS_FIELDS)}
+        ios = f["reads"] + f["writes"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            await_ms = np.where(ios > 0, (f["ms_reading"] + f["ms_writing"]) / ios, 0.0)
+        rates = np.column_stack([
+            f["reads"] / elapsed,
+            f["writes"] / elapsed,
+            f["sectors_read"] * SECTOR_BYTES / elapsed,
+            f["sectors_written"] * SECTOR_BYTES / elapsed,
+            await_ms,
+            np.minimum(f["ms_io"] / (elapsed * 1000) * 100, 100.0)
+        ])
+        columns = ("read_iops", "write_iops", "read_bytes_per_sec", "write_bytes_per_sec", "await_ms", "util_percent")
+        self.devices = {names[i]: dict(zip(columns, map(float, row))) for i, row in zip(current_rows, rates)}
+
+        total_ios = ios.sum()
+        self.totals = {
+            'read_iops': float(rates[:, 0].sum()),
+            'write_iops': float(rates[:, 1].sum()),
+            'read_bytes_per_sec': float(rates[:, 2].sum()),
+            'write_bytes_per_sec': float(rates[:, 3].sum()),
+            'await_ms': float((await_ms * ios).sum() / total_ios) if total_ios else 0.0,
+            'util_percent': float(rates[:, 5].max()),  # The busiest device is the bottleneck
+            'busiest_device': names[current_rows[int(np.argmax(rates[:, 5]))]]
+        }
+        return self.totals
+
+
+# /proc/net/dev columns (after "iface:") that the network collector reads, and their positions
+NET_DEV_FIELDS = {"rx_bytes": 0, "rx_packets": 1, "rx_errors": 2, "rx_drops": 3,
+                  "tx_bytes": 8, "tx_packets": 9, "tx_errors": 10, "tx_drops": 11}
+NET_DEV_WRAP = 2 ** 64  # The kernel's interface counters are 64-bit, so in practice a drop is a reset
+
+
+def parse_net_dev(text, include_loopback=False):
+    """Interface names and an (n, 8) array of NET_DEV_FIELDS counters from /proc/net/dev text"""
+    names, rows = [], []
+    columns = list(NET_DEV_FIELDS.values())
+    for line in text.splitlines():
+        name, sep, values = line.partition(":")
+        if not sep or "|" in line:
+            continue  # The two header lines
+        name = name.strip()
+        fields = values.split()
+        if len(fields) < 16 or (name == "lo" and not include_loopback):
+            continue
+        names.append(name)
+        rows.append([float(fields[i]) for i in columns])
+    return names, np.array(rows, dtype=float).reshape(len(rows), len(columns))
+
+
+class NetworkCollector:
+    """Per-interface bytes, packets, errors and drops per second from /proc/net/dev deltas"""
+
+    def __init__(self, data_source, include_loopback=False):
+        self.data_source = data_source
+        self.include_loopback = include_loopback
+        self.previous = None  # ({interface: row}, counters, time)
+        self.interfaces = {}  # Latest per-interface rates
+        self.totals = None    # Latest sums across interfaces
+
+    def collect(self, now=None):
+        """Sample the counters; returns the summed rates, or None until two samples exist"""
+        text = self.data_source.net_dev()
+        if not text:
+            return None
+        now = time.monotonic() if now is None else now
+        names, counters = parse_net_dev(text, self.include_loopback)
+        previous, self.previous = self.previous, ({name: i for i, name in enumerate(names)}, counters, now)
+        if previous is None:
+            return None
+
+        # Interfaces that appeared since the last sample start reporting next time
+        rows_before, counters_before, then = previous
+        elapsed = now - then
+        matched = [(i, rows_before[name]) for i, name in enumerate(names) if name in rows_before]
+        if elapsed <= 0 or not matched:
+            return None
+        current_rows, previous_rows = map(list, zip(*matched))
+        rates = counter_deltas(counters[current_rows], counters_before[previous_rows], NET_DEV_WRAP) / elapsed
+
+        columns = [f"{field}_per_sec" for field in NET_DEV_FIELDS]
+        self.interfaces = {names[i]: dict(zip(columns, map(float, row))) for i, row in zip(current_rows, rates)}
+        sums = rates.sum(axis=0)
+        busiest = int(np.argmax(rates[:, 0] + rates[:, 4]))
+        self.totals = dict(zip(columns, map(float, sums)))
+        self.totals['busiest_interface'] = names[current_rows[busiest]]
+        return self.totals
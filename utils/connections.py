@@ -0,0 +1,114 @@
+import socket
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+Connection = namedtuple("Connection", "proto local_ip local_port remote_ip remote_port state inode pid")
+
+# /proc/net/tcp* "st" column; UDP sockets have no connection state
+TCP_STATES = {
+    "01": "ESTABLISHED", "02": "SYN_SENT", "03": "SYN_RECV", "04": "FIN_WAIT1", "05": "FIN_WAIT2",
+    "06": "TIME_WAIT", "07": "CLOSE", "08": "CLOSE_WAIT", "09": "LAST_ACK", "0A": "LISTEN", "0B": "CLOSING"
+}
+SOCKET_TABLES = ("tcp", "tcp6", "udp", "udp6")
+
+
+@lru_cache(maxsize=16384)
+def decode_address(text):
+    """'0100007F:1538' -> ('127.0.0.1', 5432); addresses are 32-bit words in host (little-endian) order"""
+    address, _, port = text.partition(":")
+    raw = bytes.fromhex(address)
+    raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4))
+    family = socket.AF_INET if len(raw) == 4 else socket.AF_INET6
+    ip = socket.inet_ntop(family, raw)
+    if ip.startswith("::ffff:") and "." in ip:
+        ip = ip[7:]  # IPv4-mapped address on a dual-stack socket
+    return ip, int(port, 16)
+
+
+def parse_socket_table(text, proto):
+    """Connections (without owners) from one /proc/net/{tcp,tcp6,udp,udp6} table"""
+    connections = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+        local_ip, local_port = decode_address(fields[1])
+        remote_ip, remote_port = decode_address(fields[2])
+        state = TCP_STATES.get(fields[3], fields[3]) if proto.startswith("tcp") else "NONE"
+        connections.append(Connection(proto, local_ip, local_port, remote_ip, remote_port, state, int(fields[9]), None))
+    return connections
+
+
+class ConnectionIndex:
+    """Every socket on the system from one scan, indexed by pid, local port and remote address"""
+
+    def __init__(self, data_source):
+        self.data_source = data_source
+        self.owners = {}  # inode -> pid, or None when the owner could not be found (e.g. no permission)
+        self.connections = []
+        self.by_pid = {}
+        self.by_local_port = {}
+        self.by_remote = {}
+        self.last_refresh = None
+
+    def refresh(self):
+        """Rescan the socket tables and rebuild the indexes"""
+        tables = self.data_source.socket_tables()
+        if tables is None:
+            # No /proc/net: take psutil's already-resolved view instead
+            connections = [Connection(("tcp" if c.type == socket.SOCK_STREAM else "udp") +
+                                      ("6" if c.family == socket.AF_INET6 else ""),
+                                      *(c.laddr or ("", 0)), *(c.raddr or ("", 0)), c.status, 0, c.pid)
+                           for c in self.data_source.net_connections()]
+        else:
+            connections = [c for proto in SOCKET_TABLES for c in parse_socket_table(tables.get(proto, ""), proto)]
+
+            # Only go looking for owners of sockets not seen before; TIME_WAIT and friends have inode 0
+            live = {c.inode for c in connections if c.inode}
+            self.owners = {inode: pid for inode, pid in self.owners.items() if inode in live}
+            unknown = live - self.owners.keys()
+            if unknown:
+                found = self.data_source.socket_owners(unknown)
+                for inode in unknown:
+                    self.owners[inode] = found.get(inode)
+            connections = [c._replace(pid=self.owners.get(c.inode)) for c in connections]
+
+        by_pid, by_local_port, by_remote = {}, {}, {}
+        for c in connections:
+            if c.pid is not None:
+                by_pid.setdefault(c.pid, []).append(c)
+            by_local_port.setdefault(c.local_port, []).append(c)
+            if c.remote_port:
+                by_remote.setdefault(c.remote_ip, []).append(c)
+        self.connections = connections
+        self.by_pid, self.by_local_port, self.by_remote = by_pid, by_local_port, by_remote
+        self.last_refresh = time.monotonic()
+        return connections
+
+    def for_pid(self, pid):
+        return self.by_pid.get(pid, [])
+
+    def on_port(self, port):
+        """Sockets bound to a local port (listeners first)"""
+        return sorted(self.by_local_port.get(port, []), key=lambda c: c.state != "LISTEN")
+
+    def owners_of_port(self, port):
+        return sorted({c.pid for c in self.by_local_port.get(port, []) if c.pid is not None})
+
+    def to_remote(self, ip):
+        return self.by_remote.get(ip, [])
+
+    def counts_by_pid(self):
+        return {pid: len(connections) for pid, connections in self.by_pid.items()}
+
+    def state_counts(self):
+        return Counter(c.state for c in self.connections)
+
+    def stats(self):
+        return {
+            'connections': len(self.connections),
+            'processes': len(self.by_pid),
+            'unowned': sum(1 for c in self.connections if c.pid is None),
+            'known_inodes': len(self.owners)
+        }
@@ -0,0 +1,870 @@
+import os
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+import psutil
+
+try:
+    import pwd
+except ImportError:
+    pwd = None  # Windows has no passwd database
+
+from utils.process_utils import get_process_snapshot, FD_ATTR
+from utils.cgroups import CGROUP_STAT_FILES, parse_proc_cgroup
+
+# Shapes returned by every data source (same fields the UI reads from psutil)
+MemoryInfo = namedtuple("MemoryInfo", ["rss", "vms"])
+VirtualMemory = namedtuple("VirtualMemory", ["total", "available", "percent", "used", "free"])
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+
+
+def find_cgroup2_mount(mounts_text):
+    """Where the cgroup v2 hierarchy is mounted (/sys/fs/cgroup, or .../unified on hybrid hosts)"""
+    for line in mounts_text.splitlines():
+        fields = line.split()
+        if len(fields) > 2 and fields[2] == "cgroup2":
+            return fields[1]
+    return None
+
+
+def read_cgroup_files(directory):
+    """The CGROUP_STAT_FILES of one cgroup directory (missing ones as None), or None if it is gone"""
+    if not os.path.isdir(directory):
+        return None
+    files = {}
+    for name in CGROUP_STAT_FILES:
+        try:
+            with open(os.path.join(directory, name)) as f:
+                files[name] = f.read()
+        except OSError:
+            files[name] = None  # Controller not enabled here (the root has no memory.current)
+    return files
+
+
+class DataSource:
+    """Where the collectors get system and process data from"""
+    
+    name = "base"
+    
+    def cpu_percent(self):
+        """System-wide CPU utilisation in percent"""
+        raise NotImplementedError
+    
+    def virtual_memory(self):
+        """System memory usage (total, available, percent, used, free)"""
+        raise NotImplementedError
+    
+    def disk_usage(self, path):
+        """Usage of the filesystem holding path (total, used, free, percent)"""
+        raise NotImplementedError
+    
+    def process_snapshot(self, attrs=None):
+        """One pass over the process table as a list of info dicts"""
+        raise NotImplementedError
+    
+    def process_io(self, pids):
+        """{pid: (read_bytes, write_bytes, syscalls)} cumulative counters for the readable ones of pids"""
+        return {}
+    
+    def process_cgroup(self, pid):
+        """Contents of /proc/<pid>/cgroup, or None if unavailable"""
+        return None
+    
+    def process_cmdline(self, pid):
+        """Command line of a process joined with spaces, or None if unavailable"""
+        return None
+    
+    def process_user(self, pid):
+        """Name of the user a process runs as, or None if unavailable"""
+        return None
+    
+    def cgroup_stats(self, path):
+        """{file name: text} of CGROUP_STAT_FILES for a cgroup v2 path, or None if unavailable"""
+        return None
+    
+    def diskstats(self):
+        """Block device counters in /proc/diskstats format, or None if unavailable"""
+        return None
+    
+    def is_partition(self, device):
+        """Whether a block device is a partition of another, or None if unknown"""
+        return None
+    
+    def net_dev(self):
+        """Network interface counters in /proc/net/dev format, or None if unavailable"""
+        return None
+    
+    def socket_tables(self):
+        """{'tcp': text, 'tcp6': ..., 'udp': ..., 'udp6': ...} in /proc/net format, or None if unavailable"""
+        return None
+    
+    def socket_owners(self, inodes):
+        """{inode: pid} for as many of the given socket inodes as can be found"""
+        return {}
+    
+    def net_connections(self):
+        """psutil-style connections, used when there are no socket tables to parse"""
+        return []
+
+
+class PsutilDataSource(DataSource):
+    """Live data from the running system"""
+    
+    name = "psutil"
+    
+    def cpu_percent(self):
+        return psutil.cpu_percent()
+    
+    def virtual_memory(self):
+        return psutil.virtual_memory()
+    
+    def disk_usage(self, path):
+        return psutil.disk_usage(path)
+    
+    def process_snapshot(self, attrs=None):
+        return get_process_snapshot(attrs)
+    
+    def process_io(self, pids):
+        counters = {}
+        if os.path.exists("/proc/self/io"):
+            # Reading /proc/<pid>/io directly is much cheaper than a psutil.Process per pid
+            for pid in pids:
+                try:
+                    with open(f"/proc/{pid}/io") as f:
+                        fields = dict(line.split(": ") for line in f.read().splitlines())
+                    counters[pid] = (int(fields["read_bytes"]), int(fields["write_bytes"]),
+                                     int(fields["syscr"]) + int(fields["syscw"]))
+                except (OSError, KeyError, ValueError):
+                    continue  # Exited, or another user's process
+            return counters
+        for pid in pids:
+            try:
+                io = psutil.Process(pid).io_counters()
+                counters[pid] = (io.read_bytes, io.write_bytes, io.read_count + io.write_count)
+            except (psutil.Error, AttributeError):
+                continue  # Exited, no permission, or no I/O counters on this platform
+        return counters
+    
+    def process_cgroup(self, pid):
+        try:
+            with open(f"/proc/{pid}/cgroup") as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def process_cmdline(self, pid):
+        try:
+            return " ".join(psutil.Process(pid).cmdline())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+    
+    def process_user(self, pid):
+        try:
+            return psutil.Process(pid).username()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError):
+            return None
+    
+    def cgroup_stats(self, path):
+        if not hasattr(self, 'cgroup_mount'):
+            try:
+                with open("/proc/self/mounts") as f:
+                    self.cgroup_mount = find_cgroup2_mount(f.read())
+            except OSError:
+                self.cgroup_mount = None
+        if self.cgroup_mount is None:
+            return None
+        return read_cgroup_files(self.cgroup_mount + path.rstrip("/"))
+    
+    def diskstats(self):
+        try:
+            with open("/proc/diskstats") as f:
+                return f.read()
+        except OSError:
+            pass
+        # Elsewhere, lay psutil's per-disk counters out the same way
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        return "\n".join(
+            f"0 0 {name} {c.read_count} 0 {c.read_bytes // 512} {c.read_time} {c.write_count} 0 "
+            f"{c.write_bytes // 512} {c.write_time} 0 {getattr(c, 'busy_time', 0)} 0"
+            for name, c in counters.items())
+    
+    def is_partition(self, device):
+        # Partitions have a "partition" attribute in sysfs; whole disks don't
+        path = f"/sys/class/block/{device}"
+        if not os.path.isdir(path):
+            return None
+        return os.path.exists(f"{path}/partition")
+    
+    def socket_tables(self):
+        if not os.path.exists("/proc/net/tcp"):
+            return None
+        tables = {}
+        for proto in ("tcp", "tcp6", "udp", "udp6"):
+            try:
+                with open(f"/proc/net/{proto}") as f:
+                    tables[proto] = f.read()
+            except OSError:
+                tables[proto] = ""  # No IPv6, for instance
+        return tables
+    
+    def socket_owners(self, inodes):
+        # Walk /proc/<pid>/fd for "socket:[inode]" links, stopping once every wanted inode is found
+        wanted = {f"socket:[{inode}]": inode for inode in inodes}
+        owners = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            fd_dir = f"/proc/{entry}/fd"
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue  # Exited, or another user's process
+            for fd in fds:
+                try:
+                    inode = wanted.pop(os.readlink(f"{fd_dir}/{fd}"), None)
+                except OSError:
+                    continue
+                if inode is not None:
+                    owners[inode] = int(entry)
+            if not wanted:
+                break
+        return owners
+    
+    def net_connections(self):
+        return psutil.net_connections(kind="inet")
+    
+    def net_dev(self):
+        try:
+            with open("/proc/net/dev") as f:
+                return f.read()
+        except OSError:
+            pass
+        counters = psutil.net_io_counters(pernic=True) or {}
+        return "\n".join(
+            f"{name}: {c.bytes_recv} {c.packets_recv} {c.errin} {c.dropin} 0 0 0 0 "
+            f"{c.bytes_sent} {c.packets_sent} {c.errout} {c.dropout} 0 0 0 0"
+            for name, c in counters.items())
+
+
+class SyntheticDataSource(DataSource):
+    """Generated process population for reproducible load testing.
+    
+    Rates are events per second across the whole table. With tick_seconds set,
+    every snapshot advances the simulation by a fixed step, so runs with the
+    same seed are identical; otherwise it follows the wall clock.
+    """
+    
+    name = "synthetic"
+    
+    # Ports the simulated servers listen on
+    LISTEN_PORTS = {"postgres": 5432, "nginx": 80, "sshd": 22, "redis-server": 6379, "mysqld": 3306,
+                    "prometheus": 9090, "gunicorn": 8000, "node": 3000, "java": 8080, "php-fpm": 9000}
+    
+    # Arguments and users the simulated processes run with (user "user" otherwise)
+    ARGUMENTS = {"gunicorn": ["--workers", "4", "app:app"], "celery": ["-A", "tasks", "worker"],
+                 "python3": ["-m", "http.server"], "java": ["-Xmx2g", "-jar", "service.jar"],
+                 "node": ["server.js"], "postgres": ["-D", "/var/lib/postgresql/data"]}
+    USERS = {"systemd": "root", "kworker": "root", "sshd": "root", "containerd": "root", "dockerd": "root",
+             "rsyslogd": "syslog", "cron": "root", "postgres": "postgres", "nginx": "www-data",
+             "php-fpm": "www-data", "gunicorn": "www-data", "celery": "www-data", "mysqld": "mysql",
+             "redis-server": "redis", "prometheus": "prometheus"}
+    
+    NAMES = ["systemd", "bash", "python3", "postgres", "nginx", "java", "node", "chrome",
+             "sshd", "containerd", "dockerd", "kworker", "rsyslogd", "cron", "redis-server",
+             "gunicorn", "celery", "php-fpm", "mysqld", "prometheus"]
+    
+    def __init__(self, process_count=500, seed=0, churn_rate=2.0, fork_rate=1.0, zombie_rate=0.1,
+                 burst_rate=0.5, leak_fraction=0.01, cpu_count=8, total_memory=32 * 1024 ** 3,
+                 tick_seconds=None):
+        self.rng = np.random.default_rng(seed)
+        self.churn_rate = churn_rate          # Processes exiting (and being replaced) per second
+        self.fork_rate = fork_rate            # Child processes forked per second
+        self.zombie_rate = zombie_rate        # Processes turning into zombies per second
+        self.burst_rate = burst_rate          # CPU bursts started per second
+        self.leak_fraction = leak_fraction    # Share of new processes that leak memory
+        self.cpu_count = cpu_count
+        self.total_memory = total_memory
+        self.tick_seconds = tick_seconds
+        self.zombie_lifetime = 30.0
+        self.disk_total = 512 * 1024 ** 3
+        self.disk_used = 0.4 * self.disk_total
+        
+        # Block devices in /proc/diskstats layout: two disks, each with one partition
+        self.block_devices = [("nvme0n1", 259, 0), ("nvme0n1p1", 259, 1), ("sda", 8, 0), ("sda1", 8, 1)]
+        self.block_counters = np.zeros((len(self.block_devices), 11))
+        
+        # Network interfaces with the 16 /proc/net/dev counters each
+        self.interfaces = ["lo", "eth0", "wlan0"]
+        self.interface_counters = np.zeros((len(self.interfaces), 16))
+        
+        # Size per-process usage so the whole table idles around 20% CPU and 40% memory
+        self.mean_cpu = 0.2 * cpu_count * 100 / max(process_count, 1)
+        self.rss_mu = np.log(0.4 * total_memory / max(process_count, 1)) - 1.2 ** 2 / 2
+        
+        self.clock = time.time()
+        self.last_advance = time.monotonic()
+        self.next_pid = 2
+        self.columns = {name: [] for name in ("pid", "ppid", "name", "create_time", "base_cpu", "cpu",
+                                              "rss", "leak", "threads", "fds", "status", "burst_until",
+                                              "zombie_since", "io_rate", "io_read", "io_write", "syscalls",
+                                              "cpu_time")}
+        
+        # Init is pid 1; everything else starts as one of its descendants
+        self._spawn(1, "systemd", ppid=0)
+        for _ in range(process_count - 1):
+            self._spawn(self._new_pid(), self.rng.choice(self.NAMES), ppid=self._random_parent())
+        self._to_arrays()
+    
+    def _new_pid(self):
+        pid = self.next_pid
+        self.next_pid += 1
+        return pid
+    
+    def _random_parent(self):
+        pids = self.columns["pid"]
+        return int(pids[self.rng.integers(len(pids))]) if len(pids) else 1
+    
+    def _spawn(self, pid, name, ppid):
+        """Append a new process to the column lists"""
+        leaks = self.rng.random() < self.leak_fraction
+        c = self.columns
+        c["pid"].append(pid)
+        c["ppid"].append(ppid)
+        c["name"].append(str(name))
+        c["create_time"].append(self.clock - float(self.rng.uniform(0, 3600)))
+        c["base_cpu"].append(float(self.rng.exponential(self.mean_cpu)))
+        c["cpu"].append(0.0)
+        c["rss"].append(float(self.rng.lognormal(self.rss_mu, 1.2)))
+        c["leak"].append(float(self.rng.uniform(64, 1024) * 1024) if leaks else 0.0)
+        c["threads"].append(int(self.rng.integers(1, 48)))
+        c["fds"].append(int(self.rng.integers(3, 128)))
+        c["status"].append(psutil.STATUS_SLEEPING)
+        c["burst_until"].append(0.0)
+        c["zombie_since"].append(0.0)
+        # Most processes barely touch the disk; a few are heavy readers or writers
+        c["io_rate"].append(float(self.rng.pareto(1.5) * 4096))
+        c["io_read"].append(0.0)
+        c["io_write"].append(0.0)
+        c["syscalls"].append(0.0)
+        c["cpu_time"].append(0.0)
+    
+    def _to_arrays(self):
+        """Numeric columns as arrays for vectorized updates"""
+        for key in ("pid", "ppid", "threads", "fds"):
+            self.columns[key] = np.asarray(self.columns[key], dtype=np.int64)
+        for key in ("create_time", "base_cpu", "cpu", "rss", "leak", "burst_until", "zombie_since",
+                    "io_rate", "io_read", "io_write", "syscalls", "cpu_time"):
+            self.columns[key] = np.asarray(self.columns[key], dtype=np.float64)
+        self.columns["status"] = np.asarray(self.columns["status"], dtype=object)
+        self.columns["name"] = list(self.columns["name"])
+    
+    def _to_lists(self):
+        for key, column in self.columns.items():
+            self.columns[key] = list(column)
+    
+    def _events(self, rate, dt):
+        return int(self.rng.poisson(rate * dt)) if rate > 0 else 0
+    
+    def advance(self, dt):
+        """Move the simulation forward by dt seconds"""
+        self.clock += dt
+        c = self.columns
+        n = len(c["pid"])
+        
+        # Zombies whose parent finally reaped them disappear; a share of the rest exits (churn)
+        alive = np.ones(n, dtype=bool)
+        zombies = c["status"] == psutil.STATUS_ZOMBIE
+        alive &= ~(zombies & (self.clock - c["zombie_since"] > self.zombie_lifetime))
+        exits = self._events(self.churn_rate, dt)
+        if exits and n > 1:
+            alive[self.rng.choice(np.arange(1, n), size=min(exits, n - 1), replace=False)] = False
+        
+        # Processes turning into zombies
+        for i in self.rng.integers(1, n, size=self._events(self.zombie_rate, dt)) if n > 1 else []:
+            c["status"][i] = psutil.STATUS_ZOMBIE
+            c["zombie_since"][i] = self.clock
+        
+        # CPU bursts
+        for i in self.rng.integers(0, n, size=self._events(self.burst_rate, dt)):
+            c["burst_until"][i] = self.clock + float(self.rng.uniform(2, 20))
+        
+        removed = n - int(alive.sum())
+        if removed:
+            for key, column in c.items():
+                c[key] = column[alive] if isinstance(column, np.ndarray) else [v for v, keep in zip(column, alive) if keep]
+        
+        # Replace exited processes and fork children of existing ones
+        self._to_lists()
+        for _ in range(removed):
+            self._spawn(self._new_pid(), self.rng.choice(self.NAMES), ppid=self._random_parent())
+        for _ in range(self._events(self.fork_rate, dt)):
+            parent = int(self.rng.integers(len(c["pid"])))
+            self._spawn(self._new_pid(), c["name"][parent], ppid=c["pid"][parent])
+            c["create_time"][-1] = self.clock
+        self._to_arrays()
+        
+        # Per-process CPU and memory for this step
+        c = self.columns
+        n = len(c["pid"])
+        zombies = c["status"] == psutil.STATUS_ZOMBIE
+        bursting = c["burst_until"] > self.clock
+        c["cpu"] = c["base_cpu"] * self.rng.lognormal(0, 0.3, n)
+        c["cpu"][bursting] = self.rng.uniform(50, 100, int(bursting.sum()))
+        c["cpu"][zombies] = 0.0
+        c["cpu_time"] += c["cpu"] / 100 * dt * 1e6  # Microseconds, as in cgroup cpu.stat
+        c["rss"] += c["leak"] * dt
+        c["status"][~zombies] = psutil.STATUS_SLEEPING
+        c["status"][bursting & ~zombies] = psutil.STATUS_RUNNING
+        
+        # Per-process I/O, heavier while bursting
+        io = c["io_rate"] * self.rng.lognormal(0, 0.5, n) * dt
+        io[bursting] *= 20
+        io[zombies] = 0.0
+        c["io_read"] += np.rint(io * 0.6)
+        c["io_write"] += np.rint(io * 0.4)
+        c["syscalls"] += np.rint(io / 4096 + c["cpu"] * 20 * dt)
+        
+        # Disk I/O rises with the number of bursting processes; the NVMe disk is fast, sda slow
+        load = 1.0 + bursting.sum() / 4
+        for disk, (read_rate, write_rate, ms_per_io) in ((0, (150, 80, 0.2)), (2, (15, 8, 5.0))):
+            reads = self.rng.poisson(read_rate * load * dt)
+            writes = self.rng.poisson(write_rate * load * dt)
+            ms_reading = reads * ms_per_io * self.rng.uniform(0.5, 1.5)
+            ms_writing = writes * ms_per_io * self.rng.uniform(0.8, 2.0)
+            step = np.array([reads, 0, reads * 64, ms_reading, writes, 0, writes * 128, ms_writing, 0,
+                             min(dt * 1000, (ms_reading + ms_writing) * 0.8), ms_reading + ms_writing])
+            self.block_counters[disk] += np.rint(step)
+            self.block_counters[disk + 1] += np.rint(step * 0.9)  # Most I/O lands on the partition
+        
+        # Network traffic follows the same load; eth0 carries most of it, with the odd error and drop
+        for iface, (rx_packets, tx_packets) in ((0, (50, 50)), (1, (800, 500)), (2, (60, 40))):
+            rx = self.rng.poisson(rx_packets * load * dt)
+            tx = self.rng.poisson(tx_packets * load * dt)
+            counters = self.interface_counters[iface]
+            counters[[0, 1, 8, 9]] += (rx * self.rng.uniform(200, 1400), rx, tx * self.rng.uniform(100, 1200), tx)
+            counters[[2, 3, 10, 11]] += self.rng.poisson(np.array([0.01, 0.05, 0.01, 0.02]) * load * dt)
+        self.interface_counters = np.rint(self.interface_counters)
+    
+    def _step(self):
+        """Advance by a fixed tick or by the wall-clock time since the last call"""
+        if self.tick_seconds:
+            dt = self.tick_seconds
+        else:
+            now = time.monotonic()
+            dt, self.last_advance = now - self.last_advance, now
+        if dt > 0:
+            self.advance(dt)
+    
+    def cpu_percent(self):
+        return float(min(100.0, self.columns["cpu"].sum() / self.cpu_count))
+    
+    def virtual_memory(self):
+        c = self.columns
+        used = float(min(c["rss"][c["status"] != psutil.STATUS_ZOMBIE].sum(), self.total_memory))
+        free = self.total_memory - used
+        return VirtualMemory(self.total_memory, free, used / self.total_memory * 100, used, free)
+    
+    def disk_usage(self, path):
+        free = self.disk_total - self.disk_used
+        return DiskUsage(self.disk_total, self.disk_used, free, self.disk_used / self.disk_total * 100)
+    
+    def diskstats(self):
+        return "\n".join(f"{major} {minor} {name} " + " ".join(str(int(v)) for v in counters)
+                         for (name, major, minor), counters in zip(self.block_devices, self.block_counters))
+    
+    def is_partition(self, device):
+        minors = {name: minor for name, major, minor in self.block_devices}
+        return minors[device] != 0 if device in minors else None
+    
+    def net_dev(self):
+        return "\n".join(f"{name}: " + " ".join(str(int(v)) for v in counters)
+                         for name, counters in zip(self.interfaces, self.interface_counters))
+    
+    def socket_tables(self):
+        # Servers listen on their port (several workers may share it); a quarter of processes hold
+        # outbound connections. Socket inodes are pid * 100 + n so owners can be worked out directly.
+        def address(ip, port):
+            return "".join(f"{int(octet):02X}" for octet in reversed(ip.split("."))) + f":{port:04X}"
+        
+        lines = []
+        for pid, name in zip(self.columns["pid"], self.columns["name"]):
+            pid = int(pid)
+            port = self.LISTEN_PORTS.get(name)
+            if port:
+                lines.append((address("0.0.0.0", port), address("0.0.0.0", 0), "0A", pid * 100))
+            for n in range(1, 1 + (pid * 7919) % 16 // 4 if pid % 4 == 0 else 1):
+                remote = f"10.0.{pid % 7}.{n * 13 % 250 + 1}"
+                lines.append((address("10.0.0.2", 32768 + (pid * 31 + n) % 28000), address(remote, 443),
+                              "01", pid * 100 + n))
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode"
+        tcp = "\n".join([header] + [f"{i:4d}: {local} {remote} {state} 00000000:00000000 00:00000000 00000000 "
+                                    f"    0        0 {inode} 1 0000000000000000 20 4 30 10 -1"
+                                    for i, (local, remote, state, inode) in enumerate(lines)])
+        return {'tcp': tcp, 'tcp6': header, 'udp': header, 'udp6': header}
+    
+    def process_io(self, pids):
+        c = self.columns
+        index = {int(pid): i for i, pid in enumerate(c["pid"])}
+        return {pid: (int(c["io_read"][i]), int(c["io_write"][i]), int(c["syscalls"][i]))
+                for pid in pids if (i := index.get(pid)) is not None}
+    
+    def _cgroup_path(self, pid, name):
+        """Where a simulated process lives: services in system.slice, some in Docker or a Kubernetes pod"""
+        digest = f"{zlib.crc32(name.encode()) * 4099:012x}"[-12:]
+        if pid == 1:
+            return "/init.scope"
+        if name == "kworker":
+            return "/"
+        if name in ("bash", "python3", "chrome"):
+            return "/user.slice/user-1000.slice/session-2.scope"
+        if name in ("node", "gunicorn", "celery"):
+            return f"/system.slice/docker-{digest}{digest}.scope"
+        if name == "java":
+            return (f"/kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod{digest[:8]}_1234.slice/"
+                    f"cri-containerd-{digest}{digest}.scope")
+        return f"/system.slice/{name}.service"
+    
+    def _name_of(self, pid):
+        matches = np.flatnonzero(self.columns["pid"] == pid)
+        return self.columns["name"][matches[0]] if len(matches) else None
+    
+    def process_cgroup(self, pid):
+        name = self._name_of(pid)
+        return None if name is None else f"0::{self._cgroup_path(pid, name)}\n"
+    
+    def process_cmdline(self, pid):
+        name = self._name_of(pid)
+        if name is None or name == "kworker":
+            return None if name is None else ""
+        return " ".join([f"/usr/bin/{name}"] + self.ARGUMENTS.get(name, []))
+    
+    def process_user(self, pid):
+        name = self._name_of(pid)
+        return None if name is None else self.USERS.get(name, "user")
+    
+    def cgroup_stats(self, path):
+        c = self.columns
+        if getattr(self, 'cgroup_paths', (None,))[0] is not c["pid"]:
+            # One path per process, rebuilt only after the table changed shape
+            self.cgroup_paths = (c["pid"], np.array([self._cgroup_path(int(pid), name)
+                                                     for pid, name in zip(c["pid"], c["name"])]))
+        paths = self.cgroup_paths[1]
+        if path == "/":
+            inside = np.ones(len(paths), dtype=bool)
+        else:
+            inside = (paths == path) | np.char.startswith(paths, path + "/")
+        if not inside.any():
+            return None
+        memory = c["rss"][inside].sum()
+        # Pressure builds once a group holds more than a tenth of memory
+        pressure = max(0.0, memory / self.total_memory - 0.1) * 50
+        return {
+            "cpu.stat": f"usage_usec {int(c['cpu_time'][inside].sum())}\n",
+            "memory.current": None if path == "/" else f"{int(memory)}\n",
+            "io.stat": f"259:0 rbytes={int(c['io_read'][inside].sum())} wbytes={int(c['io_write'][inside].sum())} rios=0 wios=0\n",
+            "memory.pressure": f"some avg10={pressure:.2f} avg60={pressure:.2f} avg300={pressure:.2f} total=0\n"
+        }
+    
+    def socket_owners(self, inodes):
+        live = set(int(pid) for pid in self.columns["pid"])
+        return {inode: inode // 100 for inode in inodes if inode // 100 in live}
+    
+    def process_snapshot(self, attrs=None):
+        self._step()
+        c = self.columns
+        snapshot = []
+        for i in range(len(c["pid"])):
+            zombie = c["status"][i] == psutil.STATUS_ZOMBIE
+            snapshot.append({
+                'pid': int(c["pid"][i]),
+                'ppid': int(c["ppid"][i]),
+                'name': c["name"][i],
+                'exe': None if c["name"][i] == "kworker" else f"/usr/bin/{c['name'][i]}",
+                'create_time': float(c["create_time"][i]),
+                'cpu_percent': float(c["cpu"][i]),
+                'memory_info': None if zombie else MemoryInfo(int(c["rss"][i]), int(c["rss"][i] * 2)),
+                'num_threads': int(c["threads"][i]),
+                FD_ATTR: None if zombie else int(c["fds"][i]),
+                'status': c["status"][i]
+            })
+        return snapshot
+
+
+class ProcSnapshotDataSource(DataSource):
+    """Replays /proc captures made with capture_proc_snapshot.
+    
+    path is either one capture or a directory of captures, which are replayed
+    in name order (looping); CPU usage comes from the deltas between them.
+    """
+    
+    name = "procfs"
+    
+    def __init__(self, path):
+        if os.path.exists(os.path.join(path, "stat")):
+            self.captures = [path]
+        else:
+            self.captures = sorted(os.path.join(path, d) for d in os.listdir(path)
+                                   if os.path.exists(os.path.join(path, d, "stat")))
+        if not self.captures:
+            raise ValueError(f"No /proc captures found in {path}")
+        self.position = 0
+        self.current = self._read_capture(self.captures[0])
+        self.previous = None
+    
+    def _read(self, *parts):
+        try:
+            with open(os.path.join(*parts)) as f:
+                return f.read()
+        except OSError:
+            return ""
+    
+    def _read_capture(self, root):
+        """Parse one capture into system totals and per-process records"""
+        capture = {'processes': {}, 'ticks': os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100}
+        
+        for line in self._read(root, "stat").splitlines():
+            fields = line.split()
+            if fields and fields[0] == "cpu":
+                values = [int(v) for v in fields[1:]]
+                capture['cpu_total'] = sum(values)
+                capture['cpu_idle'] = values[3] + (values[4] if len(values) > 4 else 0)
+            elif fields and fields[0] == "btime":
+                capture['boot_time'] = int(fields[1])
+        
+        meminfo = {}
+        for line in self._read(root, "meminfo").splitlines():
+            key, _, value = line.partition(":")
+            if value:
+                meminfo[key] = int(value.split()[0]) * 1024
+        capture['meminfo'] = meminfo
+        
+        disk = self._read(root, "disk_usage").split()
+        capture['disk'] = tuple(int(v) for v in disk) if len(disk) == 3 else None
+        capture['diskstats'] = self._read(root, "diskstats") or None
+        capture['net_dev'] = self._read(root, "net_dev") or None
+        capture['sockets'] = {proto: self._read(root, f"net_{proto}") for proto in ("tcp", "tcp6", "udp", "udp6")}
+        capture['socket_owners'] = {}
+        
+        for entry in os.listdir(root):
+            if entry.isdigit():
+                record = self._read_process(root, entry, capture)
+                if record:
+                    capture['processes'][record['pid']] = record
+        return capture
+    
+    def _read_process(self, root, pid, capture):
+        stat = self._read(root, pid, "stat")
+        if not stat:
+            return None
+        # comm can contain spaces and parentheses, so split around the last ')'
+        name = stat[stat.find("(") + 1:stat.rfind(")")]
+        fields = stat[stat.rfind(")") + 2:].split()
+        status_codes = {"R": psutil.STATUS_RUNNING, "S": psutil.STATUS_SLEEPING, "D": psutil.STATUS_DISK_SLEEP,
+                        "Z": psutil.STATUS_ZOMBIE, "T": psutil.STATUS_STOPPED, "I": psutil.STATUS_IDLE}
+        
+        rss = 0
+        for line in self._read(root, pid, "status").splitlines():
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1]) * 1024
+        fd_count = self._read(root, pid, "fd_count").strip()
+        io = dict(line.split(": ") for line in self._read(root, pid, "io").splitlines() if ": " in line)
+        for inode in self._read(root, pid, "sockets").split():
+            capture['socket_owners'][int(inode)] = int(pid)
+        
+        ticks = capture['ticks']
+        return {
+            'pid': int(pid),
+            'ppid': int(fields[1]),
+            'name': name,
+            'exe': self._read(root, pid, "exe").strip() or None,
+            'status': status_codes.get(fields[0], psutil.STATUS_SLEEPING),
+            'cpu_ticks': int(fields[11]) + int(fields[12]),  # utime + stime
+            'num_threads': int(fields[17]),
+            'create_time': capture.get('boot_time', 0) + int(fields[19]) / ticks,
+            'rss': rss,
+            'fds': int(fd_count) if fd_count.isdigit() else None,
+            'io': (int(io["read_bytes"]), int(io["write_bytes"]), int(io["syscr"]) + int(io["syscw"]))
+                  if {"read_bytes", "write_bytes", "syscr", "syscw"} <= io.keys() else None
+        }
+    
+    def _step(self):
+        """Move to the next capture when replaying a sequence"""
+        if len(self.captures) > 1:
+            self.position = (self.position + 1) % len(self.captures)
+            self.previous = self.current if self.position else None
+            self.current = self._read_capture(self.captures[self.position])
+    
+    def cpu_percent(self):
+        current, previous = self.current, self.previous
+        if not previous or 'cpu_total' not in current or 'cpu_total' not in previous:
+            return 0.0
+        total = current['cpu_total'] - previous['cpu_total']
+        idle = current['cpu_idle'] - previous['cpu_idle']
+        return 100.0 * (total - idle) / total if total > 0 else 0.0
+    
+    def virtual_memory(self):
+        meminfo = self.current['meminfo']
+        total = meminfo.get("MemTotal", 0)
+        available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+        used = total - available
+        return VirtualMemory(total, available, used / total * 100 if total else 0.0, used, meminfo.get("MemFree", 0))
+    
+    def disk_usage(self, path):
+        if not self.current['disk']:
+            return psutil.disk_usage(path)
+        total, used, free = self.current['disk']
+        return DiskUsage(total, used, free, used / total * 100 if total else 0.0)
+    
+    def diskstats(self):
+        return self.current['diskstats']
+    
+    def net_dev(self):
+        return self.current['net_dev']
+    
+    def process_cgroup(self, pid):
+        return self._read(self.captures[self.position], str(pid), "cgroup") or None
+    
+    def process_cmdline(self, pid):
+        cmdline = self._read(self.captures[self.position], str(pid), "cmdline")
+        return cmdline.replace("\0", " ").strip() if pid in self.current['processes'] else None
+    
+    def process_user(self, pid):
+        for line in self._read(self.captures[self.position], str(pid), "status").splitlines():
+            if line.startswith("Uid:"):
+                uid = int(line.split()[1])
+                try:
+                    return pwd.getpwuid(uid).pw_name if pwd else str(uid)
+                except KeyError:
+                    return str(uid)  # No such user on this machine
+        return None
+    
+    def cgroup_stats(self, path):
+        return read_cgroup_files(os.path.join(self.captures[self.position], "cgroup", path.strip("/")))
+    
+    def process_io(self, pids):
+        processes = self.current['processes']
+        return {pid: processes[pid]['io'] for pid in pids if pid in processes and processes[pid]['io']}
+    
+    def socket_tables(self):
+        return self.current['sockets'] if self.current['sockets']['tcp'] else None
+    
+    def socket_owners(self, inodes):
+        owners = self.current['socket_owners']
+        return {inode: owners[inode] for inode in inodes if inode in owners}
+    
+    def process_snapshot(self, attrs=None):
+        self._step()
+        current, previous = self.current, self.previous
+        # Seconds of CPU time per tick between captures, spread over the capture interval
+        interval = None
+        if previous and 'cpu_total' in current and 'cpu_total' in previous:
+            interval = (current['cpu_total'] - previous['cpu_total']) / (os.cpu_count() or 1)
+        
+        snapshot = []
+        for pid, record in current['processes'].items():
+            cpu = 0.0
+            before = previous['processes'].get(pid) if previous else None
+            if interval and before and before['create_time'] == record['create_time']:
+                cpu = 100.0 * (record['cpu_ticks'] - before['cpu_ticks']) / interval
+            snapshot.append({
+                'pid': pid,
+                'ppid': record['ppid'],
+                'name': record['name'],
+                'exe': record['exe'],
+                'create_time': record['create_time'],
+                'cpu_percent': cpu,
+                'memory_info': MemoryInfo(record['rss'], 0),
+                'num_threads': record['num_threads'],
+                FD_ATTR: record['fds'],
+                'status': record['status']
+            })
+        return snapshot
+
+
+def capture_proc_snapshot(dest, proc_root="/proc"):
+    """Copy the parts of /proc the replay source reads into dest"""
+    os.makedirs(dest, exist_ok=True)
+    for name in ("stat", "meminfo", "uptime", "diskstats", "net/dev", "net/tcp", "net/tcp6", "net/udp", "net/udp6"):
+        try:
+            # Nested files are flattened: net/dev is saved as net_dev
+            with open(os.path.join(proc_root, name)) as src, open(os.path.join(dest, name.replace("/", "_")), "w") as out:
+                out.write(src.read())
+        except OSError as e:
+            print(f"Error capturing {name}: {e}")
+    
+    usage = psutil.disk_usage("/")
+    with open(os.path.join(dest, "disk_usage"), "w") as out:
+        out.write(f"{usage.total} {usage.used} {usage.free}\n")
+    
+    cgroups = set()
+    for entry in os.listdir(proc_root):
+        if not entry.isdigit():
+            continue
+        try:
+            files = {}
+            for name in ("stat", "status", "cmdline", "cgroup"):
+                with open(os.path.join(proc_root, entry, name), "rb") as src:
+                    files[name] = src.read()
+            try:
+                with open(os.path.join(proc_root, entry, "io"), "rb") as src:
+                    files["io"] = src.read()
+            except OSError:
+                pass  # Only readable for our own processes without extra privileges
+            try:
+                files["exe"] = os.readlink(os.path.join(proc_root, entry, "exe")).encode()
+            except OSError:
+                pass  # Kernel threads have no executable; other users' are not readable
+            try:
+                fd_dir = os.path.join(proc_root, entry, "fd")
+                links = []
+                for fd in os.listdir(fd_dir):
+                    try:
+                        links.append(os.readlink(os.path.join(fd_dir, fd)))
+                    except OSError:
+                        pass  # Closed while listing
+                files["fd_count"] = str(len(links)).encode()
+                # Socket inodes the process holds, for the connection index on replay
+                files["sockets"] = " ".join(link[8:-1] for link in links if link.startswith("socket:[")).encode()
+            except OSError:
+                pass  # fds of other users' processes are not readable
+        except OSError:
+            continue  # The process exited mid-capture
+        os.makedirs(os.path.join(dest, entry), exist_ok=True)
+        for name, data in files.items():
+            with open(os.path.join(dest, entry, name), "wb") as out:
+                out.write(data)
+        path = parse_proc_cgroup(files["cgroup"].decode(errors="replace"))
+        if path is not None:
+            cgroups.add(path)
+    
+    # Stats of every occupied cgroup and its ancestors, under dest/cgroup/<path>
+    source = PsutilDataSource()
+    ancestors = set()
+    for path in cgroups:
+        while path not in ancestors:
+            ancestors.add(path)
+            path = os.path.dirname(path)
+    for path in ancestors:
+        files = source.cgroup_stats(path)
+        if files is None:
+            continue
+        directory = os.path.join(dest, "cgroup", path.strip("/"))
+        os.makedirs(directory, exist_ok=True)
+        for name, text in files.items():
+            if text is not None:
+                with open(os.path.join(directory, name), "w") as out:
+                    out.write(text)
+
+
+def create_data_source(spec=None):
+    """Build a data source from a spec: 'psutil', 'synthetic[:count]' or 'procfs:<path>'"""
+    if not spec or spec == "psutil":
+        return PsutilDataSource()
+    kind, _, arg = spec.partition(":")
+    if kind == "synthetic":
+        return SyntheticDataSource(process_count=int(arg) if arg else 500)
+    if kind == "procfs":
+        return ProcSnapshotDataSource(arg)
+    raise ValueError(f"Unknown data source: {spec}")
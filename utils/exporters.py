@@ -0,0 +1,28 @@
+import csv
+import json
+from datetime import datetime
+
+
+def flatten_report(report, prefix=""):
+    """Turn a nested report into (key, value) rows for CSV export"""
+    rows = []
+    for key, value in report.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            rows.extend(flatten_report(value, name))
+        else:
+            rows.append((name, value))
+    return rows
+
+
+def export_metrics_report(path, report):
+    """Write a metrics report as JSON (.json) or as key/value CSV rows (anything else)"""
+    report = {'exported_at': datetime.now().isoformat(timespec="seconds"), **report}
+    if path.lower().endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Metric", "Value"])
+            writer.writerows(flatten_report(report))
@@ -0,0 +1,80 @@
+import os
+import time
+
+import psutil
+
+
+class ResourceGovernor:
+    """Keeps the monitor's own CPU use under a budget by backing off its refresh work"""
+    
+    # Per level: (refresh period multiplier, max points drawn per graph line, slow collector multiplier)
+    LEVELS = (
+        (1, None, 1),
+        (2, 600, 2),
+        (3, 300, 5),
+        (5, 150, 10),
+    )
+    
+    def __init__(self, budget_percent=2.0, restore_fraction=0.5, patience=2):
+        self.budget_percent = budget_percent        # Percent of one core
+        self.restore_fraction = restore_fraction    # Step back down once usage is below this share of the budget
+        self.patience = patience                    # Consecutive checks needed before changing level
+        self.process = psutil.Process(os.getpid())
+        self.level = 0
+        self.usage_percent = 0.0
+        self.over_count = 0
+        self.under_count = 0
+        self.last_cpu = self._cpu_seconds()
+        self.last_wall = time.monotonic()
+    
+    def _cpu_seconds(self):
+        times = self.process.cpu_times()
+        return times.user + times.system
+    
+    def check(self):
+        """Measure CPU use since the last check and adjust the level; returns True if it changed"""
+        cpu, wall = self._cpu_seconds(), time.monotonic()
+        elapsed = wall - self.last_wall
+        if elapsed <= 0:
+            return False
+        self.usage_percent = (cpu - self.last_cpu) / elapsed * 100
+        self.last_cpu, self.last_wall = cpu, wall
+        
+        if self.usage_percent > self.budget_percent:
+            self.over_count += 1
+            self.under_count = 0
+        elif self.usage_percent < self.budget_percent * self.restore_fraction:
+            self.under_count += 1
+            self.over_count = 0
+        else:
+            self.over_count = self.under_count = 0
+        
+        previous = self.level
+        if self.over_count >= self.patience and self.level < len(self.LEVELS) - 1:
+            self.level += 1
+            self.over_count = 0
+        elif self.under_count >= self.patience and self.level > 0:
+            self.level -= 1
+            self.under_count = 0
+        return self.level != previous
+    
+    def refresh_interval(self, base_ms):
+        """Scale a UI refresh period for the current level"""
+        return int(base_ms * self.LEVELS[self.level][0])
+    
+    def max_graph_points(self):
+        """Upper bound on points drawn per graph line, or None for full resolution"""
+        return self.LEVELS[self.level][1]
+    
+    def collector_interval(self, base_ms):
+        """Scale the period of a slow collector (process walks, per-process analysis)"""
+        return int(base_ms * self.LEVELS[self.level][2])
+    
+    def status(self):
+        """Current budget, usage and level"""
+        return {
+            'budget_percent': self.budget_percent,
+            'usage_percent': round(self.usage_percent, 2),
+            'level': self.level,
+            'max_level': len(self.LEVELS) - 1
+        }
@@ -0,0 +1,184 @@
+import math
+
+import numpy as np
+
+from utils.process_utils import snapshot_columns
+
+
+class ProcessHistory:
+    """Per-process time series in one preallocated ring array, keyed by (pid, create_time)"""
+
+    FIELDS = ("cpu", "rss", "read", "write", "syscalls", "threads")  # I/O fields are per second, NaN until known
+    IO_FIELDS = slice(2, 5)
+
+    def __init__(self, length=300, max_bytes=32 * 1024 * 1024):
+        self.length = length
+        # Each tracked process costs one row of samples plus its timestamps
+        row_bytes = length * (len(self.FIELDS) * 4 + 8)
+        self.capacity = max(1, max_bytes // row_bytes)
+        self.data = np.full((self.capacity, length, len(self.FIELDS)), np.nan, dtype=np.float32)
+        self.times = np.zeros((self.capacity, length))
+        self.pos = np.zeros(self.capacity, dtype=np.intp)      # Next write position per row
+        self.count = np.zeros(self.capacity, dtype=np.intp)    # Samples held per row
+        self.last_seen = np.zeros(self.capacity)               # Last sample time, used for LRU eviction
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.last_io = np.full((self.capacity, 3), np.nan)     # Cumulative read bytes, write bytes, syscalls
+        self.last_io_time = np.zeros(self.capacity)            # When last_io was read
+        self.io_rate = np.full((self.capacity, 3), np.nan)     # Latest rates, carried between I/O samples
+        self.io_tick = 0
+        self.keys = [None] * self.capacity
+        self.slots = {}       # (pid, create_time) -> row
+        self.latest_key = {}  # pid -> newest (pid, create_time), for callers that only know the pid
+        self.free_rows = list(range(self.capacity - 1, -1, -1))
+        self.untracked = 0    # Samples skipped because every row held a live process
+        self.evictable = None
+
+    def _allocate(self, key):
+        """Row for a new process: a free one, else the least recently seen exited process"""
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.evictable is None:
+                # Exited rows, least recently seen last so they pop first; built once per snapshot
+                exited = np.flatnonzero(~self.alive)
+                self.evictable = exited[np.argsort(-self.last_seen[exited], kind="stable")].tolist()
+            if not self.evictable:
+                self.untracked += 1
+                return None
+            row = self.evictable.pop()
+            self._forget(row)
+        self.keys[row] = key
+        self.slots[key] = row
+        self.pos[row] = 0
+        self.count[row] = 0
+        self.data[row] = np.nan
+        self.last_io[row] = np.nan
+        self.io_rate[row] = np.nan
+        self.alive[row] = True  # Not evictable again within the same snapshot
+        return row
+
+    def _forget(self, row):
+        key = self.keys[row]
+        del self.slots[key]
+        if self.latest_key.get(key[0]) == key:
+            del self.latest_key[key[0]]
+        self.keys[row] = None
+
+    def io_sample(self, pids, limit, always=()):
+        """The pids whose I/O counters to read this time: always the given ones, plus a rotating stride of the rest"""
+        pids = list(pids)
+        if len(pids) <= limit:
+            return pids
+        stride = math.ceil(len(pids) / limit)
+        offset = self.io_tick % stride
+        self.io_tick += 1
+        return list(set(pids[offset::stride]).union(always))
+    
+    def record(self, snapshot, now, io=None, columns=None):
+        """Append one sample for every process in a snapshot and mark the missing ones as exited.
+        
+        io maps pid -> cumulative (read_bytes, write_bytes, syscalls) for the processes whose
+        counters were read this time; the others keep their last known rates. columns is
+        snapshot_columns(snapshot) when the caller already has it.
+        """
+        io = io or {}
+        columns = columns if columns is not None else snapshot_columns(snapshot)
+        self.evictable = None
+        keys = list(zip(columns.pids, columns.create_times))
+        found = list(map(self.slots.get, keys))
+        if None in found:
+            for i in [i for i, row in enumerate(found) if row is None]:
+                found[i] = self._allocate(keys[i])
+                if found[i] is not None:
+                    self.latest_key[keys[i][0]] = keys[i]
+        if None in found:
+            # Some processes didn't get a row
+            tracked = np.array([row is not None for row in found], dtype=bool)
+            found = [row for row in found if row is not None]
+        else:
+            tracked = slice(None)
+
+        self.alive[:] = False
+        if not found:
+            return
+        rows = np.array(found, dtype=np.intp)
+        values = np.full((len(rows), len(self.FIELDS)), np.nan, dtype=np.float32)
+        values[:, 0] = np.nan_to_num(columns.cpu[tracked])
+        values[:, 1] = columns.rss[tracked]
+        threads = columns.threads[tracked]
+        values[:, 5] = np.where(threads > 0, threads, np.nan)
+
+        # I/O rates come from the change in cumulative counters since that process's last I/O read
+        io_totals = np.full((len(rows), 3), np.nan)
+        if io:
+            for i, pid in enumerate(np.asarray(columns.pids)[tracked].tolist()):
+                if pid in io:
+                    io_totals[i] = io[pid]
+        read = ~np.isnan(io_totals[:, 0])
+        sampled = rows[read]
+        elapsed = (now - self.last_io_time[sampled])[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.io_rate[sampled] = np.maximum(io_totals[read] - self.last_io[sampled], 0) / elapsed
+        self.last_io[sampled] = io_totals[read]
+        self.last_io_time[sampled] = now
+        values[:, self.IO_FIELDS] = self.io_rate[rows]
+
+        positions = self.pos[rows]
+        self.data[rows, positions] = values
+        self.times[rows, positions] = now
+        self.pos[rows] = (positions + 1) % self.length
+        self.count[rows] = np.minimum(self.count[rows] + 1, self.length)
+        self.last_seen[rows] = now
+        self.alive[rows] = True
+
+    def find(self, pid, create_time=None):
+        """Row for a process, or None if it is not tracked"""
+        key = (pid, create_time) if create_time is not None else self.latest_key.get(pid)
+        return self.slots.get(key)
+
+    def series(self, pid, field, create_time=None, seconds=None, now=None):
+        """(times, values) for one field of one process, oldest first"""
+        row = self.find(pid, create_time)
+        if row is None:
+            return np.empty(0), np.empty(0, dtype=np.float32)
+        n = self.count[row]
+        order = (self.pos[row] - n + np.arange(n)) % self.length
+        times = self.times[row, order]
+        values = self.data[row, order, self.FIELDS.index(field)]
+        if seconds is not None and n:
+            keep = times >= (now if now is not None else times[-1]) - seconds
+            times, values = times[keep], values[keep]
+        return times, values
+
+    def window(self, field, start, end, how="max"):
+        """{(pid, create_time): max, min or mean of one field} over the samples taken between start and end"""
+        if not self.slots:
+            return {}
+        keys = list(self.slots)
+        rows = np.fromiter(self.slots.values(), dtype=np.intp, count=len(keys))
+        values = self.data[rows, :, self.FIELDS.index(field)]
+        times = self.times[rows]
+        inside = (times >= start) & (times <= end) & ~np.isnan(values)
+        has_samples = inside.any(axis=1)
+        values = np.where(inside, values, np.nan)[has_samples]
+        stat = {"max": np.nanmax, "min": np.nanmin, "avg": np.nanmean}[how](values, axis=1)
+        return {key: float(value) for key, value in zip((k for k, keep in zip(keys, has_samples) if keep), stat)}
+
+    def latest_io(self, pid, create_time=None):
+        """(read bytes/s, write bytes/s, syscalls/s) for a process, NaN until two reads of its counters"""
+        row = self.find(pid, create_time)
+        return None if row is None else self.io_rate[row]
+    
+    def version(self, pid, create_time=None):
+        """Changes whenever a new sample is recorded for the process (for cache invalidation)"""
+        row = self.find(pid, create_time)
+        return None if row is None else float(self.last_seen[row])
+
+    def stats(self):
+        return {
+            'tracked': len(self.slots),
+            'alive': int(self.alive.sum()),
+            'capacity': self.capacity,
+            'memory_kb': round((self.data.nbytes + self.times.nbytes) / 1024, 1),
+            'untracked': self.untracked
+        }
@@ -1,6 +1,10 @@
+import math
 import psutil
+from collections import namedtuple
 from datetime import datetime
 
+import numpy as np
+
 def get_process_details(pid):
     """Get detailed information about a process"""
     try:
@@ -45,4 +49,49 @@ def change_process_priority(pid, priority):
     except psutil.NoSuchProcess:
         return False, f"Process {pid} not found."
     except psutil.AccessDenied:
-        return False, f"Access denied to change priority of process {pid}." 
+        return False, f"Access denied to change priority of process {pid}."
+
+# Attributes collected for every process on each snapshot
+SNAPSHOT_ATTRS = ['pid', 'ppid', 'name', 'exe', 'create_time', 'cpu_percent', 'memory_info', 'num_threads', 'status']
+# File descriptors on Unix, handles on Windows
+FD_ATTR = 'num_fds' if hasattr(psutil.Process, 'num_fds') else 'num_handles'
+
+def get_process_snapshot(attrs=None):
+    """Walk the process table once and return a list of info dicts"""
+    attrs = attrs or SNAPSHOT_ATTRS + [FD_ATTR]
+    snapshot = []
+    for proc in psutil.process_iter(attrs):
+        snapshot.append(proc.info)
+    return snapshot
+
+# One process snapshot as columns: pids and create_times are lists (together the process keys),
+# the rest float arrays with NaN where a value is missing
+ProcessColumns = namedtuple("ProcessColumns", ["pids", "create_times", "cpu", "rss", "threads", "fds"])
+
+def snapshot_columns(snapshot, fd_attr=FD_ATTR):
+    """Read the per-process numbers the history and anomaly detector use, in one pass over the snapshot"""
+    pids, create_times, cpu, rss, threads, fds = [], [], [], [], [], []
+    for info in snapshot:
+        pids.append(info['pid'])
+        create_times.append(info.get('create_time'))
+        cpu.append(info.get('cpu_percent'))
+        memory = info.get('memory_info')
+        rss.append(memory.rss if memory else None)
+        threads.append(info.get('num_threads'))
+        fds.append(info.get(fd_attr))
+    # None converts to NaN
+    cpu, rss, threads, fds = np.array([cpu, rss, threads, fds], dtype=float).reshape(4, len(pids))
+    return ProcessColumns(pids, create_times, cpu, rss, threads, fds)
+
+def format_io_rates(rates):
+    """Process-list text for (read bytes/s, write bytes/s, syscalls/s); '-' until a rate is known"""
+    def size(value):
+        for unit in ("B", "KB", "MB"):
+            if value < 1024:
+                return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+            value /= 1024
+        return f"{value:.1f} GB"
+    read, write, syscalls = rates
+    if math.isnan(read):
+        return "-", "-", "-"
+    return size(read), size(write), f"{syscalls:.0f}"
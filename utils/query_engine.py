@@ -0,0 +1,498 @@
+import math
+import os
+import re
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+
+from utils.alerts import METRIC_LABELS, METRIC_UNITS, PROCESS_METRICS, parse_duration
+from utils.app_groups import app_identity, app_label
+from utils.process_utils import FD_ATTR
+
+# target: "system", "processes" or "apps"
+# aggregation: system -> current/max/min/avg; processes and apps -> top/count/sum/avg
+# filters: (field, op, value) with field "name", "user", "pid", "category" or a process metric
+# time_range: (start, end) epoch seconds, or None for now; window: how a time range reduces one series
+QueryPlan = namedtuple("QueryPlan", ["target", "metric", "aggregation", "filters", "time_range", "window",
+                                     "top_n", "ascending"])
+
+# First match wins: (pattern, system metric, process metric); None where the word means nothing at that level
+METRIC_WORDS = [
+    (r"\b(?:disk\s+(?:i/?o|util\w*|busy)|i/?o\s+util\w*)\b", "disk_util", "io"),
+    (r"\b(?:download\w*|receiv\w*|inbound|rx)\b", "net_rx_mbps", None),
+    (r"\b(?:upload\w*|sen[dt]|sending|outbound|tx)\b", "net_tx_mbps", None),
+    (r"\b(?:reads?|reading)\b", None, "read"),
+    (r"\b(?:writes?|writing|written)\b", None, "write"),
+    (r"\b(?:i/?o|disk activity)\b", "disk_util", "io"),
+    (r"\bthreads?\b", None, "threads"),
+    (r"\b(?:file descriptors?|fds?|handles?|open files)\b", None, "fds"),
+    (r"\b(?:cpu|processor|load)\b", "cpu", "cpu"),
+    (r"\b(?:memory|ram|mem|rss)\b", "memory", "rss_mb"),
+    (r"\b(?:disk|storage|space)\b", "disk", None),
+]
+
+AGGREGATION_WORDS = [
+    (r"\b(?:how many|count|number of)\b", "count"),
+    (r"\b(?:average|avg|mean|typical)\b", "avg"),
+    (r"\b(?:peak|max|maximum|highest|most|biggest|largest|heaviest|busiest|hungriest|top)\b", "max"),
+    (r"\b(?:lowest|min|minimum|least|smallest|quietest)\b", "min"),
+    (r"\b(?:total|sum|combined|altogether)\b", "sum"),
+]
+
+APP_WORDS = r"\b(?:apps?|applications?|programs?)\b"
+PROCESS_WORDS = r"\b(?:process(?:es)?|pids?|tasks?|users|consumers?|hogs?|using|uses|which|who)\b"
+
+TIME_PATTERNS = {
+    "last": r"\b(?:last|past|previous)\s+(\d+(?:\.\d+)?)?\s*(seconds?|secs?|s|minutes?|mins?|m|hours?|hrs?|h)\b",
+    "between": r"\bbetween\s+(\d{1,2}):(\d{2})\s*(am|pm)?\s+and\s+(\d{1,2}):(\d{2})\s*(am|pm)?",
+    "since": r"\bsince\s+(\d{1,2}):(\d{2})\s*(am|pm)?",
+}
+USER_PATTERN = r"\b(?:owned by|run by|running as|started by|belonging to|for user|user)\s+([\w.$-]+)"
+NAME_PATTERN = r"\b(?:named|called|matching|like)\s+['\"]?([\w.+/-]+)['\"]?"
+NAME_BEFORE_PATTERN = r"\b([a-z][\w.+-]*)\s+(?:process(?:es)?|instances?|workers?)\b"
+PID_PATTERN = r"\bpid\s+(\d+)"
+THRESHOLD_PATTERNS = [
+    # "cpu > 10", "memory over 500mb"
+    r"\b(?P<metric>cpu|memory|mem|ram|rss|threads|fds)\s*(?:usage\s*|use\s*)?"
+    r"(?P<op>>=|<=|>|<|above|over|more than|greater than|exceeding|below|under|less than)\s*"
+    r"(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>%|kb|mb|gb)?",
+    # "using more than 10% cpu", "using over 1 gb of memory"
+    r"\busing\s+(?P<op>more than|over|above|less than|under|below)\s+(?P<value>\d+(?:\.\d+)?)\s*"
+    r"(?P<unit>%|kb|mb|gb)?\s*(?:of\s+)?(?P<metric>cpu|memory|mem|ram)\b",
+]
+PLURAL_PATTERN = r"\b(?:top|processes|apps|applications|programs|users|consumers|hogs)\b"
+TOP_N_PATTERNS = [r"\btop\s+(\d+)\b", r"\b(\d+)\s+(?:most|biggest|largest|heaviest|highest|busiest|hungriest|lowest)\b",
+                  r"\b(\d+)\s+(?:process(?:es)?|apps?|applications?|programs?)\b"]
+
+# Words that can precede "processes" without naming one
+NAME_STOPWORDS = {"how", "many", "all", "the", "running", "top", "most", "of", "any", "active", "current",
+                  "my", "which", "what", "other", "busy", "busiest", "largest", "biggest", "heaviest", "idle",
+                  "new", "system", "are", "there", "do", "i", "have", "these", "those", "and", "by", "total",
+                  "average", "hungriest", "count", "number", "show", "list", "me", "background", "user",
+                  "analyze", "analyse", "kill", "about"}
+COMMAND_WORDS = {"analyze", "analyse", "kill"}  # Requests for the assistant's own handlers, not queries
+# Other words a question can use without changing its meaning; anything else left over makes the plan a guess
+QUERY_WORDS = {"what", "what's", "whats", "was", "were", "is", "it", "be", "been", "being", "a", "an", "in", "on",
+               "at", "for", "to", "so", "far", "from", "over", "during", "within", "ago", "with", "or", "than",
+               "much", "who's", "does", "did", "has", "had", "give", "tell", "use", "used", "uses", "usage",
+               "utilization", "utilisation", "consume", "consumes", "consuming", "consumption", "eating", "taking",
+               "right", "now", "currently", "today", "per", "level", "percent", "rate", "speed", "network",
+               "bandwidth", "traffic", "each", "every", "one", "ones", "their", "they", "them", "it's", "its", "up",
+               "please", "currently", "s", "m", "h", "mb", "gb", "kb"}
+QUERY_TOKEN = r"[a-z][\w.+'-]*"
+
+THRESHOLD_METRICS = {"cpu": "cpu", "memory": "rss_mb", "mem": "rss_mb", "ram": "rss_mb", "rss": "rss_mb",
+                     "threads": "threads", "fds": "fds"}
+THRESHOLD_OPS = {">": ">", ">=": ">=", "<": "<", "<=": "<=", "above": ">", "over": ">", "more than": ">",
+                 "greater than": ">", "exceeding": ">", "below": "<", "under": "<", "less than": "<"}
+UNIT_MB = {"kb": 1 / 1024, "mb": 1, "gb": 1024}
+
+PROCESS_LABELS = {'cpu': "CPU", 'rss_mb': "memory", 'threads': "threads", 'fds': "open files",
+                  'read': "disk reads", 'write': "disk writes", 'io': "disk I/O"}
+PROCESS_UNITS = {'cpu': "%", 'rss_mb': " MB", 'threads': "", 'fds': "", 'read': " KB/s", 'write': " KB/s",
+                 'io': " KB/s"}
+# Per-process history field behind each metric and the factor to its display unit
+HISTORY_FIELDS = {'cpu': [("cpu", 1.0)], 'rss_mb': [("rss", 1 / (1024 * 1024))], 'threads': [("threads", 1.0)],
+                  'read': [("read", 1 / 1024)], 'write': [("write", 1 / 1024)],
+                  'io': [("read", 1 / 1024), ("write", 1 / 1024)]}
+# Cheapest filters first, so reading users and classifying happen for as few processes as possible
+FILTER_COST = {"pid": 0, "name": 1, "category": 3, "user": 4}
+
+
+def _take(pattern, text):
+    """(match, text with the match blanked out) so later patterns don't see the same words"""
+    match = re.search(pattern, text)
+    if match:
+        text = text[:match.start()] + " " + text[match.end():]
+    return match, text
+
+
+def _clock(hour, minute, meridiem, day):
+    hour = int(hour) % 12 + (12 if meridiem == "pm" else 0) if meridiem else int(hour)
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour, minutes=int(minute))
+
+
+def parse_time_range(text, now):
+    """((start, end) epoch seconds or None, text without the time words)"""
+    match, text = _take(TIME_PATTERNS["last"], text)
+    if match:
+        amount, unit = match.group(1) or "1", match.group(2)[0]
+        return (now - parse_duration(amount + unit), now), text
+    current = datetime.fromtimestamp(now)
+    match, text = _take(TIME_PATTERNS["between"], text)
+    if match:
+        start = _clock(*match.group(1, 2, 3), current.date())
+        end = _clock(*match.group(4, 5, 6), current.date())
+        if end <= start:
+            start -= timedelta(days=1)  # "between 23:30 and 00:15"
+        if start > current:
+            start, end = start - timedelta(days=1), end - timedelta(days=1)
+        return (start.timestamp(), end.timestamp()), text
+    match, text = _take(TIME_PATTERNS["since"], text)
+    if match:
+        start = _clock(*match.groups(), current.date())
+        if start > current:
+            start -= timedelta(days=1)
+        return (start.timestamp(), now), text
+    return None, text
+
+
+def _vocabulary(word):
+    """Whether a word is part of how questions are asked (so it can't be a process name)"""
+    return (word in NAME_STOPWORDS or word in QUERY_WORDS
+            or any(re.search(p, f" {word} ") for p in [p for p, _, _ in METRIC_WORDS] + [APP_WORDS, PROCESS_WORDS]))
+
+
+def parse_query(text, categories=(), now=None, names=()):
+    """QueryPlan for a question about the system or its processes, or None if it isn't one.
+
+    names holds the lowercase names of running processes, so a bare word naming one
+    ("how much memory is postgres using") becomes a name filter. Questions with any other
+    word the parser doesn't know return None rather than a plan that ignores it.
+    Questions about the current value of a system metric also return None: the assistant's
+    own readouts (GB used, core counts) answer those better than a single number.
+    """
+    now = time.time() if now is None else now
+    text = " " + text.lower().strip().rstrip("?.!") + " "
+    filters = []
+
+    time_range, text = parse_time_range(text, now)
+
+    match, text = _take(USER_PATTERN, text)
+    if match:
+        filters.append(("user", "=", match.group(1)))
+    match, text = _take(PID_PATTERN, text)
+    if match:
+        filters.append(("pid", "=", int(match.group(1))))
+    for pattern in THRESHOLD_PATTERNS:
+        while True:
+            match, text = _take(pattern, text)
+            if not match:
+                break
+            metric = THRESHOLD_METRICS[match.group("metric")]
+            value = float(match.group("value"))
+            unit = match.group("unit")
+            if metric == "rss_mb" and unit in UNIT_MB:
+                value *= UNIT_MB[unit]
+            filters.append((metric, THRESHOLD_OPS[match.group("op")], value))
+    # Longest names first, so "container runtime" wins over "container"
+    for category in sorted(categories, key=len, reverse=True):
+        match, text = _take(r"\b" + re.escape(category.lower()) + r"s?\b", text)
+        if match:
+            filters.append(("category", "=", category))
+            break
+
+    top_n = None
+    for pattern in TOP_N_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            top_n = int(match.group(1))
+            break
+
+    aggregation = "current"
+    for pattern, name in AGGREGATION_WORDS:
+        if re.search(pattern, text):
+            aggregation = name
+            break
+
+    match, text = _take(NAME_PATTERN, text)
+    if match:
+        filters.append(("name", "~", match.group(1)))
+    else:
+        for match in re.finditer(NAME_BEFORE_PATTERN, text):
+            word = match.group(1)
+            if word not in NAME_STOPWORDS and not any(re.search(p, word) for p, _, _ in METRIC_WORDS):
+                filters.append(("name", "~", word))
+                break
+        else:
+            for word in re.findall(QUERY_TOKEN, text):
+                if word in names and not _vocabulary(word):
+                    filters.append(("name", "~", word))
+                    break
+
+    # Every word must have been understood
+    leftover = text
+    for pattern in ([p for p, _, _ in METRIC_WORDS] + [p for p, _ in AGGREGATION_WORDS] + TOP_N_PATTERNS
+                    + [APP_WORDS, PROCESS_WORDS]):
+        leftover = re.sub(pattern, " ", leftover)
+    named = {value for field, _, value in filters if field == "name"}
+    if any(word in COMMAND_WORDS or (word not in named and word not in NAME_STOPWORDS and word not in QUERY_WORDS)
+           for word in re.findall(QUERY_TOKEN, leftover)):
+        return None
+
+    if re.search(APP_WORDS, text):
+        target = "apps"
+    elif filters or top_n or aggregation == "count" or re.search(PROCESS_WORDS, text):
+        target = "processes"
+    else:
+        target = "system"
+
+    system_metric = process_metric = None
+    for pattern, system_name, process_name in METRIC_WORDS:
+        if re.search(pattern, text):
+            system_metric, process_metric = system_name, process_name
+            break
+
+    if target == "system":
+        if system_metric is None or (aggregation == "current" and time_range is None):
+            return None
+        if aggregation in ("current", "sum", "count"):
+            aggregation = "avg"
+        return QueryPlan("system", system_metric, aggregation, [], time_range, None, None, False)
+
+    if aggregation == "current" and process_metric is None and not filters and top_n is None:
+        return None  # "what processes are running", "analyze process chrome": nothing to rank or count
+    if aggregation == "count" and process_metric in ("threads", "fds") and time_range is None:
+        aggregation = "sum"  # "how many threads does postgres have"
+    elif aggregation == "count":
+        return QueryPlan(target, process_metric, "count", filters, time_range, None, None, False)
+    if aggregation == "current" and top_n is None and (
+            (filters and re.search(r"\bhow much\b", text)) or (named and not re.search(PLURAL_PATTERN, text))):
+        aggregation = "sum"  # "how much memory is postgres using": all of its processes together
+    if process_metric is None:
+        if system_metric is not None:
+            return None  # A system-only metric asked about processes ("which process uses the most disk space")
+        process_metric = "cpu"
+    if time_range is not None and process_metric == "fds":
+        return None  # Not kept in the per-process history
+    window = None
+    if time_range is not None:
+        window = "avg" if aggregation == "avg" else "min" if aggregation == "min" else "max"
+    if aggregation in ("sum", "avg") and top_n is None and time_range is None:
+        return QueryPlan(target, process_metric, aggregation, filters, None, None, None, False)
+    if top_n is None:
+        top_n = 5 if re.search(PLURAL_PATTERN, text) else 1
+    return QueryPlan(target, process_metric, "top", filters, time_range, window, top_n, aggregation == "min")
+
+
+def describe_range(time_range, now):
+    if time_range is None:
+        return ""
+    start, end = time_range
+    if abs(end - now) < 1:
+        seconds = now - start
+        for size, unit in ((3600, "hour"), (60, "minute"), (1, "second")):
+            if seconds >= size:
+                count = round(seconds / size, 1)
+                count = int(count) if count == int(count) else count
+                return f" over the last {unit}" if count == 1 else f" over the last {count} {unit}s"
+        return " just now"
+    clock = lambda t: datetime.fromtimestamp(t).strftime("%H:%M")
+    return f" between {clock(start)} and {clock(end)}"
+
+
+def describe_filters(filters):
+    parts = []
+    for field, op, value in filters:
+        if field == "user":
+            parts.append(f"owned by {value}")
+        elif field == "name":
+            parts.append(f"named {value}")
+        elif field == "pid":
+            parts.append(f"with PID {value}")
+        elif field == "category":
+            parts.append(f"in category {value}")
+        else:
+            parts.append(f"with {PROCESS_LABELS[field]} {op} {value:g}{PROCESS_UNITS[field]}")
+    return (" " + " and ".join(parts)) if parts else ""
+
+
+def format_value(value, unit):
+    return f"{value:.0f}" if unit == "" else f"{value:.1f}{unit}"
+
+
+class QueryEngine:
+    """Answers questions from history and the latest process snapshot, without reading the live system.
+
+    Questions are parsed into a QueryPlan (metric, aggregation, filters, time range, top N)
+    and run over the app's in-memory series: system metrics from the range index over its history,
+    per-process values from the snapshot or, for a time range, the per-process history.
+    Process owners are the only thing read from the data source, once per process.
+    """
+
+    def __init__(self, data_source, classifier=None, process_history=None):
+        self.data_source = data_source
+        self.classifier = classifier
+        self.process_history = process_history
+        self.users = {}  # (pid, create_time) -> user name
+        self.categories = sorted({classification.category for _, classification in classifier.rules}
+                                 - {"Application"}) if classifier is not None else []
+        self.queries = 0
+        self.answered = 0
+
+    def parse(self, text, now=None, names=()):
+        return parse_query(text, self.categories, now, names)
+
+    @staticmethod
+    def process_names(snapshot):
+        """Lowercase names and executable basenames in a snapshot, also without version suffixes (python3.11)"""
+        # Few distinct names and executables, so dedupe before doing any string work
+        raw = {info.get('name') for info in snapshot}
+        raw.update(os.path.basename(exe) for exe in {info.get('exe') for info in snapshot} if exe)
+        names = {name.lower() for name in raw if name}
+        names.update([name.rstrip("0123456789.") for name in names])
+        names.discard("")
+        return names
+
+    def answer(self, text, snapshot, metrics, now=None):
+        """Reply to a question, or None if it isn't one the engine understands.
+
+        metrics is the RangeIndex over the system metric history.
+        """
+        now = time.time() if now is None else now
+        self.queries += 1
+        plan = self.parse(text, now, self.process_names(snapshot))
+        if plan is None:
+            return None
+        self.answered += 1
+        return self.execute(plan, snapshot, metrics, now)
+
+    def execute(self, plan, snapshot, metrics, now=None):
+        now = time.time() if now is None else now
+        if plan.target == "system":
+            return self._system(plan, metrics, now)
+        return self._processes(plan, snapshot, now)
+
+    def _system(self, plan, metrics, now):
+        label = METRIC_LABELS.get(plan.metric, plan.metric)
+        label = label[0].lower() + label[1:] if label[1:2].islower() else label  # "memory usage", "CPU usage"
+        unit = METRIC_UNITS.get(plan.metric, "")
+        start, end = plan.time_range or (None, None)
+        where = describe_range(plan.time_range, now) or " in the recorded history"
+        stats = metrics.query(plan.metric, start, end) if plan.metric in metrics.columns else None
+        if not stats or not stats.count:
+            return f"There are no {label} samples{where}."
+
+        if plan.aggregation == "avg":
+            answer = f"Average {label}{where} was {format_value(stats.mean, unit)}"
+        else:
+            at, value = metrics.extreme(plan.metric, start, end, lowest=plan.aggregation == "min")
+            word = "Peak" if plan.aggregation == "max" else "Lowest"
+            answer = (f"{word} {label}{where} was {format_value(value, unit)} "
+                      f"at {datetime.fromtimestamp(at).strftime('%H:%M:%S')} (average {format_value(stats.mean, unit)})")
+        answer += f", from {stats.count} samples."
+        if start is not None and metrics.oldest_time - start > 60:
+            answer += f" History only goes back to {datetime.fromtimestamp(metrics.oldest_time).strftime('%H:%M:%S')}."
+        return answer
+
+    def _user(self, info):
+        key = (info['pid'], info.get('create_time'))
+        if key not in self.users:
+            self.users[key] = self.data_source.process_user(info['pid'])
+        return self.users[key]
+
+    def _current(self, metric, info):
+        """A process's current value of one metric, None if it isn't known yet"""
+        if metric in PROCESS_METRICS:
+            return float(PROCESS_METRICS[metric](info))
+        if metric == "fds":
+            return float(info.get(FD_ATTR) or 0)
+        if self.process_history is None:
+            return None
+        rates = self.process_history.latest_io(info['pid'], info.get('create_time'))
+        if rates is None or math.isnan(rates[0]):
+            return None
+        read, write = float(rates[0]) / 1024, float(rates[1]) / 1024
+        return {"read": read, "write": write, "io": read + write}[metric]
+
+    def _matches(self, info, filters):
+        for field, op, value in filters:
+            if field == "pid":
+                if info['pid'] != value:
+                    return False
+            elif field == "name":
+                if value not in (info.get('name') or "").lower() and value not in (info.get('exe') or "").lower():
+                    return False
+            elif field == "user":
+                if self._user(info) != value:
+                    return False
+            elif field == "category":
+                if self.classifier is None or self.classifier.classify(info).category != value:
+                    return False
+            else:
+                current = self._current(field, info)
+                if current is None or not {">": current > value, ">=": current >= value,
+                                           "<": current < value, "<=": current <= value}[op]:
+                    return False
+        return True
+
+    def _windowed(self, metric, time_range, how):
+        """{(pid, create_time): statistic} of a metric over a time range, from the per-process history"""
+        result = {}
+        for field, scale in HISTORY_FIELDS[metric]:
+            for key, value in self.process_history.window(field, *time_range, how=how).items():
+                result[key] = result.get(key, 0.0) + value * scale
+        return result
+
+    def _processes(self, plan, snapshot, now):
+        filters = sorted(plan.filters, key=lambda f: FILTER_COST.get(f[0], 2))
+        matching = [info for info in snapshot if self._matches(info, filters)]
+        if any(field == "user" for field, _, _ in filters):
+            live = {(info['pid'], info.get('create_time')) for info in snapshot}
+            self.users = {key: user for key, user in self.users.items() if key in live}
+        noun = "applications" if plan.target == "apps" else "processes"
+        described = describe_filters(plan.filters)
+
+        if plan.aggregation == "count":
+            if plan.target == "apps":
+                count = len({app_identity(info) for info in matching})
+                return f"{count} {noun}{described} are running ({len(matching)} processes)."
+            names = Counter(info.get('name') or "unknown" for info in matching).most_common(3)
+            breakdown = ", ".join(f"{name} ×{n}" if n > 1 else name for name, n in names)
+            more = ", …" if len({info.get('name') for info in matching}) > len(names) else ""
+            return f"{len(matching)} {noun}{described} are running" + (f" ({breakdown}{more})." if names else ".")
+        if not matching:
+            return f"No {noun}{described} are running."
+
+        metric, unit, label = plan.metric, PROCESS_UNITS[plan.metric], PROCESS_LABELS[plan.metric]
+        where = describe_range(plan.time_range, now)
+        if plan.time_range is not None:
+            if self.process_history is None:
+                return "Per-process history isn't being recorded."
+            windowed = self._windowed(metric, plan.time_range, plan.window)
+            values = [(info, windowed.get((info['pid'], info.get('create_time')))) for info in matching]
+        else:
+            values = [(info, self._current(metric, info)) for info in matching]
+        values = [(info, value) for info, value in values if value is not None]
+        if not values:
+            return f"No {label} readings yet for {noun}{described}{where}."
+
+        if plan.target == "apps":
+            totals, counts = {}, Counter()
+            for info, value in values:
+                identity = app_identity(info)
+                totals[identity] = totals.get(identity, 0.0) + value
+                counts[identity] += 1
+            rows = [(f"{app_label(identity)} ({counts[identity]} process{'es' if counts[identity] > 1 else ''})", value)
+                    for identity, value in totals.items()]
+        else:
+            rows = [(f"{info.get('name') or 'unknown'} (PID {info['pid']})", value) for info, value in values]
+
+        if plan.aggregation in ("sum", "avg"):
+            total = sum(value for _, value in rows)
+            value = total if plan.aggregation == "sum" else total / len(rows)
+            # Counts read "have 560 threads", amounts "use 700.0 MB of memory"
+            verb = "average" if plan.aggregation == "avg" else "have" if unit == "" else "use"
+            of = " " if unit == "" else " of "
+            in_total = " in total" if plan.aggregation == "sum" else ""
+            return f"{noun.capitalize()}{described} {verb} {format_value(value, unit)}{of}{label}{in_total} ({len(rows)} {noun})."
+
+        rows.sort(key=lambda row: row[1], reverse=not plan.ascending)
+        shown = rows[:plan.top_n]
+        statistic = {"max": "peak ", "min": "lowest ", "avg": "average "}.get(plan.window, "")
+        order = "Lowest" if plan.ascending else "Top"
+        if len(shown) == 1:
+            name, value = shown[0]
+            if statistic:
+                return (f"{name} had the {'lowest' if plan.ascending else 'highest'} {statistic}{label}{where}"
+                        f"{described}: {format_value(value, unit)}.")
+            return f"{name} has the {'least' if plan.ascending else 'most'} {label}{described}: {format_value(value, unit)}."
+        lines = "\n".join(f"• {name}: {format_value(value, unit)}" for name, value in shown)
+        return f"{order} {len(shown)} {noun} by {statistic}{label}{where}{described}:\n{lines}"
+
+    def stats(self):
+        return {
+            'queries': self.queries,
+            'answered': self.answered,
+            'cached_users': len(self.users)
+        }
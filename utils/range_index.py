@@ -0,0 +1,153 @@
+from collections import namedtuple
+
+import numpy as np
+
+RangeStats = namedtuple("RangeStats", ["count", "min", "max", "sum", "mean"])
+EMPTY_RANGE = RangeStats(0, np.nan, np.nan, 0.0, np.nan)
+
+
+class RangeIndex:
+    """Count, min, max and sum of several metrics over any time range of a bounded history, in O(log n).
+
+    Samples fill a ring of `capacity` slots with a segment tree over it for each statistic:
+    appending rewrites one leaf and its ancestors, and a range query combines at most
+    2 log2(capacity) nodes whatever the range's length. NaN readings are left out.
+    """
+
+    def __init__(self, metrics, capacity=3600):
+        self.metrics = list(metrics)
+        self.columns = {metric: i for i, metric in enumerate(self.metrics)}
+        self.capacity = capacity
+        self.size = 1 << max(0, (capacity - 1).bit_length())  # Leaves; the tree's nodes are 1 .. 2*size-1
+        self.clear()
+
+    def clear(self):
+        shape = (2 * self.size, len(self.metrics))
+        self.mins = np.full(shape, np.inf)
+        self.maxs = np.full(shape, -np.inf)
+        self.sums = np.zeros(shape)
+        self.counts = np.zeros(shape)
+        self.times = np.zeros(self.capacity)
+        self.next = 0  # Sequence number of the next sample; slot = sequence % capacity
+
+    def __len__(self):
+        return min(self.next, self.capacity)
+
+    @property
+    def oldest_time(self):
+        return self.times[(self.next - len(self)) % self.capacity] if self.next else None
+
+    @property
+    def latest_time(self):
+        return self.times[(self.next - 1) % self.capacity] if self.next else None
+
+    def _set_leaves(self, slots, values):
+        missing = np.isnan(values)
+        leaves = self.size + slots
+        self.mins[leaves] = np.where(missing, np.inf, values)
+        self.maxs[leaves] = np.where(missing, -np.inf, values)
+        self.sums[leaves] = np.where(missing, 0.0, values)
+        self.counts[leaves] = ~missing
+
+    def _combine(self, nodes):
+        left, right = 2 * nodes, 2 * nodes + 1
+        self.mins[nodes] = np.minimum(self.mins[left], self.mins[right])
+        self.maxs[nodes] = np.maximum(self.maxs[left], self.maxs[right])
+        self.sums[nodes] = self.sums[left] + self.sums[right]
+        self.counts[nodes] = self.counts[left] + self.counts[right]
+
+    def append(self, t, values):
+        """Add one sample (values in metric order), replacing the oldest once the ring is full"""
+        slot = self.next % self.capacity
+        self.times[slot] = t
+        self._set_leaves(slot, np.asarray(values, dtype=float))
+        self.next += 1
+        node = (self.size + slot) >> 1
+        while node:
+            self._combine(node)
+            node >>= 1
+
+    def load(self, times, columns):
+        """Rebuild from whole series (dict of metric -> values, aligned with times at the newest end)"""
+        self.clear()
+        times = np.asarray(times, dtype=float)[-self.capacity:]
+        n = len(times)
+        values = np.full((n, len(self.metrics)), np.nan)
+        for metric, series in columns.items():
+            series = np.asarray(series, dtype=float)[-n:] if n else np.empty(0)
+            values[n - len(series):, self.columns[metric]] = series
+        self.times[:n] = times
+        self._set_leaves(np.arange(n), values)
+        self.next = n
+        # Build the tree bottom-up, one vectorised level at a time
+        level = self.size >> 1
+        while level:
+            self._combine(np.arange(level, 2 * level))
+            level >>= 1
+
+    def seq_at(self, t, after=False):
+        """First held sequence number sampled at or after t (strictly after with after=True)"""
+        lo, hi = self.next - len(self), self.next
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sample = self.times[mid % self.capacity]
+            if sample < t or (after and sample == t):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _nodes(self, start, end):
+        """Tree nodes covering the samples taken between start and end (None for open), oldest first"""
+        lo = self.seq_at(start) if start is not None else self.next - len(self)
+        hi = self.seq_at(end, after=True) if end is not None else self.next
+        if hi <= lo:
+            return []
+        first = lo % self.capacity
+        last = first + hi - lo
+        spans = [(first, last)] if last <= self.capacity else [(first, self.capacity), (0, last - self.capacity)]
+        nodes = []
+        for left, right in spans:
+            left, right = left + self.size, right + self.size
+            before, after = [], []
+            while left < right:
+                if left & 1:
+                    before.append(left)
+                    left += 1
+                if right & 1:
+                    right -= 1
+                    after.append(right)
+                left >>= 1
+                right >>= 1
+            nodes += before + after[::-1]
+        return nodes
+
+    def query(self, metric, start=None, end=None):
+        """RangeStats of one metric over the samples taken between start and end (epoch seconds)"""
+        column = self.columns[metric]
+        nodes = self._nodes(start, end)
+        if not nodes:
+            return EMPTY_RANGE
+        count = int(self.counts[nodes, column].sum())
+        if not count:
+            return EMPTY_RANGE
+        total = float(self.sums[nodes, column].sum())
+        return RangeStats(count, float(self.mins[nodes, column].min()), float(self.maxs[nodes, column].max()),
+                          total, total / count)
+
+    def extreme(self, metric, start=None, end=None, lowest=False):
+        """(time, value) of the earliest maximum (or minimum) in a range, or None if it has no readings"""
+        column = self.columns[metric]
+        tree = self.mins if lowest else self.maxs
+        nodes = self._nodes(start, end)
+        if not nodes:
+            return None
+        values = tree[nodes, column]
+        node = nodes[int(values.argmin() if lowest else values.argmax())]
+        target = tree[node, column]
+        if np.isinf(target):
+            return None
+        # Walk down to the leaf holding the value, preferring the older (left) side
+        while node < self.size:
+            node = 2 * node if tree[2 * node, column] == target else 2 * node + 1
+        return float(self.times[node - self.size]), float(target)
@@ -0,0 +1,102 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Upper bounds of the latency buckets in milliseconds (the last bucket catches everything slower)
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+class TaskHistogram:
+    """Latency histograms for one task, kept in a bounded ring of time slots"""
+    
+    def __init__(self, slot_seconds=10, slots=60):
+        self.slot_seconds = slot_seconds
+        self.counts = np.zeros((slots, len(BUCKET_BOUNDS_MS)), dtype=np.int64)
+        self.slot_ids = np.full(slots, -1, dtype=np.int64)  # Which time slot each ring entry holds
+        self.sums = np.zeros(slots)
+        self.maxima = np.zeros(slots)
+        self.last_ms = 0.0
+    
+    def record(self, ms, now=None):
+        """Add one latency sample"""
+        slot_id = int((now if now is not None else time.time()) // self.slot_seconds)
+        i = slot_id % len(self.slot_ids)
+        if self.slot_ids[i] != slot_id:
+            # This ring entry holds an old slot; recycle it
+            self.slot_ids[i] = slot_id
+            self.counts[i] = 0
+            self.sums[i] = 0.0
+            self.maxima[i] = 0.0
+        self.counts[i, np.searchsorted(BUCKET_BOUNDS_MS, ms)] += 1
+        self.sums[i] += ms
+        self.maxima[i] = max(self.maxima[i], ms)
+        self.last_ms = ms
+    
+    def _live(self, now=None):
+        """Ring entries that still fall inside the ring's time window"""
+        current = int((now if now is not None else time.time()) // self.slot_seconds)
+        return (self.slot_ids >= 0) & (self.slot_ids > current - len(self.slot_ids))
+    
+    def percentile(self, q, counts):
+        """Estimate a percentile (0-100) from bucket counts, using bucket upper bounds"""
+        total = counts.sum()
+        if total == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(counts), q / 100.0 * total))
+        index = min(index, len(BUCKET_BOUNDS_MS) - 1)
+        bound = BUCKET_BOUNDS_MS[index]
+        return bound if bound != float("inf") else BUCKET_BOUNDS_MS[-2]
+    
+    def summary(self, now=None):
+        """Count, mean, p50/p99, max and bucket counts over the ring's window"""
+        live = self._live(now)
+        counts = self.counts[live].sum(axis=0)
+        count = int(counts.sum())
+        return {
+            'count': count,
+            'mean_ms': float(self.sums[live].sum() / count) if count else 0.0,
+            'p50_ms': self.percentile(50, counts),
+            'p99_ms': self.percentile(99, counts),
+            'max_ms': float(self.maxima[live].max()) if live.any() else 0.0,
+            'last_ms': self.last_ms,
+            'buckets': {(f"<={bound:g}ms" if bound != float("inf") else f">{BUCKET_BOUNDS_MS[-2]:g}ms"): int(n)
+                        for bound, n in zip(BUCKET_BOUNDS_MS, counts)}
+        }
+
+
+class SelfMetrics:
+    """Instrumentation of the monitor's own scheduled work"""
+    
+    def __init__(self, slot_seconds=10, slots=60):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self.tasks = {}
+    
+    def record(self, task, seconds):
+        """Record how long a task took"""
+        histogram = self.tasks.get(task)
+        if histogram is None:
+            histogram = self.tasks[task] = TaskHistogram(self.slot_seconds, self.slots)
+        histogram.record(seconds * 1000)
+    
+    @contextmanager
+    def measure(self, task):
+        """Time the body of a with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(task, time.perf_counter() - start)
+    
+    def summary(self):
+        """Per-task statistics over the retained window"""
+        return {task: histogram.summary() for task, histogram in sorted(self.tasks.items())}
+    
+    def format_table(self):
+        """Plain-text table for the overlay"""
+        lines = [f"{'task':<14}{'last':>8}{'p50':>8}{'p99':>8}{'max':>9}  (ms, last {self.slot_seconds * self.slots // 60} min)"]
+        for task, stats in self.summary().items():
+            lines.append(f"{task:<14}{stats['last_ms']:>8.1f}{stats['p50_ms']:>8.1f}"
+                         f"{stats['p99_ms']:>8.1f}{stats['max_ms']:>9.1f}")
+        return "\n".join(lines)
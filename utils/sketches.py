@@ -0,0 +1,145 @@
+import math
+
+# Percentiles reported for every metric and window
+SKETCH_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class DDSketch:
+    """Quantiles within a relative error from counts in log-spaced buckets.
+
+    A value x lands in bucket ceil(log_gamma(x)), so every estimate is within
+    relative_accuracy of a real sample. Buckets are bounded by min_value/max_value, so memory
+    stays constant however many samples arrive; sketches add and subtract bucket by bucket.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-3, max_value=1e9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_key = math.ceil(math.log(max_value) / self.log_gamma)
+        self.counts = {}  # bucket key -> samples
+        self.zeros = 0    # Samples at or below min_value
+        self.count = 0
+
+    def add(self, value, weight=1):
+        """Add a sample; NaN is ignored and negative values count as zero"""
+        if value != value:
+            return
+        if value <= self.min_value:
+            self.zeros += weight
+        else:
+            key = min(math.ceil(math.log(value) / self.log_gamma), self.max_key)
+            self.counts[key] = self.counts.get(key, 0) + weight
+        self.count += weight
+
+    def merge(self, other, sign=1):
+        """Add another sketch with the same accuracy into this one (or take it out again with sign=-1)"""
+        for key, n in other.counts.items():
+            n = self.counts.get(key, 0) + sign * n
+            if n:
+                self.counts[key] = n
+            else:
+                del self.counts[key]
+        self.zeros += sign * other.zeros
+        self.count += sign * other.count
+
+    def quantile(self, q):
+        """Estimate of the q-quantile (0-1), or NaN while empty"""
+        if self.count <= 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if rank < seen:
+                # The bucket's midpoint (in relative terms) between gamma^(key-1) and gamma^key
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.counts) / (self.gamma + 1)
+
+
+class WindowedSketch:
+    """A DDSketch of the last `window` seconds, kept as `slots` sub-sketches so old samples age out in steps"""
+
+    def __init__(self, window, slots, relative_accuracy=0.01):
+        self.slot_seconds = window / slots
+        self.relative_accuracy = relative_accuracy
+        self.slots = [None] * slots  # ring of [slot number, DDSketch]
+        self.total = DDSketch(relative_accuracy)  # Sum of the live slots, so a quantile reads one sketch
+        self.current = None
+
+    def _advance(self, now):
+        """Drop slots that have fallen out of the window"""
+        number = int(now // self.slot_seconds)
+        if number == self.current:
+            return number
+        self.current = number
+        for i, slot in enumerate(self.slots):
+            if slot is not None and slot[0] <= number - len(self.slots):
+                self.total.merge(slot[1], -1)
+                self.slots[i] = None
+        return number
+
+    def add(self, value, now):
+        number = self._advance(now)
+        position = number % len(self.slots)
+        slot = self.slots[position]
+        if slot is None or slot[0] != number:
+            slot = self.slots[position] = [number, DDSketch(self.relative_accuracy)]
+        slot[1].add(value)
+        self.total.add(value)
+
+    def quantiles(self, qs=SKETCH_QUANTILES, now=None):
+        if now is not None:
+            self._advance(now)
+        return [self.total.quantile(q) for q in qs]
+
+
+class MetricSketches:
+    """Streaming p50/p95/p99 of each metric over each window (e.g. 1m, 1h, 24h), in constant memory"""
+
+    def __init__(self, windows, relative_accuracy=0.01):
+        self.windows = dict(windows)  # label -> (seconds, slots)
+        self.relative_accuracy = relative_accuracy
+        self.sketches = {}            # metric -> {window label: WindowedSketch}
+
+    def add(self, metric, value, now):
+        sketches = self.sketches.get(metric)
+        if sketches is None:
+            sketches = self.sketches[metric] = {label: WindowedSketch(seconds, slots, self.relative_accuracy)
+                                                for label, (seconds, slots) in self.windows.items()}
+        for sketch in sketches.values():
+            sketch.add(value, now)
+
+    def add_all(self, values, now):
+        """Add one reading per metric from a dict"""
+        for metric, value in values.items():
+            self.add(metric, value, now)
+
+    def quantiles(self, metric, window, qs=SKETCH_QUANTILES, now=None):
+        """Estimates for one metric and window, NaN where there are no samples"""
+        sketch = self.sketches.get(metric, {}).get(window)
+        return sketch.quantiles(qs, now) if sketch is not None else [math.nan] * len(qs)
+
+    def summary(self, now=None):
+        """{metric: {window: {'count', 'p50', 'p95', 'p99'}}} for the exporters; None for empty windows (JSON has no NaN)"""
+        report = {}
+        for metric, sketches in sorted(self.sketches.items()):
+            report[metric] = {}
+            for label, sketch in sketches.items():
+                values = sketch.quantiles(SKETCH_QUANTILES, now)
+                report[metric][label] = {'count': sketch.total.count,
+                                         **{f"p{q * 100:g}": None if math.isnan(v) else round(v, 3)
+                                            for q, v in zip(SKETCH_QUANTILES, values)}}
+        return report
+
+    def format_table(self, now=None):
+        """Plain-text table of the percentiles, for the self-metrics overlay"""
+        lines = [f"{'metric':<14}{'window':>7}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for metric, windows in self.summary(now).items():
+            for label, stats in windows.items():
+                if stats['count']:
+                    lines.append(f"{metric:<14}{label:>7}{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['p99']:>9.1f}")
+        return "\n".join(lines)